@@ -0,0 +1,110 @@
+"""
+Document save/load: columnar binary format (model.document_io) vs. JSON of draw() dicts.
+
+    python benchmarks/bench_document_io.py [shape_count]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from model.document_io import LazyDocument, load_document, save_document
+from model.shape_factory import ShapeFactory
+
+DEFAULT_COUNT = 50_000
+VIEWPORT = (0, 0, 800, 600)
+
+
+def generate(count, rng):
+    shapes = []
+    for i in range(count):
+        kind = rng.choice(["rectangle", "ellipse", "line", "text", "image"])
+        if kind == "text":
+            shape = ShapeFactory.create_shape(kind, text=f"label {i}")
+        elif kind == "image":
+            shape = ShapeFactory.create_shape(kind, image_path=f"/photos/{i % 50}.png")
+        else:
+            shape = ShapeFactory.create_shape(kind)
+        shape.x = rng.randrange(5000)
+        shape.y = rng.randrange(5000)
+        shape.width = rng.randrange(10, 200)
+        shape.height = rng.randrange(10, 200)
+        shape.z_order = i
+        shapes.append(shape)
+    return shapes
+
+
+def save_json(shapes, path):
+    with open(path, "w") as f:
+        json.dump([dict(shape.draw(), id=shape.id) for shape in shapes], f)
+
+
+def load_json(path):
+    with open(path) as f:
+        records = json.load(f)
+    shapes = []
+    for record in records:
+        kind = record["type"]
+        shape = ShapeFactory.create_shape(
+            kind, x=record["x"], y=record["y"],
+            text=record.get("text"), image_path=record.get("image_path")
+        )
+        shape.id = record["id"]
+        for key, value in record.items():
+            if key not in ("type", "id"):
+                shape.set_property(key, value)
+        shapes.append(shape)
+    return shapes
+
+
+def open_viewport(path):
+    document = LazyDocument(path)
+    shapes = document.build(document.rows_in_rect(*VIEWPORT))
+    document.close()
+    return len(shapes)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    shapes = generate(count, random.Random(3))
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = []
+        lazy = []
+        for name, save, load, path in [
+            ("json", save_json, load_json, os.path.join(tmp, "doc.json")),
+            ("binary", lambda s, p: save_document(s, p, compress=False), load_document,
+             os.path.join(tmp, "doc.mrdh")),
+            ("binary+zlib", save_document, load_document, os.path.join(tmp, "doc.z.mrdh")),
+        ]:
+            save_ms, _ = timed(lambda: save(shapes, path))
+            load_ms, loaded = timed(lambda: load(path))
+            assert len(loaded) == count
+            read_ms, _ = timed(lambda: open(path, "rb").read())
+            rows.append((name, save_ms, load_ms, read_ms, os.path.getsize(path)))
+            if name.startswith("binary"):
+                lazy_ms, visible = timed(lambda: open_viewport(path))
+                lazy.append((name, lazy_ms, visible))
+
+    print(f"{count} shapes")
+    print(f"{'format':>12} {'save (ms)':>10} {'load (ms)':>10} {'raw read (ms)':>14} {'size (KB)':>10}")
+    for name, save_ms, load_ms, read_ms, size in rows:
+        print(f"{name:>12} {save_ms:>10.1f} {load_ms:>10.1f} {read_ms:>14.2f} {size / 1024:>10.0f}")
+    print()
+    print(f"lazy open (mmap) + shapes in a {VIEWPORT[2]}x{VIEWPORT[3]} viewport")
+    for name, lazy_ms, visible in lazy:
+        print(f"{name:>12} {lazy_ms:>10.1f} ms  ({visible} shapes built)")
+
+
+if __name__ == "__main__":
+    main()
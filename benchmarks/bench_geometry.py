@@ -0,0 +1,104 @@
+"""
+Batched geometry (model.geometry) vs. per-shape Python loops.
+
+Columns come straight from a ShapeStore, so with NumPy installed the
+vectorized side reads the array buffers without copying. Without NumPy
+the module falls back to Python and both columns measure loops.
+
+    python benchmarks/bench_geometry.py
+"""
+import os
+import random
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from model import geometry
+from model.canvas import Canvas
+from model.geometry import ShapeGeometry
+from model.shape_factory import ShapeFactory
+
+SIZES = [1_000, 10_000, 100_000]
+
+
+def populate(canvas, count, rng):
+    canvas.clear()
+    side = int((count ** 0.5) * 100)
+    for _ in range(count):
+        shape = ShapeFactory.create_shape("rectangle")
+        shape.x = rng.randrange(side)
+        shape.y = rng.randrange(side)
+        shape.width = rng.randrange(20, 120)
+        shape.height = rng.randrange(20, 120)
+        shape.z_order = rng.randrange(100)
+        canvas.add_shape(shape)
+    return side
+
+
+def loop_bounds(shapes):
+    bounds = [(s.x, s.y, s.x + s.width, s.y + s.height) for s in shapes]
+    return (min(b[0] for b in bounds), min(b[1] for b in bounds),
+            max(b[2] for b in bounds), max(b[3] for b in bounds))
+
+
+def loop_hit(shapes, x, y):
+    hit = None
+    for shape in shapes:
+        if shape.x <= x <= shape.x + shape.width and shape.y <= y <= shape.y + shape.height:
+            if hit is None or shape.z_order >= hit.z_order:
+                hit = shape
+    return hit
+
+
+def loop_rect(shapes, x1, y1, x2, y2):
+    return [s for s in shapes
+            if s.x <= x2 and x1 <= s.x + s.width and s.y <= y2 and y1 <= s.y + s.height]
+
+
+def loop_z(shapes):
+    return (min(s.z_order for s in shapes), max(s.z_order for s in shapes))
+
+
+def batched_hit(geo, x, y):
+    mask = geo.point_mask(x, y)
+    hits = geo.select(mask)
+    return max(hits, key=lambda s: s.z_order) if hits else None
+
+
+def timed(func, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    rng = random.Random(7)
+    canvas = Canvas()
+    canvas.use_shape_store()
+    backend = "numpy" if geometry.np is not None else "python fallback"
+    print(f"batched backend: {backend}")
+    print(f"{'shapes':>8} {'operation':>10} {'loop (ms)':>10} {'batched (ms)':>13}")
+    for count in SIZES:
+        side = populate(canvas, count, rng)
+        shapes = list(canvas.shapes)
+        x, y = rng.randrange(side), rng.randrange(side)
+        rect = (side * 0.25, side * 0.25, side * 0.5, side * 0.5)
+        geo = ShapeGeometry.from_store(canvas.shape_store)
+        rows = [
+            ("build", lambda: None, lambda: ShapeGeometry.from_store(canvas.shape_store)),
+            ("bounds", lambda: loop_bounds(shapes), geo.bounds),
+            ("hit", lambda: loop_hit(shapes, x, y), lambda: batched_hit(geo, x, y)),
+            ("rect", lambda: loop_rect(shapes, *rect), lambda: geo.select(geo.rect_mask(*rect))),
+            ("z-extrema", lambda: loop_z(shapes), geo.z_extrema),
+        ]
+        for name, loop, batched in rows:
+            print(f"{count:>8} {name:>10} {timed(loop):>10.3f} {timed(batched):>13.3f}")
+    canvas.clear()
+    canvas.use_shape_store(False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Click hit-test latency: spatial index vs. the old sort + linear scan.
+
+Shapes are spread at constant density (the board grows with the shape
+count), which is what a real document looks like as it gets bigger.
+
+    python benchmarks/bench_hit_test.py
+"""
+import os
+import random
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from model.canvas import Canvas
+from model.shape_factory import ShapeFactory
+
+SIZES = [100, 1_000, 10_000, 100_000]
+QUERIES = 1_000
+
+
+def populate(canvas, count, rng):
+    canvas.clear()
+    side = int((count ** 0.5) * 100)
+    for _ in range(count):
+        shape = ShapeFactory.create_shape(rng.choice(["rectangle", "ellipse"]))
+        shape.x = rng.randrange(side)
+        shape.y = rng.randrange(side)
+        shape.width = rng.randrange(20, 120)
+        shape.height = rng.randrange(20, 120)
+        shape.z_order = rng.randrange(10)
+        canvas.add_shape(shape)
+    return side
+
+
+def linear_hit_test(canvas, x, y):
+    for shape in reversed(sorted(canvas.shapes, key=lambda s: s.z_order)):
+        if (shape.x <= x <= shape.x + shape.width and
+                shape.y <= y <= shape.y + shape.height):
+            return shape
+    return None
+
+
+def time_per_query(func, points):
+    start = time.perf_counter()
+    for x, y in points:
+        func(x, y)
+    return (time.perf_counter() - start) / len(points) * 1e6
+
+
+def main():
+    rng = random.Random(42)
+    canvas = Canvas()
+    print(f"{'shapes':>8} {'index (us)':>12} {'linear (us)':>12}")
+    for count in SIZES:
+        side = populate(canvas, count, rng)
+        points = [(rng.randrange(side), rng.randrange(side)) for _ in range(QUERIES)]
+        indexed = time_per_query(canvas.find_shape_at, points)
+        # the linear scan is far too slow to repeat 1000 times on big boards
+        linear_points = points[:max(10, QUERIES * 1_000 // count)]
+        linear = time_per_query(lambda x, y: linear_hit_test(canvas, x, y), linear_points)
+        print(f"{count:>8} {indexed:>12.1f} {linear:>12.1f}")
+    canvas.clear()
+
+
+if __name__ == "__main__":
+    main()
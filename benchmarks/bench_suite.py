@@ -0,0 +1,290 @@
+"""
+Benchmark suite for the model, controller and view hot paths.
+
+Generates synthetic documents of mixed shapes and times each operation end
+to end: the controller call plus the redraw frame it schedules (flushed
+immediately instead of waiting for the Tk event loop). The view draws into
+a recording stub canvas (benchmarks/stubs.py), so no display is needed and
+Tk's own drawing cost is excluded; the number of item calls per operation
+is reported alongside the timings.
+
+    python benchmarks/bench_suite.py [--sizes 1000,10000,100000] [--output results.json]
+    python benchmarks/bench_suite.py --compare base.json [--output new.json]
+
+Results are JSON: one entry per (benchmark, size) with timing statistics in
+milliseconds. --compare runs the suite and prints each median against the
+same entry in a previous result file, exiting with status 1 if any is
+slower by more than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from controller.canvas_controller import CanvasController
+from model.canvas import Canvas
+from model.shape_factory import ShapeFactory
+from view.raster import encode_png
+from stubs import StubCanvasView, StubPropertyPanel
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+KINDS = ["rectangle", "ellipse", "line", "text", "image"]
+IMAGE_FILES = 20
+
+
+def make_images(directory):
+    """Small distinct PNG files for the image shapes."""
+    paths = []
+    for i in range(IMAGE_FILES):
+        path = os.path.join(directory, f"image{i}.png")
+        with open(path, "wb") as f:
+            f.write(encode_png(8, 8, bytes([i * 12 % 256, 80, 160]) * 64))
+        paths.append(path)
+    return paths
+
+
+def generate(count, rng, image_paths):
+    """Mixed shapes at constant density (the board grows with the count)."""
+    side = int((count ** 0.5) * 100)
+    shapes = []
+    for i in range(count):
+        kind = rng.choice(KINDS)
+        if kind == "text":
+            shape = ShapeFactory.create_shape(kind, text=f"label {i}")
+        elif kind == "image":
+            shape = ShapeFactory.create_shape(kind, image_path=rng.choice(image_paths))
+        else:
+            shape = ShapeFactory.create_shape(kind)
+        shape.x = rng.randrange(side)
+        shape.y = rng.randrange(side)
+        shape.width = rng.randrange(20, 120)
+        shape.height = rng.randrange(20, 120)
+        shape.z_order = rng.randrange(10)
+        if kind in ("rectangle", "ellipse"):
+            shape.fill = rng.choice(["", "red", "#88ccff"])
+        shapes.append(shape)
+    return shapes, side
+
+
+class Bench:
+    """One document loaded into a fresh controller and stub view."""
+
+    def __init__(self, shapes, side, rng):
+        canvas = Canvas()
+        canvas.observers.clear()
+        canvas.select_shapes([])
+        self.view = StubCanvasView()
+        self.panel = StubPropertyPanel()
+        self.controller = CanvasController(self.view, self.panel)
+        self.canvas = self.controller.canvas
+        self.side = side
+        self.rng = rng
+        self.canvas.load_shapes(shapes)
+        self.frame()
+
+    def frame(self):
+        """Run the redraw the last change scheduled."""
+        self.controller.scheduler.flush()
+
+    def point(self):
+        return self.rng.randrange(self.side), self.rng.randrange(self.side)
+
+    def scroll_to(self, x, y):
+        """Scroll the view like the scrollbars do, so the point (x, y) is at the top left."""
+        x1, y1, x2, y2 = self.view.options["scrollregion"]
+        self.view.scroll_x("moveto", (x * self.view.zoom - x1) / (x2 - x1))
+        self.view.scroll_y("moveto", (y * self.view.zoom - y1) / (y2 - y1))
+
+    def select(self, count):
+        self.canvas.select_shapes(self.rng.sample(self.canvas.get_shapes(), count))
+        self.frame()
+
+    def calls(self):
+        return self.view.calls + self.panel.calls
+
+
+def measure(bench, run, repeat, setup=None):
+    """Time run() repeat times (setup() is not timed or counted)."""
+    samples = []
+    calls = Counter()
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        before = bench.calls()
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+        calls.update(bench.calls() - before)
+    samples.sort()
+    stats = {
+        "n": len(samples),
+        "min_ms": samples[0] * 1e3,
+        "median_ms": statistics.median(samples) * 1e3,
+        "mean_ms": statistics.fmean(samples) * 1e3,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1e3,
+        "calls_per_run": {k: round(v / len(samples), 1) for k, v in sorted(calls.items()) if v},
+    }
+    return stats
+
+
+def run_benchmarks(bench, repeat):
+    """Yield (name, stats) for every benchmark on one document."""
+    canvas, controller = bench.canvas, bench.controller
+    count = len(canvas.get_shapes())
+
+    yield "model.get_shapes", measure(bench, canvas.get_shapes, repeat)
+
+    def click():
+        controller.on_canvas_click(*bench.point())
+        bench.frame()
+    yield "controller.on_canvas_click", measure(bench, click, repeat)
+
+    def drag():
+        controller.on_shape_drag(3, 2)
+        bench.frame()
+    bench.select(min(50, count))
+    yield "controller.on_shape_drag[50 selected]", measure(bench, drag, repeat)
+
+    def drag_end():
+        controller.on_shape_drag_end()
+        bench.frame()
+    yield "controller.on_shape_drag_end[50 selected]", measure(
+        bench, drag_end, repeat, setup=lambda: (controller.on_shape_drag(3, 2), bench.frame()))
+
+    for operation in ("bring_to_front", "send_to_back", "bring_forward", "send_backward"):
+        def reorder(operation=getattr(controller, operation)):
+            operation()
+            bench.frame()
+        yield f"controller.{operation}[10 selected]", measure(
+            bench, reorder, repeat, setup=lambda: bench.select(min(10, count)))
+
+    def add_remove():
+        added = [ShapeFactory.create_shape("rectangle") for _ in range(1_000)]
+        canvas.add_shapes(added)
+        bench.frame()
+        canvas.remove_shapes(added)
+        bench.frame()
+    yield "model.add_shapes+remove_shapes[1000]", measure(bench, add_remove, max(1, repeat // 5))
+
+    colors = iter(["red", "blue"] * repeat * 2)
+    for selected in (10, 1_000):
+        if selected > count:
+            continue
+        bench.select(selected)
+
+        def set_fill():
+            controller.on_property_changed("fill", next(colors))
+            bench.frame()
+        yield f"controller.on_property_changed[fill, {selected} selected]", measure(bench, set_fill, repeat)
+
+    bench.select(0)
+
+    def pan():
+        bench.scroll_to(*bench.point())
+        bench.frame()
+    yield "view.pan[random jump]", measure(bench, pan, repeat)
+
+    def zoom():
+        bench.view.set_zoom(0.5 if bench.view.zoom == 1 else 1)
+        bench.frame()
+    yield "view.zoom[1x <-> 0.5x]", measure(bench, zoom, repeat)
+    bench.view.set_zoom(1)
+    bench.frame()
+
+    shapes = canvas.get_shapes()
+    yield "view.draw_shapes[unchanged]", measure(bench, lambda: bench.view.draw_shapes(shapes), repeat)
+
+    def cold_setup():
+        bench.view.draw_shapes([])
+    yield "view.draw_shapes[from empty]", measure(
+        bench, lambda: bench.view.draw_shapes(shapes), max(1, repeat // 5), setup=cold_setup)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, base, threshold):
+    """Print medians against a previous run; returns the number of regressions."""
+    previous = {(r["name"], r["shapes"]): r for r in base["results"]}
+    regressions = 0
+    print(f"\n{'benchmark':<52} {'shapes':>7} {'base ms':>9} {'now ms':>9} {'ratio':>6}")
+    for result in results:
+        old = previous.get((result["name"], result["shapes"]))
+        if old is None:
+            continue
+        ratio = result["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{result['name']:<52} {result['shapes']:>7} {old['median_ms']:>9.3f} "
+              f"{result['median_ms']:>9.3f} {ratio:>6.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the editor's hot paths on synthetic documents.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated shape counts")
+    parser.add_argument("--repeat", type=int, default=50, help="runs per benchmark")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="previous JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="slowdown reported as a regression (default 0.25, i.e. 25%%)")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        image_paths = make_images(directory)
+        for count in sizes:
+            rng = random.Random(args.seed)
+            shapes, side = generate(count, rng, image_paths)
+            bench = Bench(shapes, side, rng)
+            for name, stats in run_benchmarks(bench, args.repeat):
+                results.append(dict(name=name, shapes=count, **stats))
+                print(f"{name:<52} {count:>7} {stats['median_ms']:>9.3f} ms"
+                      f" (p95 {stats['p95_ms']:.3f})", flush=True)
+            bench.view.image_cache.loader.shutdown()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+
+    if args.compare:
+        with open(args.compare) as f:
+            base = json.load(f)
+        return 1 if compare(results, base, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
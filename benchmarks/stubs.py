@@ -0,0 +1,203 @@
+"""
+Display-free stand-ins for the Tk widgets, for benchmarks.
+
+RecordingCanvas implements the tk.Canvas methods the view uses, keeping
+items and tags in dicts and counting every call instead of drawing.
+StubCanvasView is the real CanvasView running on top of it: RecordingCanvas
+subclasses tk.Canvas so it sits between CanvasView and tk.Canvas in the MRO,
+and all of CanvasView's own code runs unchanged.
+"""
+import os
+import sys
+from collections import Counter, defaultdict
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import tkinter as tk
+from view.canvas_view import CanvasView
+
+
+class RecordingCanvas(tk.Canvas):
+    """tk.Canvas stand-in that records item calls instead of drawing."""
+
+    def __init__(self, master=None, cnf=None, width=800, height=600, **options):
+        self.calls = Counter()
+        self.items = {}  # item id -> [kind, coords, options, tags]
+        self.tags = defaultdict(set)  # tag -> item ids
+        self.timers = {}  # after id -> callback
+        self._next_id = 0
+        self._size = (width, height)
+        self.options = {}
+        self._origin = [0, 0]  # canvas coordinates of the top-left corner
+
+    # Items
+    def create_rectangle(self, *coords, **options):
+        return self._create('rectangle', coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self._create('oval', coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._create('line', coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create('text', coords, options)
+
+    def create_image(self, *coords, **options):
+        return self._create('image', coords, options)
+
+    def coords(self, item, *coords):
+        self.calls['coords'] += 1
+        if coords:
+            self.items[item][1] = coords
+        return list(self.items[item][1])
+
+    def itemconfigure(self, item, **options):
+        self.calls['itemconfigure'] += 1
+        self.items[item][2].update(options)
+
+    itemconfig = itemconfigure
+
+    def delete(self, *tags):
+        self.calls['delete'] += 1
+        for tag in tags:
+            for item in list(self._find(tag)):
+                for item_tag in self.items.pop(item)[3]:
+                    self.tags[item_tag].discard(item)
+
+    def move(self, tag, dx, dy):
+        self.calls['move'] += 1
+        for item in self._find(tag):
+            coords = self.items[item][1]
+            self.items[item][1] = tuple(c + (dx if i % 2 == 0 else dy) for i, c in enumerate(coords))
+
+    def tag_raise(self, tag, above=None):
+        self.calls['tag_raise'] += 1
+
+    def tag_lower(self, tag, below=None):
+        self.calls['tag_lower'] += 1
+
+    def addtag_withtag(self, new_tag, tag):
+        self.calls['addtag_withtag'] += 1
+        for item in self._find(tag):
+            self.items[item][3].add(new_tag)
+            self.tags[new_tag].add(item)
+
+    def dtag(self, tag, remove=None):
+        self.calls['dtag'] += 1
+        remove = tag if remove is None else remove
+        for item in list(self._find(tag)):
+            self.items[item][3].discard(remove)
+            self.tags[remove].discard(item)
+
+    def find_all(self):
+        return tuple(self.items)
+
+    # Widget
+    def bind(self, sequence=None, func=None, add=None):
+        pass
+
+    def after(self, ms, func=None, *args):
+        self._next_id += 1
+        self.timers[self._next_id] = func
+        return self._next_id
+
+    def after_idle(self, func, *args):
+        return self.after(0, func)
+
+    def after_cancel(self, after_id):
+        self.timers.pop(after_id, None)
+
+    def configure(self, cnf=None, **options):
+        self.options.update(cnf or {}, **options)
+
+    config = configure
+
+    def xview(self, *args):
+        if args and args[0] == 'moveto':
+            self.xview_moveto(float(args[1]))
+
+    def yview(self, *args):
+        if args and args[0] == 'moveto':
+            self.yview_moveto(float(args[1]))
+
+    def xview_moveto(self, fraction):
+        x1, _, x2, _ = self.options.get('scrollregion', (0, 0, 0, 0))
+        self._origin[0] = x1 + fraction * (x2 - x1)
+
+    def yview_moveto(self, fraction):
+        _, y1, _, y2 = self.options.get('scrollregion', (0, 0, 0, 0))
+        self._origin[1] = y1 + fraction * (y2 - y1)
+
+    def canvasx(self, x, gridspacing=None):
+        return x + self._origin[0]
+
+    def canvasy(self, y, gridspacing=None):
+        return y + self._origin[1]
+
+    def winfo_width(self):
+        return self._size[0]
+
+    def winfo_height(self):
+        return self._size[1]
+
+    def cget(self, key):
+        return {'width': self._size[0], 'height': self._size[1]}.get(key, '')
+
+    def _create(self, kind, coords, options):
+        self.calls['create_' + kind] += 1
+        self._next_id += 1
+        tags = set(options.pop('tags', ()))
+        self.items[self._next_id] = [kind, coords, options, tags]
+        for tag in tags:
+            self.tags[tag].add(self._next_id)
+        return self._next_id
+
+    def _find(self, tag):
+        if isinstance(tag, int):
+            return (tag,) if tag in self.items else ()
+        return self.tags.get(tag, ())
+
+
+class StubCanvasView(CanvasView, RecordingCanvas):
+    """The real CanvasView drawing into a RecordingCanvas."""
+
+    def __init__(self, width=800, height=600):
+        # CanvasView.__init__'s super().__init__() lands in RecordingCanvas
+        CanvasView.__init__(self, None)
+        self._size = (width, height)
+
+
+class StubVar:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class StubPropertyPanel:
+    """PropertyPanel stand-in that counts refreshes."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.font_var = StubVar("Arial")
+        self.font_size_var = StubVar("12")
+        self.color_var = StubVar("black")
+        self.property_changed_callback = None
+
+    def update_properties(self, properties):
+        self.calls['update_properties'] += 1
+
+    def show_multi_select_properties(self):
+        self.calls['show_multi_select_properties'] += 1
+
+    def clear_properties(self):
+        self.calls['clear_properties'] += 1
+
+    def set_property_changed_callback(self, callback):
+        self.property_changed_callback = callback
@@ -0,0 +1,181 @@
+import glob
+import itertools
+import os
+from model.document_io import dumps, load_document
+from model.journal import Journal, read_journal, replay
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".miridih", "autosave")
+# 실행 중인 인스턴스마다 슬롯 번호 하나를 잠그고 그 번호의 파일만 쓴다
+JOURNAL_PATTERN = "journal-{}.mrdj"
+LOCK_PATTERN = "journal-{}.lock"
+SNAPSHOT_PATTERN = "snapshot-{}-{}.mrdh"  # 슬롯, 세대
+
+
+def _try_lock(path: str):
+    """잠금 파일을 열어 배타적으로 잠금 (다른 프로세스가 잡고 있으면 None)"""
+    while True:
+        f = open(path, 'a+b')
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            f.close()
+            return None
+        # 잠그는 사이에 다른 프로세스가 종료하며 지운 파일이면 새로 만든 파일로 다시 시도
+        try:
+            if os.path.samestat(os.fstat(f.fileno()), os.stat(path)):
+                return f
+        except FileNotFoundError:
+            pass
+        f.close()
+
+
+def _release_lock(f, path: str) -> None:
+    """잠금 파일을 지우고 잠금 해제 (Windows는 열린 파일을 지울 수 없어 닫은 뒤 지움)"""
+    if fcntl is not None:
+        os.remove(path)
+        f.close()
+        return
+    f.close()
+    try:
+        os.remove(path)
+    except OSError:  # 그 사이 다른 인스턴스가 열었음
+        pass
+
+
+class Autosave:
+    """
+    저널 기반 자동 저장
+
+    Canvas의 변경은 Journal에 레코드로 쌓이고, sync_ms마다 한 번에 기록(fsync)된다.
+    저널이 compact_bytes를 넘으면 문서 전체를 스냅샷으로 저장하고 저널을 새로
+    시작한다. 문서를 열거나 저장하면 그 파일이 새 기준 문서가 된다.
+    정상 종료 시 저널을 지우므로, 시작할 때 저널이 남아 있으면 비정상 종료로 보고 복구한다.
+
+    여러 인스턴스가 같은 디렉터리를 써도 섞이지 않도록, 시작할 때 슬롯 번호 하나를
+    잠그고 그 번호의 저널과 스냅샷만 쓴다. 잠금은 프로세스가 죽으면 풀리므로,
+    저널이 남아 있는데 잠글 수 있는 슬롯은 비정상 종료한 것이고 먼저 골라 복구한다.
+    """
+
+    def __init__(self, widget, canvas, directory: str = DEFAULT_DIRECTORY,
+                 sync_ms: int = 1000, compact_bytes: int = 4 * 1024 * 1024):
+        self.widget = widget
+        self.canvas = canvas
+        self.directory = directory
+        self.sync_ms = sync_ms
+        self.compact_bytes = compact_bytes
+        self.slot = None
+        self.journal = None
+        self._lock = None
+        self._lock_path = None
+        self._job = None
+
+    def start(self) -> bool:
+        """기록 시작 (남아 있던 저널을 복구했으면 True)"""
+        os.makedirs(self.directory, exist_ok=True)
+        self._acquire_slot()
+        recovered = self._recover()
+        if not recovered:
+            self.journal.reset(None)
+            self._remove_snapshots()
+        self.canvas.journal = self.journal
+        self._schedule()
+        return recovered
+
+    def stop(self) -> None:
+        """기록 종료 (정상 종료이므로 저널, 스냅샷, 잠금 파일 삭제)"""
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+        self.canvas.journal = None
+        self.journal.close()
+        if os.path.exists(self.journal.path):
+            os.remove(self.journal.path)
+        self._remove_snapshots()
+        if self._lock is not None:
+            _release_lock(self._lock, self._lock_path)
+            self._lock = None
+
+    def rebase(self, path) -> None:
+        """path(None이면 빈 문서)를 기준 문서로 저널을 새로 시작"""
+        self.journal.reset(path)
+        self._remove_snapshots(keep=path)
+
+    def compact(self) -> bool:
+        """현재 문서를 스냅샷으로 저장하고 저널을 비움 (지연 로딩 중이면 건너뜀)"""
+        if self.canvas.lazy_document is not None:
+            return False
+        path = os.path.join(self.directory, SNAPSHOT_PATTERN.format(self.slot, self._next_generation()))
+        with open(path, 'wb') as f:
+            f.write(dumps(self.canvas.get_shapes(), compress=False))
+            f.flush()
+            os.fsync(f.fileno())
+        self.rebase(path)
+        return True
+
+    def _acquire_slot(self) -> None:
+        """남은 저널이 있는 (비정상 종료한) 슬롯을 먼저, 없으면 비어 있는 가장 작은 슬롯을 잠금"""
+        orphans = []
+        for path in glob.glob(os.path.join(self.directory, JOURNAL_PATTERN.format("*"))):
+            name = os.path.basename(path)[len("journal-"):-len(".mrdj")]
+            if name.isdigit():
+                orphans.append(int(name))
+        for candidate in itertools.chain(sorted(orphans), itertools.count(1)):
+            lock_path = os.path.join(self.directory, LOCK_PATTERN.format(candidate))
+            lock = _try_lock(lock_path)
+            if lock is not None:
+                slot = candidate
+                break
+        self.slot, self._lock, self._lock_path = slot, lock, lock_path
+        self.journal = Journal(os.path.join(self.directory, JOURNAL_PATTERN.format(slot)))
+
+    def _recover(self) -> bool:
+        if not os.path.exists(self.journal.path):
+            return False
+        try:
+            base, records, valid_size = read_journal(self.journal.path)
+            shapes = load_document(base) if base else []
+        except (OSError, ValueError):  # DocumentFormatError 포함
+            return False
+        self.canvas.journal = None
+        self.canvas.load_shapes(shapes)
+        replay(self.canvas, records)
+        self.canvas.notify_observers()
+        self.journal.resume(valid_size)
+        return True
+
+    def _schedule(self):
+        self._job = self.widget.after(self.sync_ms, self._tick)
+
+    def _tick(self):
+        self._job = None
+        self.journal.sync()
+        if self.journal.size > self.compact_bytes:
+            self.compact()
+        self._schedule()
+
+    def _snapshots(self):
+        return glob.glob(os.path.join(self.directory, SNAPSHOT_PATTERN.format(self.slot, "*")))
+
+    def _next_generation(self) -> int:
+        generations = [0]
+        for path in self._snapshots():
+            name = os.path.basename(path)[len(f"snapshot-{self.slot}-"):-len(".mrdh")]
+            if name.isdigit():
+                generations.append(int(name))
+        return max(generations) + 1
+
+    def _remove_snapshots(self, keep=None):
+        keep = os.path.abspath(keep) if keep else None
+        for path in self._snapshots():
+            if os.path.abspath(path) != keep:
+                os.remove(path)
@@ -1,52 +1,73 @@
+from bisect import bisect_left
+
 from model.canvas import Canvas
+from model.change_events import ChangeSet
 from model.shape_factory import ShapeFactory
+from model.document_io import LazyDocument, save_document
+from model.shape_composite import ShapeGroup
+from .autosave import DEFAULT_DIRECTORY, Autosave
+from .history import AddShapes, GroupShapes, History, MoveShapes, Reorder, SetProperty, Ungroup
+from .instrumentation import Instrumentation
+from .redraw_scheduler import RedrawScheduler
 
 class CanvasController:
     
-    def __init__(self, canvas_view, property_panel):
+    # 문서를 불러올 때 유휴 시간 한 번에 만드는 도형 수
+    LOAD_CHUNK_SIZE = 2000
+    
+    def __init__(self, canvas_view, property_panel, target_fps: int = 60):
         """
         기본값
         """
         self.canvas = Canvas()
         self.canvas_view = canvas_view
+        self.canvas_view.canvas_controller = self  # MainWindow의 z-order 버튼에서 사용
         self.property_panel = property_panel
+        self.scheduler = RedrawScheduler(canvas_view, self._apply_drag, self._render, target_fps)
+        self._drag_dx = 0  # 화면에서만 이동하고 아직 모델에 반영하지 않은 이동량
+        self._drag_dy = 0
+        self.document_path = None  # 현재 문서 파일 경로 (저장된 적 없으면 None)
+        self._loading_job = None  # 남은 도형을 만드는 after_idle 작업
+        self.autosave = None  # start_autosave 호출 시 생성
+        self.history = History()
+        self.instrumentation = None  # enable_instrumentation 호출 시 생성
+        self._viewport_dirty = False  # 스크롤/확대로 화면에 보이는 영역이 바뀜
+        self._marquee = None  # 다음 프레임에 미리보기를 계산할 러버밴드 영역
         self.canvas.add_observer(self)
         self.canvas_view.set_shape_selected_callback(self.on_canvas_click)
         self.canvas_view.set_shape_created_callback(self.on_shape_created)
         self.canvas_view.set_shape_drag_callback(self.on_shape_drag)
+        self.canvas_view.set_shape_drag_end_callback(self.on_shape_drag_end)
+        self.canvas_view.set_viewport_changed_callback(self.on_viewport_changed)
+        self.canvas_view.set_marquee_callback(self.on_marquee)
+        self.canvas_view.set_marquee_end_callback(self.on_marquee_end)
         self.property_panel.set_property_changed_callback(self.on_property_changed)
     
     def on_canvas_click(self, x: int, y: int, multi_select: bool = False, check_only: bool = False):
-        clicked_shape = None
-        for shape in reversed(self.canvas.get_shapes()):
-            if (shape.x <= x <= shape.x + shape.width and
-                shape.y <= y <= shape.y + shape.height):
-                clicked_shape = shape
-                break
+        clicked_shape = self.canvas.find_shape_at(x, y)
         
         # shape 선택 여부 확인 용도
         if check_only:
-            if clicked_shape and clicked_shape in self.canvas.selected_shapes:
+            if clicked_shape and clicked_shape in self.canvas.selection:
                 return {'is_selected': True, 'shape': clicked_shape}
-            return {'is_selected': False}
+            return {'is_selected': False, 'shape': clicked_shape}
         
         if clicked_shape:
+            # 그룹에 속한 도형은 최상위 그룹 전체가 함께 선택된다
+            members = self.canvas.selection_unit(clicked_shape)
             if multi_select:
                 # Add to or remove from selection
-                if clicked_shape in self.canvas.selected_shapes:
-                    self.canvas.selected_shapes.remove(clicked_shape)
-                    clicked_shape.selected = False
+                if clicked_shape in self.canvas.selection:
+                    self.canvas.remove_from_selection(members)
                 else:
-                    self.canvas.selected_shapes.append(clicked_shape)
-                    clicked_shape.selected = True
-                self.canvas.notify_observers()
+                    self.canvas.add_to_selection(members)
             else:
                 # Single selection
-                self.canvas.select_shapes([clicked_shape])
+                self.canvas.select_shapes(members)
             
-            if len(self.canvas.selected_shapes) == 1:
+            if len(self.canvas.selection) == 1:
                 self.property_panel.update_properties(clicked_shape.draw())
-            elif len(self.canvas.selected_shapes) > 1:
+            elif len(self.canvas.selection) > 1:
                 # Show common properties for multiple selected shapes
                 self.property_panel.show_multi_select_properties()
         elif not multi_select:
@@ -54,16 +75,83 @@ class CanvasController:
             self.property_panel.clear_properties()
     
 
+    def on_marquee(self, x1: float, y1: float, x2: float, y2: float, contained: bool):
+        """러버밴드 드래그 중 (선택될 도형 미리보기는 프레임마다 한 번만 계산)"""
+        self._marquee = (x1, y1, x2, y2, contained)
+        self.scheduler.request(ChangeSet())
+    
+    def on_marquee_end(self, x1: float, y1: float, x2: float, y2: float, contained: bool, additive: bool):
+        """
+        러버밴드 선택 완료
+        
+        contained면 영역 안에 완전히 들어온 도형, 아니면 영역과 겹치는 도형을
+        공간 인덱스로 찾아 한 번에 선택한다 (알림 한 번). 그룹은 통째로 선택된다.
+        """
+        self._marquee = None
+        shapes = self._shapes_in_marquee(x1, y1, x2, y2, contained)
+        if additive:
+            self.canvas.add_to_selection(shapes)
+        else:
+            self.canvas.select_shapes(shapes)
+        self._show_selection_properties()
+    
+    # Bulk selection methods
+    def select_all(self):
+        self.canvas.select_all()
+        self._show_selection_properties()
+    
+    def invert_selection(self):
+        self.canvas.invert_selection()
+        self._show_selection_properties()
+    
+    def select_by_type(self, shape_type: str, extend: bool = False):
+        self.canvas.select_by_type(shape_type, extend)
+        self._show_selection_properties()
+    
+    def _show_selection_properties(self):
+        """선택 개수에 맞게 속성 패널 갱신"""
+        selection = self.canvas.selection
+        if len(selection) == 1:
+            self.property_panel.update_properties(selection.first().draw())
+        elif selection:
+            self.property_panel.show_multi_select_properties()
+        else:
+            self.property_panel.clear_properties()
+    
+    def _shapes_in_marquee(self, x1, y1, x2, y2, contained):
+        shapes = []
+        for component in self.canvas.components_in_rect(x1, y1, x2, y2, contained):
+            if isinstance(component, ShapeGroup):
+                shapes.extend(component.leaves())
+            else:
+                shapes.append(component)
+        return shapes
+    
     def on_shape_drag(self, dx: int, dy: int):
-        # 선택된 도형들을 dx, dy 만큼 이동
-        for shape in self.canvas.selected_shapes:
-            shape.move(dx, dy)
+        # 이동량은 누적해 두었다가 프레임마다 한 번에 적용
+        self.scheduler.add_move(dx, dy)
+    
+    def _apply_drag(self, dx: int, dy: int):
+        # 드래그 중에는 선택된 도형의 Tk 아이템만 한 번에 이동
+        self.canvas_view.move_selected_items(dx, dy)
+        self._drag_dx += dx
+        self._drag_dy += dy
+    
+    def on_shape_drag_end(self):
+        # 남은 이동량까지 반영한 뒤 최종 위치를 모델에 기록
+        self.scheduler.flush()
+        dx, dy = self._drag_dx, self._drag_dy
+        self._drag_dx = self._drag_dy = 0
+        if not (dx or dy):
+            return
         
-        # 선택된 도형이 1개인 경우 속성 패널 업데이트
-        if len(self.canvas.selected_shapes) == 1:
-            self.property_panel.update_properties(self.canvas.selected_shapes[0].draw())
+        self.canvas_view.commit_selected_move(dx, dy)
+        shapes = self.canvas.selected_shapes
+        for shape in shapes:
+            shape.move(dx, dy)
+        self.history.push(MoveShapes(shapes, dx, dy))
         
-        # 캔버스 다시 그리기
+        # 캔버스 다시 그리기 (속성 패널은 update에서 갱신)
         self.canvas.notify_observers()
     
     def on_shape_created(self, x: int, y: int, width: int, height: int, shape_type: str = "rectangle", props: dict = None):
@@ -98,101 +186,260 @@ class CanvasController:
                     shape.set_property(key, value)
         
         self.canvas.add_shape(shape)
+        self.history.push(AddShapes([shape]))
     
     def on_property_changed(self, property_name: str, value: any):
-        for shape in self.canvas.selected_shapes:
-            if property_name in ['x', 'y', 'width', 'height', 'z_order']:
-                try:
-                    value = int(value)
-                except ValueError:
-                    return
-            shape.set_property(property_name, value)
+        if property_name in ['x', 'y', 'width', 'height', 'z_order']:
+            try:
+                value = int(value)
+            except ValueError:
+                return
+        shapes = self.canvas.selected_shapes
+        if property_name == 'z_order':
+            # z_order는 값이 아니라 쌓인 위치를 되돌려야 하므로 배치로 기록
+            before = self.canvas.z_positions(shapes)
+            for shape in shapes:
+                shape.set_property(property_name, value)
+            self.history.push(Reorder.between(before, self.canvas.z_positions(shapes)))
+        else:
+            changes = []
+            for shape in shapes:
+                old = shape.get_property(property_name)
+                shape.set_property(property_name, value)
+                new = shape.get_property(property_name)
+                if new != old:
+                    changes.append((shape, old, new))
+            if changes:
+                self.history.push(SetProperty(property_name, changes))
+        self.canvas.notify_observers()
+    
+    # Group methods
+    def group_selected(self):
+        """선택된 도형들(이 속한 최상위 그룹)을 하나의 그룹으로 묶음"""
+        tops = list({id(top): top for top in map(self.canvas.top_level, self.canvas.selection)}.values())
+        if len(tops) < 2:
+            return None
+        group = self.canvas.group_shapes(tops)
+        self.history.push(GroupShapes(group, tops))
+        self.canvas.notify_observers()
+        return group
+    
+    def ungroup_selected(self):
+        """선택된 도형이 속한 최상위 그룹들을 한 단계 해제"""
+        groups = {id(top): top for top in map(self.canvas.top_level, self.canvas.selection)
+                  if isinstance(top, ShapeGroup)}
+        if not groups:
+            return
+        self.history.push(Ungroup([(group, self.canvas.ungroup(group)) for group in groups.values()]))
+        self.canvas.notify_observers()
+    
+    # Undo/redo methods
+    def undo(self):
+        """마지막 편집 실행 취소"""
+        with self.canvas.batch():
+            if self.history.undo(self.canvas):
+                self.canvas.notify_observers()
+    
+    def redo(self):
+        """실행 취소한 편집 다시 실행"""
+        with self.canvas.batch():
+            if self.history.redo(self.canvas):
+                self.canvas.notify_observers()
+    
+    # Document methods
+    def new_document(self):
+        """빈 문서로 시작"""
+        self._cancel_loading()
+        self.canvas.clear()
+        self.history.clear()
+        self.property_panel.clear_properties()
+        self.document_path = None
+        if self.autosave is not None:
+            self.autosave.rebase(None)
+    
+    def open_document(self, path: str):
+        """
+        파일에서 문서 불러오기 (DocumentFormatError/OSError는 호출자가 처리)
+        
+        파일을 메모리 맵으로 열어 화면에 보이는 도형만 먼저 만들고,
+        나머지는 유휴 시간마다 LOAD_CHUNK_SIZE개씩 만들어 그린다.
+        """
+        self._cancel_loading()
+        document = LazyDocument(path)
+        rows = document.rows_in_rect(*self.canvas_view.visible_region())
+        self.canvas.load_lazy(document, rows)
+        self.history.clear()
+        self.property_panel.clear_properties()
+        self.document_path = path
+        if self.autosave is not None:
+            self.autosave.rebase(path)
+        self._schedule_loading()
+    
+    def save_document(self, path: str = None):
+        """현재 문서를 파일로 저장 (경로를 생략하면 마지막으로 저장/불러온 경로)"""
+        path = path or self.document_path
+        if path is None:
+            raise ValueError("No document path to save to")
+        # 남은 도형을 모두 만들어야 저장할 수 있고, 같은 파일이면 매핑도 닫혀야 한다
+        self._cancel_loading()
+        self.canvas.load_pending()
+        self.canvas.notify_observers()
+        # 다시 열 때 메모리 맵으로 바로 읽을 수 있도록 압축하지 않고 저장
+        save_document(self.canvas.get_shapes(), path, compress=False)
+        self.document_path = path
+        if self.autosave is not None:
+            self.autosave.rebase(path)
+    
+    def start_autosave(self, directory: str = None) -> bool:
+        """
+        저널 자동 저장 시작
+        
+        이전 실행이 비정상 종료되어 저널이 남아 있으면 복구하고 True를 반환한다.
+        """
+        self.autosave = Autosave(self.canvas_view, self.canvas, directory or DEFAULT_DIRECTORY)
+        return self.autosave.start()
+    
+    def stop_autosave(self):
+        """정상 종료 시 호출 (저널 삭제)"""
+        if self.autosave is not None:
+            self.autosave.stop()
+            self.autosave = None
+    
+    # Instrumentation methods
+    def enable_instrumentation(self) -> Instrumentation:
+        """성능 계측 시작 (이미 켜져 있으면 그대로 사용)"""
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation()
+            self.instrumentation.install(self)
+        return self.instrumentation
+    
+    def disable_instrumentation(self):
+        """성능 계측 종료 (원래 메서드로 복원)"""
+        if self.instrumentation is not None:
+            self.instrumentation.uninstall()
+            self.instrumentation = None
+    
+    def set_perf_overlay(self, overlay):
+        """프레임마다 갱신할 PerfOverlay 지정 (None이면 숨김, 필요하면 계측도 시작)"""
+        if overlay is None:
+            if self.instrumentation is not None and self.instrumentation.overlay is not None:
+                self.instrumentation.overlay.hide()
+                self.instrumentation.overlay = None
+            return
+        self.enable_instrumentation().overlay = overlay
+    
+    def _schedule_loading(self):
+        if self.canvas.lazy_document is not None:
+            self._loading_job = self.canvas_view.after_idle(self._load_chunk)
+    
+    def _load_chunk(self):
+        self._loading_job = None
+        self.canvas.load_pending(self.LOAD_CHUNK_SIZE)
         self.canvas.notify_observers()
+        self._schedule_loading()
+    
+    def _cancel_loading(self):
+        if self._loading_job is not None:
+            self.canvas_view.after_cancel(self._loading_job)
+            self._loading_job = None
+    
+    def update(self, changes=None):
+        """Canvas 변경 알림 처리 (다음 프레임에 몰아서 다시 그림)"""
+        self.scheduler.request(changes)
+    
+    def on_viewport_changed(self):
+        """스크롤/확대로 아이템이 없는 영역이 보이게 됨 (다음 프레임에 다시 그림)"""
+        self._viewport_dirty = True
+        self.scheduler.request(ChangeSet())
+    
+    def _render(self, changes):
+        """
+        프레임 단위로 합쳐진 변경 반영
+        
+        화면 주변 영역(culling_region)과 겹치는 도형만 Tk 아이템을 가진다.
+        변경 기록이 있으면 바뀐 도형만 다시 그리고, 없거나 보이는 영역이
+        바뀌었으면 그 영역의 도형 전체를 다시 그린다.
+        """
+        view = self.canvas_view
+        if changes.full_refresh:
+            view.set_content_bounds(self.canvas.get_bounds())
+            self._render_viewport()
+            return
+        
+        # 드래그 중에는 아이템이 모델보다 앞서 있으므로 드래그가 끝난 뒤에 다시 그림
+        if self._viewport_dirty and not (self._drag_dx or self._drag_dy):
+            self._render_viewport()
+        else:
+            dirty = [self.canvas.get_shape(i) for i in changes.dirty_ids()]
+            dirty = sorted((s for s in dirty if s is not None), key=self.canvas.shapes.key)
+            view.update_shapes(
+                dirty,
+                changes.removed_ids(),
+                changes.reordered_ids(),
+                self._rendered_shape_below(view.render_region)
+            )
+        
+        # 선택된 도형 1개의 속성이 바뀐 경우에만 속성 패널 갱신
+        if len(self.canvas.selection) == 1:
+            shape = self.canvas.selection.first()
+            if changes.fields_for(shape.id) - {'selected'}:
+                self.property_panel.update_properties(shape.draw())
+        
+        if self._marquee is not None:
+            self.canvas_view.show_selection_preview(self._shapes_in_marquee(*self._marquee))
+            self._marquee = None
+    
+    def _render_viewport(self):
+        """culling_region과 겹치는 도형만 그림 (나머지 도형의 아이템은 제거)"""
+        self._viewport_dirty = False
+        region = self.canvas_view.culling_region()
+        self.canvas_view.draw_shapes(self.canvas.shapes_in_rect(*region), region)
     
-    def update(self):
-        self.canvas_view.draw_shapes(self.canvas.get_shapes())
+    def _rendered_shape_below(self, region):
+        """
+        아이템을 가질 수 있는 도형 중 바로 아래 도형을 찾는 함수
+        
+        전체 z-order를 따라 내려가면 화면 밖 도형을 모두 거치므로, 처음 필요할 때
+        region 안의 도형 목록을 만들어 이진 탐색한다.
+        """
+        if region is None:
+            return self.canvas.shape_below
+        key = self.canvas.shapes.key
+        rendered = {}
+        
+        def shape_below(shape):
+            if not rendered:
+                rendered['shapes'] = self.canvas.shapes_in_rect(*region)
+                rendered['keys'] = [key(s) for s in rendered['shapes']]
+            index = bisect_left(rendered['keys'], key(shape))
+            return rendered['shapes'][index - 1] if index > 0 else None
+        return shape_below
         
     # Z-order control methods
     def bring_to_front(self):
         """Move selected shapes to the front (highest z-order)"""
-        if not self.canvas.selected_shapes:
-            return
-            
-        # Find the highest z-order value
-        max_z = max(shape.z_order for shape in self.canvas.get_shapes())
-        
-        # Set selected shapes to have higher z-order values
-        for i, shape in enumerate(self.canvas.selected_shapes):
-            shape.z_order = max_z + 1 + i
-            
-        # Update property panel if a single shape is selected
-        if len(self.canvas.selected_shapes) == 1:
-            self.property_panel.update_properties(self.canvas.selected_shapes[0].draw())
-            
-        self.canvas.notify_observers()
+        self._change_z_order(self.canvas.bring_to_front)
     
     def send_to_back(self):
         """Move selected shapes to the back (lowest z-order)"""
-        if not self.canvas.selected_shapes:
-            return
-            
-        # Find the lowest z-order value
-        min_z = min(shape.z_order for shape in self.canvas.get_shapes())
-        
-        # Set selected shapes to have lower z-order values
-        for i, shape in enumerate(self.canvas.selected_shapes):
-            shape.z_order = min_z - 1 - i
-            
-        # Update property panel if a single shape is selected
-        if len(self.canvas.selected_shapes) == 1:
-            self.property_panel.update_properties(self.canvas.selected_shapes[0].draw())
-            
-        self.canvas.notify_observers()
+        self._change_z_order(self.canvas.send_to_back)
     
     def bring_forward(self):
         """Move selected shapes one level forward in z-order"""
-        if not self.canvas.selected_shapes:
-            return
-            
-        # Get all shapes sorted by z-order
-        all_shapes = self.canvas.get_shapes()
-        
-        for selected_shape in self.canvas.selected_shapes:
-            # Find the shape's index in the sorted list
-            idx = next((i for i, s in enumerate(all_shapes) if s.id == selected_shape.id), -1)
-            if idx < len(all_shapes) - 1:
-                # Swap z-order with the next shape
-                next_shape = all_shapes[idx + 1]
-                temp_z = selected_shape.z_order
-                selected_shape.z_order = next_shape.z_order
-                next_shape.z_order = temp_z
-        
-        # Update property panel if a single shape is selected
-        if len(self.canvas.selected_shapes) == 1:
-            self.property_panel.update_properties(self.canvas.selected_shapes[0].draw())
-            
-        self.canvas.notify_observers()
+        self._change_z_order(self.canvas.bring_forward)
     
     def send_backward(self):
         """Move selected shapes one level backward in z-order"""
-        if not self.canvas.selected_shapes:
+        self._change_z_order(self.canvas.send_backward)
+    
+    def _change_z_order(self, operation):
+        shapes = self.canvas.selected_shapes
+        if not shapes:
             return
-            
-        # Get all shapes sorted by z-order
-        all_shapes = self.canvas.get_shapes()
-        
-        for selected_shape in self.canvas.selected_shapes:
-            # Find the shape's index in the sorted list
-            idx = next((i for i, s in enumerate(all_shapes) if s.id == selected_shape.id), -1)
-            if idx > 0:
-                # Swap z-order with the previous shape
-                prev_shape = all_shapes[idx - 1]
-                temp_z = selected_shape.z_order
-                selected_shape.z_order = prev_shape.z_order
-                prev_shape.z_order = temp_z
-        
-        # Update property panel if a single shape is selected
-        if len(self.canvas.selected_shapes) == 1:
-            self.property_panel.update_properties(self.canvas.selected_shapes[0].draw())
-            
+        
+        # 바로 위/아래 도형도 자리가 바뀔 수 있으므로 함께 배치를 기록
+        affected = self.canvas.z_neighbourhood(shapes)
+        before = self.canvas.z_positions(affected)
+        operation(shapes)
+        self.history.push(Reorder.between(before, self.canvas.z_positions(affected)))
         self.canvas.notify_observers()
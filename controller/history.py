@@ -0,0 +1,234 @@
+import sys
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, List, Optional, Tuple
+from model.base_shape import BaseShape
+from model.shape_composite import ShapeGroup
+
+# 명령 하나의 고정 비용과 도형 하나당 비용 (바이트, 대략적인 값)
+COMMAND_OVERHEAD = 64
+SHAPE_ENTRY_BYTES = 56
+
+
+def _alive(canvas, component) -> bool:
+    """도형/그룹이 아직 캔버스에 있는지 (기록 후 History를 거치지 않고 제거되었을 수 있음)"""
+    if isinstance(component, ShapeGroup):
+        return canvas.groups.get(component.id) is component
+    return canvas.get_shape(component.id) is component
+
+
+class Command(ABC):
+    """
+    실행 취소 가능한 편집 하나
+
+    이미 적용된 상태로 History에 추가되며, 바뀐 도형과 값만 보관한다.
+    그 뒤에 캔버스에서 제거된 도형은 적용/취소할 때 건너뛴다.
+    """
+
+    size = COMMAND_OVERHEAD  # 보관에 드는 메모리 (바이트, 추정치)
+
+    @abstractmethod
+    def apply(self, canvas) -> None:
+        """다시 실행"""
+        pass
+
+    @abstractmethod
+    def revert(self, canvas) -> None:
+        """실행 취소"""
+        pass
+
+
+class AddShapes(Command):
+    """
+    도형 추가
+
+    추가한 뒤 그룹에 들어간 도형은 실행 취소로 그룹에서 빠지므로 (비게 된
+    그룹도 없어짐), 그때의 부모 그룹과 위치를 보관했다가 다시 실행할 때 되돌린다.
+    """
+
+    def __init__(self, shapes: List[BaseShape]):
+        self.shapes = list(shapes)
+        self._reverted = self.shapes  # 실행 취소로 제거한 도형 (다시 실행 때 이 도형만 추가)
+        self._memberships: List[Tuple[Any, ShapeGroup, int]] = []  # (도형/그룹, 부모 그룹, 위치)
+        self.size = COMMAND_OVERHEAD + sum(sys.getsizeof(s) + SHAPE_ENTRY_BYTES for s in self.shapes)
+
+    def apply(self, canvas) -> None:
+        canvas.add_shapes(self._reverted)
+        # 같은 부모 안에서는 앞 위치부터 넣어야 원래 순서가 됨
+        for component, parent, index in sorted(self._memberships, key=lambda m: m[2]):
+            if component._parent is None:
+                canvas.join_group(component, parent, min(index, len(parent.shapes)))
+        self._memberships = []
+
+    def revert(self, canvas) -> None:
+        self._reverted = [shape for shape in self.shapes if _alive(canvas, shape)]
+        self._memberships = []
+        seen = set()
+        for shape in self._reverted:
+            # 도형이 빠지면서 비게 되는 조상 그룹도 없어지므로 조상 쪽 구성까지 보관
+            component = shape
+            while component._parent is not None and id(component) not in seen:
+                seen.add(id(component))
+                parent = component._parent
+                self._memberships.append((component, parent, parent.shapes.index(component)))
+                component = parent
+        canvas.remove_shapes(self._reverted)
+
+
+class MoveShapes(Command):
+    """도형 이동 (드래그 한 번은 누적 이동량 하나로 기록)"""
+
+    def __init__(self, shapes: List[BaseShape], dx: int, dy: int):
+        self.shapes = list(shapes)
+        self.dx, self.dy = dx, dy
+        self.size = COMMAND_OVERHEAD + SHAPE_ENTRY_BYTES * len(self.shapes)
+
+    def apply(self, canvas) -> None:
+        for shape in self.shapes:
+            if _alive(canvas, shape):
+                shape.move(self.dx, self.dy)
+
+    def revert(self, canvas) -> None:
+        for shape in self.shapes:
+            if _alive(canvas, shape):
+                shape.move(-self.dx, -self.dy)
+
+
+class SetProperty(Command):
+    """속성 변경 (도형별 이전 값/새 값)"""
+
+    def __init__(self, name: str, changes: List[Tuple[BaseShape, Any, Any]]):
+        self.name = name
+        self.changes = changes
+        self.size = COMMAND_OVERHEAD + sum(
+            SHAPE_ENTRY_BYTES + sys.getsizeof(old) + sys.getsizeof(new) for _, old, new in changes
+        )
+
+    def apply(self, canvas) -> None:
+        for shape, _, new in self.changes:
+            if _alive(canvas, shape):
+                shape.set_property(self.name, new)
+
+    def revert(self, canvas) -> None:
+        for shape, old, _ in self.changes:
+            if _alive(canvas, shape):
+                shape.set_property(self.name, old)
+
+
+class Reorder(Command):
+    """z-order 변경 (바뀐 도형의 이전/이후 정렬 키, Canvas.z_positions 결과)"""
+
+    def __init__(self, before, after):
+        self.before = before
+        self.after = after
+        self.size = COMMAND_OVERHEAD + SHAPE_ENTRY_BYTES * (len(before) + len(after))
+
+    def apply(self, canvas) -> None:
+        canvas.restore_z_positions(self.after)
+
+    def revert(self, canvas) -> None:
+        canvas.restore_z_positions(self.before)
+
+    @classmethod
+    def between(cls, before, after) -> Optional["Reorder"]:
+        """
+        같은 도형들의 z_positions 결과 두 개에서 정렬 키가 바뀐 도형만 남겨 생성
+
+        바뀐 것이 없으면 None.
+        """
+        placed = {shape.id: key for shape, key in after}
+        old = {shape.id: key for shape, key in before}
+        before = [p for p in before if placed[p[0].id] != p[1]]
+        after = [p for p in after if old[p[0].id] != p[1]]
+        return cls(before, after) if before or after else None
+
+
+class GroupShapes(Command):
+    """그룹 만들기 (자식은 그룹으로 묶기 전 최상위 도형/그룹)"""
+
+    def __init__(self, group, children):
+        self.group = group
+        self.children = list(children)
+        self.size = COMMAND_OVERHEAD + SHAPE_ENTRY_BYTES * len(self.children)
+
+    def apply(self, canvas) -> None:
+        children = [child for child in self.children if _alive(canvas, child)]
+        if children:
+            canvas.group_shapes(children, self.group)
+
+    def revert(self, canvas) -> None:
+        if _alive(canvas, self.group):
+            canvas.ungroup(self.group)
+
+
+class Ungroup(Command):
+    """최상위 그룹 해제 (그룹별 자식 목록을 보관)"""
+
+    def __init__(self, groups):
+        self.groups = list(groups)  # [(그룹, 자식 목록), ...]
+        self.size = COMMAND_OVERHEAD + sum(SHAPE_ENTRY_BYTES * (1 + len(children))
+                                           for _, children in self.groups)
+
+    def apply(self, canvas) -> None:
+        for group, _ in self.groups:
+            if _alive(canvas, group):
+                canvas.ungroup(group)
+
+    def revert(self, canvas) -> None:
+        for group, children in reversed(self.groups):
+            children = [child for child in children if _alive(canvas, child)]
+            if children:
+                canvas.group_shapes(children, group)
+
+
+class History:
+    """
+    실행 취소/다시 실행 스택
+
+    보관 중인 명령의 크기 합이 max_bytes를 넘으면 가장 오래된 명령부터 버린다.
+    실행 취소/다시 실행은 명령이 건드린 도형 수에만 비례한다.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._undo = deque()
+        self._redo: List[Command] = []
+        self.bytes = 0
+
+    def push(self, command: Optional[Command]) -> None:
+        """이미 적용된 명령 추가 (다시 실행 스택은 비움)"""
+        if command is None:
+            return
+        self.bytes -= sum(c.size for c in self._redo)
+        self._redo.clear()
+        self._undo.append(command)
+        self.bytes += command.size
+        while self.bytes > self.max_bytes and len(self._undo) > 1:
+            self.bytes -= self._undo.popleft().size
+
+    def undo(self, canvas) -> Optional[Command]:
+        if not self._undo:
+            return None
+        command = self._undo.pop()
+        command.revert(canvas)
+        self._redo.append(command)
+        return command
+
+    def redo(self, canvas) -> Optional[Command]:
+        if not self._redo:
+            return None
+        command = self._redo.pop()
+        command.apply(canvas)
+        self._undo.append(command)
+        return command
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self.bytes = 0
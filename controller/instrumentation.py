@@ -0,0 +1,190 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+
+# 오버레이 갱신 최소 간격 (초)
+OVERLAY_INTERVAL = 0.25
+
+
+class Instrumentation:
+    """
+    성능 계측 (선택 사항)
+
+    install하면 컨트롤러, Canvas, 뷰, 속성 패널의 주요 메서드를 인스턴스 속성으로
+    감싸 호출마다 걸린 시간을 링 버퍼에 기록한다. uninstall하면 원래 메서드로
+    돌아가므로 꺼져 있을 때의 비용은 없다.
+
+    기록 이름:
+        frame                   프레임 하나 (이동만 있는 프레임 포함. 인자: 만든/지운 Tk 아이템 수, 전체 아이템 수)
+        canvas.notify_observers 변경 알림 전체
+        <옵저버 클래스>.update   옵저버 하나의 알림 처리
+        view.draw_shapes / view.update_shapes
+        hit_test.find_shape_at / hit_test.shapes_in_rect
+        property_panel.<메서드>
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.events = deque(maxlen=capacity)  # (이름, 시작 ns, 걸린 ns, 인자 또는 None)
+        self.overlay = None  # 프레임마다 갱신할 PerfOverlay (사용 시)
+        self.items_created = 0
+        self.items_deleted = 0
+        self.item_count = 0
+        self._installed = []  # (객체, 속성 이름, 원래 값, 인스턴스에 있던 속성인지)
+        self._view = None
+        self._overlay_time = 0.0
+
+    def record(self, name: str, start_ns: int, duration_ns: int, args: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append((name, start_ns, duration_ns, args))
+
+    def install(self, controller) -> None:
+        """컨트롤러와 연결된 객체들의 메서드를 계측 래퍼로 교체"""
+        canvas, view, panel = controller.canvas, controller.canvas_view, controller.property_panel
+        self._view = view
+        self.item_count = sum(len(items) for items in view.shape_items.values())
+
+        self._wrap(canvas, 'notify_observers', 'canvas.notify_observers')
+        for observer in canvas.observers:
+            self._wrap(observer, 'update', f'{type(observer).__name__}.update')
+        self._wrap(canvas, 'find_shape_at', 'hit_test.find_shape_at')
+        self._wrap(canvas, 'shapes_in_rect', 'hit_test.shapes_in_rect')
+        self._wrap(view, 'draw_shapes', 'view.draw_shapes')
+        self._wrap(view, 'update_shapes', 'view.update_shapes')
+        for name in ('update_properties', 'show_multi_select_properties', 'clear_properties'):
+            self._wrap(panel, name, f'property_panel.{name}')
+        self._count_items(view)
+        self._wrap_frame(controller.scheduler)
+
+    def uninstall(self) -> None:
+        """원래 메서드로 복원"""
+        for obj, attr, original, own in reversed(self._installed):
+            if own:
+                setattr(obj, attr, original)
+            else:
+                delattr(obj, attr)
+        self._installed = []
+        if self.overlay is not None:
+            self.overlay.hide()
+            self.overlay = None
+
+    # Statistics
+    def durations(self, name: str) -> List[float]:
+        """이름별 걸린 시간 목록 (ms, 버퍼에 남아 있는 기록만)"""
+        return [duration / 1e6 for event_name, _, duration, _ in self.events if event_name == name]
+
+    def percentiles(self, name: str, points: Sequence[float] = (50, 90, 99)) -> Dict[float, float]:
+        """걸린 시간의 백분위수 (ms, nearest-rank). 기록이 없으면 빈 dict"""
+        values = sorted(self.durations(name))
+        if not values:
+            return {}
+        return {p: values[min(len(values) - 1, max(0, int(len(values) * p / 100 + 0.5) - 1))]
+                for p in points}
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """이름별 호출 수, 평균, p50/p90/p99, 최댓값 (ms)"""
+        summary = {}
+        for name in sorted({event[0] for event in self.events}):
+            values = self.durations(name)
+            p = self.percentiles(name)
+            summary[name] = {
+                'count': len(values), 'mean_ms': sum(values) / len(values),
+                'p50_ms': p[50], 'p90_ms': p[90], 'p99_ms': p[99], 'max_ms': max(values),
+            }
+        return summary
+
+    def fps(self) -> float:
+        """최근 1초 동안 처리된 프레임 수"""
+        since = time.perf_counter_ns() - 1_000_000_000
+        return sum(1 for name, start, _, _ in self.events if name == 'frame' and start >= since)
+
+    def last_frame(self) -> Optional[tuple]:
+        for event in reversed(self.events):
+            if event[0] == 'frame':
+                return event
+        return None
+
+    def write_chrome_trace(self, path: str) -> None:
+        """chrome://tracing (Perfetto)에서 열 수 있는 JSON 파일로 저장"""
+        pid, tid = os.getpid(), threading.get_ident()
+        events = [{'name': name, 'cat': name.split('.')[0], 'ph': 'X', 'pid': pid, 'tid': tid,
+                   'ts': start / 1000, 'dur': duration / 1000, 'args': args or {}}
+                  for name, start, duration, args in self.events]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    # Wrappers
+    def _wrap(self, obj, attr: str, name: str) -> None:
+        original = getattr(obj, attr)
+        record = self.record
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                record(name, start, clock() - start)
+
+        self._replace(obj, attr, timed)
+
+    def _replace(self, obj, attr: str, value) -> None:
+        self._installed.append((obj, attr, getattr(obj, attr), attr in vars(obj)))
+        setattr(obj, attr, value)
+
+    def _count_items(self, view) -> None:
+        """뷰가 만들고 지우는 Tk 아이템 수 집계"""
+        create_primitive = view._create_primitive
+        apply_props = view._apply_props
+        retire_shape = view._retire_shape
+
+        def counted_create(*args, **kwargs):
+            self.items_created += 1
+            return create_primitive(*args, **kwargs)
+
+        def counted_apply(shape_id, props):
+            # 아이템 구성이 바뀌면 새 아이템을 만들고 기존 아이템은 지운다
+            old = view.shape_items.get(shape_id)
+            result = apply_props(shape_id, props)
+            if old and view.shape_items.get(shape_id) is not old:
+                self.items_deleted += len(old)
+            return result
+
+        def counted_retire(shape_id):
+            self.items_deleted += len(view.shape_items.get(shape_id, ()))
+            return retire_shape(shape_id)
+
+        self._replace(view, '_create_primitive', counted_create)
+        self._replace(view, '_apply_props', counted_apply)
+        self._replace(view, '_retire_shape', counted_retire)
+
+    def _wrap_frame(self, scheduler) -> None:
+        run_frame = scheduler._frame
+        clock = time.perf_counter_ns
+
+        def frame():
+            created, deleted = self.items_created, self.items_deleted
+            start = clock()
+            try:
+                return run_frame()
+            finally:
+                duration = clock() - start
+                created, deleted = self.items_created - created, self.items_deleted - deleted
+                self.item_count += created - deleted
+                self.record('frame', start, duration,
+                            {'created': created, 'deleted': deleted, 'items': self.item_count})
+                self._update_overlay()
+
+        self._replace(scheduler, '_frame', frame)
+
+    def _update_overlay(self) -> None:
+        if self.overlay is None:
+            return
+        now = time.perf_counter()
+        if now - self._overlay_time < OVERLAY_INTERVAL:
+            self.overlay.raise_()
+            return
+        self._overlay_time = now
+        last = self.last_frame()
+        self.overlay.show(self.fps(), last[2] / 1e6 if last else 0.0, self.item_count)
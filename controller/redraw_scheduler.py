@@ -0,0 +1,96 @@
+import time
+from typing import Callable, Optional
+from model.change_events import ChangeSet
+
+class RedrawScheduler:
+    """
+    프레임 단위 다시 그리기 스케줄러
+    
+    변경 알림과 드래그 이동량을 모아 두었다가 Tk after/after_idle로
+    프레임당 최대 한 번만 처리한다.
+    """
+    
+    def __init__(self, widget, move_callback: Callable[[float, float], None],
+                 render_callback: Callable[[ChangeSet], None], target_fps: int = 60):
+        """
+        Args:
+            widget: after/after_idle을 제공하는 Tk 위젯
+            move_callback: 프레임마다 합쳐진 이동량 (dx, dy)을 모델에 적용
+            render_callback: 프레임마다 합쳐진 ChangeSet을 화면에 반영
+            target_fps: 목표 프레임 레이트
+        """
+        self.widget = widget
+        self.move_callback = move_callback
+        self.render_callback = render_callback
+        self.target_fps = target_fps
+        self.pending_changes: Optional[ChangeSet] = None
+        self.pending_dx = 0
+        self.pending_dy = 0
+        self.frames = 0  # 실제로 처리된 프레임 수
+        self.coalesced_events = 0  # 이미 예약된 프레임에 합쳐진 이벤트 수
+        self._after_id = None
+        self._running = False
+        self._last_frame = 0.0
+    
+    @property
+    def frame_interval(self) -> float:
+        return 1.0 / self.target_fps if self.target_fps > 0 else 0.0
+    
+    def request(self, changes: Optional[ChangeSet] = None) -> None:
+        """다시 그리기 요청 (변경 기록은 다음 프레임까지 누적)"""
+        if self.pending_changes is None:
+            self.pending_changes = changes if changes is not None else ChangeSet(full_refresh=True)
+        elif changes is not None:
+            self.pending_changes.merge(changes)
+        self._schedule()
+    
+    def add_move(self, dx: float, dy: float) -> None:
+        """드래그 이동량 누적"""
+        self.pending_dx += dx
+        self.pending_dy += dy
+        self._schedule()
+    
+    def flush(self) -> None:
+        """예약된 프레임을 기다리지 않고 즉시 처리"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._run()
+    
+    def _schedule(self) -> None:
+        if self._running:
+            return  # 처리 중인 프레임이 끝난 뒤 _run에서 다시 예약함
+        if self._after_id is not None:
+            self.coalesced_events += 1
+            return
+        delay = self.frame_interval - (time.perf_counter() - self._last_frame)
+        if delay > 0:
+            self._after_id = self.widget.after(max(1, int(delay * 1000)), self._run)
+        else:
+            self._after_id = self.widget.after_idle(self._run)
+    
+    def _run(self) -> None:
+        self._after_id = None
+        if self.pending_changes is None and not (self.pending_dx or self.pending_dy):
+            return
+        # 이동만 있는 프레임도 프레임 간격 계산에 포함
+        self.frames += 1
+        self._last_frame = time.perf_counter()
+        self._running = True
+        try:
+            self._frame()
+        finally:
+            self._running = False
+        # 프레임을 처리하는 동안 들어온 요청은 다음 프레임으로 넘김
+        if self.pending_changes is not None or self.pending_dx or self.pending_dy:
+            self._schedule()
+    
+    def _frame(self) -> None:
+        """누적된 이동량과 변경 기록을 한 프레임으로 처리"""
+        dx, dy = self.pending_dx, self.pending_dy
+        self.pending_dx = self.pending_dy = 0
+        if dx or dy:
+            self.move_callback(dx, dy)
+        changes, self.pending_changes = self.pending_changes, None
+        if changes is not None:
+            self.render_callback(changes)
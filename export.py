@@ -0,0 +1,135 @@
+"""
+Batch export of saved documents without a display.
+
+    python export.py [-o OUT_DIR] [-f png|svg] [-j JOBS] [--scale S] [--tile-size PX] DOCUMENT...
+
+Each document is one task in a process pool, so throughput scales with the
+number of cores. PNG pages larger than --tile-size pixels are written as a
+grid of tiles (NAME.r<row>c<col>.png) rendered one at a time; only the
+shapes overlapping a tile are drawn for it and their images decoded then,
+so a worker's memory follows the tile size instead of the page size. SVG is
+streamed to the file, with images embedded; --scale sets its width and
+height attributes (the viewBox stays in canvas units).
+
+Each worker process exports a single document and exits (Python 3.11+), so
+the reported peak RSS belongs to that document alone.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, project_root)
+
+from model.document_io import load_document
+from view.raster import render_tiles
+from view.svg import write_svg
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+FORMATS = ('png', 'svg')
+
+
+def peak_rss_mb():
+    """Peak resident memory of the current process in MB, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def export_document(path, out_dir, fmt='png', scale=1.0, tile_size=8192):
+    """
+    Export one document (runs in a worker process).
+
+    Returns a report dict: path, outputs, shapes, seconds, peak_rss_mb and
+    error (None on success).
+    """
+    start = time.perf_counter()
+    report = {'path': path, 'outputs': [], 'shapes': 0, 'error': None}
+    try:
+        shapes = load_document(path)
+        report['shapes'] = len(shapes)
+        stem = os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0])
+        if fmt == 'svg':
+            output = f"{stem}.svg"
+            with open(output, 'wb') as f:
+                write_svg(shapes, f, scale=scale)
+            report['outputs'].append(output)
+        else:
+            for row, column, data in render_tiles(shapes, scale, tile_size):
+                output = f"{stem}.r{row}c{column}.png"
+                with open(output, 'wb') as f:
+                    f.write(data)
+                report['outputs'].append(output)
+            if len(report['outputs']) == 1:
+                output = f"{stem}.png"
+                os.replace(report['outputs'][0], output)
+                report['outputs'] = [output]
+    except Exception as e:
+        report['error'] = f"{type(e).__name__}: {e}"
+    report['seconds'] = time.perf_counter() - start
+    report['peak_rss_mb'] = peak_rss_mb()
+    return report
+
+
+def format_report(report):
+    memory = report['peak_rss_mb']
+    memory = f"{memory:8.1f} MB" if memory is not None else "       ? MB"
+    if report['error']:
+        result = f"FAILED {report['error']}"
+    elif len(report['outputs']) == 1:
+        result = report['outputs'][0]
+    else:
+        result = f"{len(report['outputs'])} tiles"
+    return f"{report['seconds']:8.3f} s {memory} {report['shapes']:8d} shapes  {report['path']} -> {result}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export saved documents to images.")
+    parser.add_argument('documents', nargs='+', help="documents to export")
+    parser.add_argument('-o', '--out-dir', default='.', help="output directory (default: current)")
+    parser.add_argument('-f', '--format', choices=FORMATS, default='png', help="output format")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument('--scale', type=float, default=1.0, help="output pixels per canvas unit")
+    parser.add_argument('--tile-size', type=int, default=8192,
+                        help="split PNG pages larger than this many pixels into tiles"
+                             " (bounds per-worker raster memory)")
+    args = parser.parse_args(argv)
+    if args.scale <= 0:
+        parser.error("--scale must be positive")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    print("    time  peak RSS*   shapes  document", flush=True)
+    start = time.perf_counter()
+    failed = 0
+    jobs = max(1, min(args.jobs, len(args.documents)))
+    # ru_maxrss can't be reset, so a reused worker would report the largest
+    # document it has exported so far; use a fresh process per document
+    per_task = sys.version_info >= (3, 11)
+    options = {'max_tasks_per_child': 1} if per_task else {}
+    with ProcessPoolExecutor(max_workers=jobs, **options) as pool:
+        futures = [pool.submit(export_document, path, args.out_dir, args.format,
+                               args.scale, args.tile_size)
+                   for path in args.documents]
+        for future in as_completed(futures):
+            report = future.result()
+            if not per_task:
+                report['peak_rss_mb'] = None
+            failed += report['error'] is not None
+            print(format_report(report), flush=True)
+    elapsed = time.perf_counter() - start
+    print(f"{len(args.documents)} documents in {elapsed:.2f} s with {jobs} workers"
+          f" ({failed} failed)\n* peak RSS of the worker process that exported the document")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,7 +10,10 @@ from controller.canvas_controller import CanvasController
 def main():
     window = MainWindow()
     controller = CanvasController(window.canvas_view, window.property_panel)
+    if controller.start_autosave():
+        window.show_recovery_notice()
     window.start()
+    controller.stop_autosave()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,12 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 import uuid
 
+# 값이 바뀌면 bounding box가 달라지는 속성
+GEOMETRY_FIELDS = frozenset({'x', 'y', 'width', 'height', 'x2', 'y2'})
+
 class BaseShape(ABC):
     """
     모든 도형의 기본 클래스
     """
     
+    # 도형 수가 많을 때 인스턴스마다 __dict__가 생기지 않도록 slot 사용
+    __slots__ = ('id', 'x', 'y', 'width', 'height', 'text', 'z_order',
+                 'has_frame', 'has_shadow', 'selected', 'fill', 'outline',
+                 '_canvas', '_store', '_row', '_parent')
+    
     def __init__(self):
         """기본 도형 속성 init"""
         self.id = str(uuid.uuid4())
@@ -21,6 +29,10 @@ class BaseShape(ABC):
         self.selected = False
         self.fill = ""
         self.outline = "black"
+        self._canvas = None  # 도형이 속한 Canvas (변경 알림 대상)
+        self._store = None  # 속성 값을 보관하는 ShapeStore (사용 시)
+        self._row = -1
+        self._parent = None  # 도형이 속한 ShapeGroup (그룹에 속하지 않으면 None)
     
     @abstractmethod
     def draw(self) -> Dict[str, Any]:
@@ -33,6 +45,7 @@ class BaseShape(ABC):
         """
         if hasattr(self, name):
             setattr(self, name, value)
+            self._notify_changed(name)
     
     def get_property(self, name: str) -> Any:
         """
@@ -40,16 +53,42 @@ class BaseShape(ABC):
         """
         return getattr(self, name, None)
     
+    def get_bounds(self) -> Tuple[float, float, float, float]:
+        """
+        bounding box (x1, y1, x2, y2) 반환
+        """
+        x1, x2 = sorted((self.x, self.x + self.width))
+        y1, y2 = sorted((self.y, self.y + self.height))
+        return (x1, y1, x2, y2)
+    
+    def is_point_inside(self, x: float, y: float) -> bool:
+        """
+        점이 bounding box 안에 있는지 여부
+        """
+        x1, y1, x2, y2 = self.get_bounds()
+        return x1 <= x <= x2 and y1 <= y <= y2
+    
     def move(self, dx: int, dy: int) -> None:
         """
         도형 이동
         """
         self.x += dx
         self.y += dy
+        self._notify_changed('x', 'y')
     
     def resize(self, dw: int, dh: int) -> None:
         """
         도형 사이즈 조정
         """
         self.width = max(10, self.width + dw)
-        self.height = max(10, self.height + dh) 
\ No newline at end of file
+        self.height = max(10, self.height + dh)
+        self._notify_changed('width', 'height')
+    
+    def _notify_changed(self, *fields: str) -> None:
+        """
+        도형이 속한 Canvas에 속성 변경 알림 (인덱스 갱신용)
+        """
+        if self._parent is not None and GEOMETRY_FIELDS.intersection(fields):
+            self._parent.invalidate_bounds()
+        if self._canvas is not None:
+            self._canvas.shape_changed(self, fields) 
\ No newline at end of file
@@ -1,5 +1,17 @@
-from typing import List, Optional
-from .base_shape import BaseShape
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+from .base_shape import GEOMETRY_FIELDS, BaseShape
+from .change_events import ChangeKind, ChangeSet
+from .document_io import SHAPE_TYPE_NAMES, LazyDocument, shape_type_code
+from .geometry import ShapeGeometry
+from .journal import shape_state
+from .selection import Selection
+from .shape_composite import ShapeComponent, ShapeGroup
+from .shape_store import ShapeStore
+from .spatial_index import SpatialIndex
+from .z_order import ZKey, ZOrderList
+
+MOVE_FIELDS = {'x', 'y'}
 
 class Canvas:
     _instance = None
@@ -8,43 +20,601 @@ class Canvas:
         """싱글톤 패턴 구현"""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance.shapes = []
-            cls._instance.selected_shapes = []
+            cls._instance.shapes = ZOrderList()
+            cls._instance.selection = Selection()
             cls._instance.observers = []
+            cls._instance.spatial_index = SpatialIndex()
+            cls._instance._pending_changes = ChangeSet()
+            cls._instance._batch_depth = 0  # 열려 있는 batch() 블록 수
+            cls._instance._batch_notify = False  # batch 중에 미뤄진 알림이 있음
+            cls._instance.shape_store = None
+            cls._instance.lazy_document = None  # 아직 도형으로 만들지 않은 row가 남은 문서
+            cls._instance._lazy_seq = 0
+            cls._instance.journal = None  # 변경을 기록할 Journal (자동 저장 사용 시)
+            cls._instance.groups: Dict[str, ShapeGroup] = {}  # group id -> 그룹 (중첩된 그룹 포함)
         return cls._instance
     
     def add_shape(self, shape: BaseShape) -> None:
         """도형 추가"""
-        self.shapes.append(shape)
+        if self.shape_store is not None:
+            self.shape_store.attach(shape)
+        self.shapes.add(shape)
+        shape._canvas = self
+        self.spatial_index.insert(shape)
+        self._pending_changes.add(ChangeKind.SHAPE_ADDED, [shape.id])
+        if self.journal is not None:
+            self.journal.append(['add', shape_state(shape)])
+        self.notify_observers()
+    
+    def add_shapes(self, shapes: Iterable[BaseShape]) -> None:
+        """
+        도형 여러 개 추가 (주어진 순서대로 위에 쌓임, 알림 한 번)
+        
+        z-order 목록에는 한 번에 병합하고 변경 기록도 하나로 남긴다.
+        """
+        shapes = list(shapes)
+        if not shapes:
+            return
+        first = self.shapes.reserve(len(shapes))
+        for shape in shapes:
+            if self.shape_store is not None:
+                self.shape_store.attach(shape)
+            shape._canvas = self
+            self.spatial_index.insert(shape)
+            if self.journal is not None:
+                self.journal.append(['add', shape_state(shape)])
+        self.shapes.add_many(shapes, list(range(first, first + len(shapes))))
+        self._pending_changes.add(ChangeKind.SHAPE_ADDED, [shape.id for shape in shapes])
         self.notify_observers()
     
     def remove_shape(self, shape: BaseShape) -> None:
-        """도형 제거"""
+        """도형 제거 (그룹에 속해 있으면 그룹에서도 빠지고, 빈 그룹은 없어짐)"""
         if shape in self.shapes:
             self.shapes.remove(shape)
-            if shape in self.selected_shapes:
-                self.selected_shapes.remove(shape)
+            self._detach_removed([shape])
             self.notify_observers()
     
-    def get_shapes(self) -> List[BaseShape]:
-        """z-order 기준으로 정렬된 도형 목록 반환"""
-        return sorted(self.shapes, key=lambda x: x.z_order)
-    
-    def select_shapes(self, shapes: List[BaseShape]) -> None:
-        """도형 선택 여부 (True/False) 변경"""
-        for shape in self.selected_shapes:
-            shape.selected = False
-        self.selected_shapes = shapes
+    def remove_shapes(self, shapes: Iterable[BaseShape]) -> None:
+        """도형 여러 개 제거 (캔버스에 없는 도형은 무시, 알림 한 번)"""
+        shapes = list({shape.id: shape for shape in shapes if shape in self.shapes}.values())
+        if not shapes:
+            return
+        self.shapes.remove_many(shapes)
+        self._detach_removed(shapes)
+        self.notify_observers()
+    
+    def _detach_removed(self, shapes: List[BaseShape]) -> None:
+        """z-order 목록에서 뺀 도형들을 그룹, 인덱스, 선택에서도 제거하고 기록"""
         for shape in shapes:
-            shape.selected = True
+            if shape._parent is not None:
+                self._leave_group(shape)
+            shape._canvas = None
+            self.spatial_index.remove(shape)
+            if self.shape_store is not None:
+                self.shape_store.detach(shape)
+            if self.journal is not None:
+                self.journal.append(['remove', shape.id])
+        self._pending_changes.add(ChangeKind.SHAPE_REMOVED, [shape.id for shape in shapes])
+        self._record_selection([], self.selection.discard(shapes))
+    
+    def load_shapes(self, shapes: List[BaseShape]) -> None:
+        """
+        문서 전체 교체 (불러오기용)
+        
+        도형마다 알림을 보내지 않고 인덱스를 한 번에 만든 뒤 전체 다시 그리기를 알린다.
+        """
+        self._detach_all()
+        self._attach_all(shapes)
+        self.shapes.reset(shapes)
+        self._pending_changes = ChangeSet(full_refresh=True)
         self.notify_observers()
     
+    def load_lazy(self, document: LazyDocument, rows: List[int]) -> None:
+        """
+        지연 로딩 문서로 전체 교체
+        
+        주어진 row(보통 화면에 보이는 영역)만 도형으로 만들고, 나머지는
+        load_pending으로 나누어 만든다. 아직 만들지 않은 row도 영역 검색과
+        z-order 연산에서는 필요할 때 바로 만들어진다.
+        """
+        self._detach_all()
+        self.shapes.clear()
+        if not document.count:
+            # 빈 문서는 만들 row가 없다 (열어 두면 first_pending 등이 -1을 돌려줌)
+            document.close()
+            self._pending_changes = ChangeSet(full_refresh=True)
+            self.notify_observers()
+            return
+        self.lazy_document = document
+        self._lazy_seq = self.shapes.reserve(document.count)
+        # 그룹의 bounds가 정확하도록 그룹에 속한 도형은 처음부터 만든다
+        grouped = document.grouped_rows()
+        self._materialize(sorted(set(rows).union(grouped)) if grouped else rows)
+        self._pending_changes = ChangeSet(full_refresh=True)
+        self.notify_observers()
+    
+    def load_pending(self, limit: Optional[int] = None) -> int:
+        """
+        지연 로딩 문서의 row를 z-order 아래쪽부터 최대 limit개 (None이면 전부) 만듦
+        
+        남은 row 수를 반환한다. 추가된 도형은 다음 notify_observers에서 알린다.
+        """
+        document = self.lazy_document
+        if document is None:
+            return 0
+        remaining = document.remaining
+        self._materialize(document.next_rows(remaining if limit is None else limit))
+        return self.lazy_document.remaining if self.lazy_document is not None else 0
+    
+    def clear(self) -> None:
+        """모든 도형 제거"""
+        self._close_lazy()
+        removed_ids = [shape.id for shape in self.shapes]
+        for shape in self.shapes:
+            shape._canvas = None
+        self.shapes.clear()
+        self.selection.clear()
+        self.groups = {}
+        self.spatial_index.clear()
+        if self.shape_store is not None:
+            self.shape_store.clear()
+        self._pending_changes.add(ChangeKind.SHAPE_REMOVED, removed_ids)
+        if self.journal is not None:
+            self.journal.append(['clear'])
+        self.notify_observers()
+    
+    def _detach_all(self) -> None:
+        self._close_lazy()
+        for shape in self.shapes:
+            shape._canvas = None
+        if self.shape_store is not None:
+            self.shape_store.clear()
+        self.spatial_index.clear()
+        self.selection.clear()
+        self.groups = {}
+    
+    def _attach_all(self, shapes: List[BaseShape]) -> None:
+        for shape in shapes:
+            if self.shape_store is not None:
+                self.shape_store.attach(shape)
+            shape._canvas = self
+            self.spatial_index.insert(shape)
+            # 불러온 도형이 속한 그룹 등록
+            group = shape._parent
+            while group is not None and group.id not in self.groups:
+                self.groups[group.id] = group
+                group = group._parent
+    
+    def _materialize(self, rows: List[int]) -> None:
+        """지연 로딩 문서의 row들을 도형으로 만들어 추가 (rows는 오름차순)"""
+        document = self.lazy_document
+        if not rows:
+            return
+        shapes = document.build(rows)
+        self._attach_all(shapes)
+        self.shapes.add_many(shapes, [self._lazy_seq + row for row in rows])
+        self._pending_changes.add(ChangeKind.SHAPE_ADDED, [shape.id for shape in shapes])
+        if not document.remaining:
+            self._close_lazy()
+    
+    def _materialize_neighbours(self, shapes: List[BaseShape], above: bool) -> None:
+        """z-order 상 바로 위(above=True) 또는 아래의 아직 만들지 않은 row를 만듦"""
+        document = self.lazy_document
+        if document is None:
+            return
+        rows = set()
+        for shape in shapes:
+            z_order, seq = self.shapes.key(shape)
+            position = document.position(z_order, seq - self._lazy_seq)
+            row = document.first_pending(position) if above else document.last_pending(position)
+            if row >= 0:
+                rows.add(row)
+        self._materialize(sorted(rows))
+    
+    def _close_lazy(self) -> None:
+        if self.lazy_document is not None:
+            self.lazy_document.close()
+            self.lazy_document = None
+    
+    def use_shape_store(self, enabled: bool = True) -> None:
+        """
+        도형 속성을 ShapeStore 컬럼에 보관할지 설정
+        
+        대용량 문서에서 메모리를 줄이기 위한 선택 기능이며, 도형 객체와
+        Canvas API는 그대로 사용할 수 있다.
+        """
+        if enabled and self.shape_store is None:
+            self.shape_store = ShapeStore()
+            for shape in self.shapes:
+                self.shape_store.attach(shape)
+        elif not enabled and self.shape_store is not None:
+            self.shape_store.clear()
+            self.shape_store = None
+    
+    def get_shapes(self) -> List[BaseShape]:
+        """z-order 기준으로 정렬된 도형 목록 반환 (정렬 상태가 유지되므로 복사만 수행)"""
+        return list(self.shapes)
+    
+    def get_shape(self, shape_id: str) -> Optional[BaseShape]:
+        """id로 도형 조회"""
+        return self.shapes.get(shape_id)
+    
+    def shape_below(self, shape: BaseShape) -> Optional[BaseShape]:
+        """z-order 상 바로 아래 도형 반환"""
+        index = self.shapes.index(shape)
+        return self.shapes[index - 1] if index > 0 else None
+    
+    def find_shape_at(self, x: float, y: float) -> Optional[BaseShape]:
+        """(x, y) 위치의 최상위 도형 반환 (공간 인덱스 사용)"""
+        if self.lazy_document is not None:
+            self._materialize(self.lazy_document.rows_at(x, y))
+        candidates = self.spatial_index.query_point(x, y)
+        if not candidates:
+            return None
+        return max(candidates, key=self.shapes.key)
+    
+    def shapes_in_rect(self, x1: float, y1: float, x2: float, y2: float,
+                       contained: bool = False) -> List[BaseShape]:
+        """
+        영역과 겹치는 (contained=True면 완전히 포함되는) 도형 목록을 z-order 순으로 반환
+        """
+        if self.lazy_document is not None:
+            self._materialize(self.lazy_document.rows_in_rect(x1, y1, x2, y2, contained))
+        candidates = self.spatial_index.query_rect(x1, y1, x2, y2)
+        if contained and candidates:
+            geometry = ShapeGeometry.from_shapes(candidates)
+            candidates = geometry.select(geometry.rect_mask(x1, y1, x2, y2, contained=True))
+        return sorted(candidates, key=self.shapes.key)
+    
+    def get_bounds(self) -> Tuple[float, float, float, float]:
+        """모든 도형을 감싸는 bounding box 반환"""
+        if self.shape_store is not None:
+            bounds = ShapeGeometry.from_store(self.shape_store).bounds()
+        else:
+            bounds = ShapeGeometry.from_shapes(list(self.shapes)).bounds()
+        pending = self.lazy_document.pending_bounds() if self.lazy_document is not None else None
+        if pending is None:
+            return bounds
+        if not len(self.shapes):
+            return pending
+        return (min(bounds[0], pending[0]), min(bounds[1], pending[1]),
+                max(bounds[2], pending[2]), max(bounds[3], pending[3]))
+    
+    # Groups
+    def top_level(self, component: ShapeComponent) -> ShapeComponent:
+        """도형/그룹이 속한 최상위 그룹 (그룹에 속하지 않으면 자기 자신)"""
+        while component._parent is not None:
+            component = component._parent
+        return component
+    
+    def selection_unit(self, shape: BaseShape) -> List[BaseShape]:
+        """클릭으로 함께 선택되는 도형 목록 (최상위 그룹의 모든 도형)"""
+        top = self.top_level(shape)
+        return top.leaves() if isinstance(top, ShapeGroup) else [shape]
+    
+    def group_shapes(self, components: List[ShapeComponent], group: Optional[ShapeGroup] = None) -> ShapeGroup:
+        """
+        도형/그룹들의 최상위 그룹을 자식으로 하는 새 그룹 생성
+        
+        group을 주면 (비어 있는) 그 그룹 객체를 사용한다 (다시 실행용).
+        """
+        children = list({id(top): top for top in map(self.top_level, components)}.values())
+        group = group if group is not None else ShapeGroup()
+        for child in children:
+            group.add(child)
+        self.groups[group.id] = group
+        self._pending_changes.add(ChangeKind.GROUP_CHANGED, [s.id for s in group.leaves()])
+        if self.journal is not None:
+            self.journal.append(['group', group.id, [child.id for child in children]])
+        return group
+    
+    def ungroup(self, group: ShapeGroup) -> List[ShapeComponent]:
+        """그룹 해제 (자식은 그룹의 부모 그룹으로 옮겨짐). 자식 목록 반환"""
+        leaf_ids = [s.id for s in group.leaves()]
+        parent = group._parent
+        children = list(group.shapes)
+        for child in children:
+            group.remove(child)
+        if parent is not None:
+            parent.remove(group)
+            for child in children:
+                parent.add(child)
+        self.groups.pop(group.id, None)
+        self._pending_changes.add(ChangeKind.GROUP_CHANGED, leaf_ids)
+        if self.journal is not None:
+            self.journal.append(['ungroup', group.id])
+        return children
+    
+    def join_group(self, component: ShapeComponent, group: ShapeGroup, index: Optional[int] = None) -> None:
+        """
+        그룹에 속하지 않은 도형/그룹을 기존 (또는 없어졌던) 그룹의 index 위치에 넣음
+        
+        실행 취소로 빠졌던 그룹 구성을 되돌릴 때 쓴다. group이 등록되어 있지
+        않으면 다시 등록한다.
+        """
+        group.add(component, index)
+        self.groups[group.id] = group
+        if isinstance(component, ShapeGroup):
+            for subgroup in component.groups():
+                self.groups[subgroup.id] = subgroup
+        leaves = component.leaves() if isinstance(component, ShapeGroup) else [component]
+        self._pending_changes.add(ChangeKind.GROUP_CHANGED, [s.id for s in leaves])
+        if self.journal is not None:
+            self.journal.append(['join', group.id, component.id, index])
+    
+    def components_in_rect(self, x1: float, y1: float, x2: float, y2: float,
+                           contained: bool = False) -> List[ShapeComponent]:
+        """
+        영역과 겹치는 (contained=True면 완전히 포함되는) 최상위 도형/그룹 목록
+        
+        그룹에 속하지 않은 도형은 공간 인덱스로 찾고, 최상위 그룹은 캐시된
+        bounds로 판정한다. 겹침 판정은 bounds가 영역과 겹치는 하위 그룹으로만
+        내려간다 (ShapeGroup.overlaps_rect).
+        """
+        x1, x2 = sorted((x1, x2))
+        y1, y2 = sorted((y1, y2))
+        # 아직 만들지 않은 row와 그 그룹도 여기서 만들어짐
+        found: List[ShapeComponent] = [shape for shape in self.shapes_in_rect(x1, y1, x2, y2, contained)
+                                       if shape._parent is None]
+        for group in self.groups.values():
+            if group._parent is not None:
+                continue
+            if contained:
+                bx1, by1, bx2, by2 = group.get_bounds()
+                hit = bool(group.shapes) and x1 <= bx1 and bx2 <= x2 and y1 <= by1 and by2 <= y2
+            else:
+                hit = group.overlaps_rect(x1, y1, x2, y2)
+            if hit:
+                found.append(group)
+        return found
+    
+    def _leave_group(self, component: ShapeComponent) -> None:
+        """그룹에서 빼고, 비게 된 그룹은 조상 쪽으로 차례로 없앰"""
+        group = component._parent
+        group.remove(component)
+        while group is not None and not group.shapes:
+            parent = group._parent
+            if parent is not None:
+                parent.remove(group)
+            self.groups.pop(group.id, None)
+            group = parent
+    
+    def z_range(self) -> Optional[Tuple[int, int]]:
+        """z_order 최소/최대 (정렬 상태가 유지되므로 O(1))"""
+        document = self.lazy_document
+        if document is not None:
+            # row는 z-order 순이므로 양 끝의 미생성 row만 만들면 된다
+            self._materialize(sorted({document.first_pending(), document.last_pending()}))
+        if not len(self.shapes):
+            return None
+        return (self.shapes[0].z_order, self.shapes[-1].z_order)
+    
+    def shape_changed(self, shape: BaseShape, fields) -> None:
+        """도형 속성 변경 시 호출 (BaseShape._notify_changed)"""
+        if GEOMETRY_FIELDS.intersection(fields):
+            self.spatial_index.update(shape)
+        if 'z_order' in fields:
+            self.shapes.reposition(shape)
+            self._pending_changes.add(ChangeKind.Z_REORDERED, [shape.id], ['z_order'])
+        kind = ChangeKind.SHAPE_MOVED if MOVE_FIELDS.issuperset(fields) else ChangeKind.PROPERTY_CHANGED
+        self._pending_changes.add(kind, [shape.id], fields)
+        if self.journal is not None:
+            values = {name: getattr(shape, name) for name in fields if name != 'selected'}
+            if values:
+                self.journal.append(['set', shape.id, values])
+    
+    def bring_to_front(self, shapes: List[BaseShape]) -> None:
+        """도형들을 맨 앞으로 이동 (주어진 순서대로 쌓임)"""
+        self._log_reorder('bring_to_front', shapes)
+        if self.lazy_document is not None:
+            self._materialize([self.lazy_document.last_pending()])
+        self.shapes.move_to_front(shapes)
+        self._record_reorder(shapes)
+    
+    def send_to_back(self, shapes: List[BaseShape]) -> None:
+        """도형들을 맨 뒤로 이동"""
+        self._log_reorder('send_to_back', shapes)
+        if self.lazy_document is not None:
+            self._materialize([self.lazy_document.first_pending()])
+        self.shapes.move_to_back(shapes)
+        self._record_reorder(shapes)
+    
+    def bring_forward(self, shapes: List[BaseShape]) -> None:
+        """
+        도형들을 한 단계 앞으로 이동
+        
+        위쪽 도형부터 처리하며, 바로 위가 함께 이동하는 도형이면 제자리에 둔다.
+        """
+        self._log_reorder('bring_forward', shapes)
+        self._materialize_neighbours(shapes, above=True)
+        moving = {shape.id for shape in shapes}
+        swapped = []
+        for index in sorted((self.shapes.index(s) for s in shapes), reverse=True):
+            if index < len(self.shapes) - 1 and self.shapes[index + 1].id not in moving:
+                swapped += [self.shapes[index], self.shapes[index + 1]]
+                self.shapes.swap(self.shapes[index], self.shapes[index + 1])
+        self._record_reorder(swapped)
+    
+    def send_backward(self, shapes: List[BaseShape]) -> None:
+        """도형들을 한 단계 뒤로 이동 (아래쪽 도형부터 처리)"""
+        self._log_reorder('send_backward', shapes)
+        self._materialize_neighbours(shapes, above=False)
+        moving = {shape.id for shape in shapes}
+        swapped = []
+        for index in sorted(self.shapes.index(s) for s in shapes):
+            if index > 0 and self.shapes[index - 1].id not in moving:
+                swapped += [self.shapes[index], self.shapes[index - 1]]
+                self.shapes.swap(self.shapes[index], self.shapes[index - 1])
+        self._record_reorder(swapped)
+    
+    def z_neighbourhood(self, shapes: List[BaseShape]) -> List[BaseShape]:
+        """도형들과 z-order 상 바로 위/아래 도형 목록 (z-order 연산 전 배치 기록용)"""
+        self._materialize_neighbours(shapes, above=True)
+        self._materialize_neighbours(shapes, above=False)
+        found = {}
+        for shape in shapes:
+            index = self.shapes.index(shape)
+            for i in range(max(index - 1, 0), min(index + 2, len(self.shapes))):
+                found[self.shapes[i].id] = self.shapes[i]
+        return list(found.values())
+    
+    def z_positions(self, shapes: List[BaseShape]) -> List[Tuple[BaseShape, ZKey]]:
+        """도형별 (도형, 정렬 키)를 아래쪽부터 반환 (restore_z_positions로 되돌릴 때 사용)"""
+        return sorted(((shape, self.shapes.key(shape)) for shape in shapes), key=lambda p: p[1])
+    
+    def restore_z_positions(self, positions: List[Tuple[BaseShape, ZKey]]) -> None:
+        """
+        z_positions로 기록한 정렬 키로 되돌림 (이미 제거된 도형은 건너뜀)
+        
+        저널에는 키 대신 되돌린 뒤의 (z_order, 바로 아래 도형)을 남긴다.
+        다시 불러온 문서에서는 seq 번호가 달라지기 때문이다.
+        """
+        positions = [(shape, key) for shape, key in positions if self.get_shape(shape.id) is shape]
+        if not positions:
+            return
+        self.shapes.restore(positions)
+        self._placed([shape for shape, _ in positions])
+    
+    def place_shapes(self, placement: List[Tuple[BaseShape, int, Optional[BaseShape]]]) -> None:
+        """
+        (도형, z_order, 바로 아래 도형) 배치대로 놓음 (저널 재생용, 아래쪽 도형부터)
+        
+        도형들을 모두 뺀 뒤 아래쪽부터 넣으므로 below가 함께 옮겨지는 도형이어도 된다.
+        below가 None이면 맨 아래에 놓는다.
+        """
+        shapes = [shape for shape, _, _ in placement]
+        self.shapes.remove_many(shapes)
+        for shape, z_order, below in placement:
+            if below is not None and below not in self.shapes:
+                below = None
+            self.shapes.place(shape, z_order, below)
+        self._placed(shapes)
+    
+    def _placed(self, shapes: List[BaseShape]) -> None:
+        if self.journal is not None:
+            placement = []
+            for index in sorted(self.shapes.index(shape) for shape in shapes):
+                shape, below = self.shapes[index], self.shapes[index - 1] if index > 0 else None
+                placement.append([shape.id, shape.z_order, below.id if below is not None else None])
+            self.journal.append(['place', placement])
+        self._record_reorder(shapes)
+    
+    def _log_reorder(self, operation: str, shapes: List[BaseShape]) -> None:
+        if self.journal is not None and shapes:
+            self.journal.append(['z', operation, [shape.id for shape in shapes]])
+    
+    def _record_reorder(self, shapes: List[BaseShape]) -> None:
+        if shapes:
+            self._pending_changes.add(ChangeKind.Z_REORDERED, [s.id for s in shapes], ['z_order'])
+    
+    # Selection
+    @property
+    def selected_shapes(self) -> List[BaseShape]:
+        """선택된 도형 목록 (선택한 순서로 만든 복사본, 포함 여부 확인은 selection 사용)"""
+        return self.selection.to_list()
+    
+    def select_shapes(self, shapes: Iterable[BaseShape]) -> None:
+        """
+        선택을 shapes로 교체
+        
+        선택 상태가 실제로 바뀐 도형만 SELECTED/DESELECTED로 알린다 (바뀐 게 없으면 알리지 않음).
+        """
+        self._selection_changed(*self.selection.replace(shapes))
+    
+    def add_to_selection(self, shapes: Iterable[BaseShape]) -> None:
+        """선택에 추가 (이미 선택된 도형은 그대로)"""
+        self._selection_changed(self.selection.add(shapes), [])
+    
+    def remove_from_selection(self, shapes: Iterable[BaseShape]) -> None:
+        """선택에서 제거"""
+        self._selection_changed([], self.selection.discard(shapes))
+    
+    def toggle_selection(self, shape: BaseShape) -> None:
+        """도형 하나를 선택 목록에 추가하거나 제거 (다중 선택용)"""
+        if shape in self.selection:
+            self.remove_from_selection([shape])
+        else:
+            self.add_to_selection([shape])
+    
+    def select_all(self) -> None:
+        """모든 도형 선택 (지연 로딩 중이면 남은 row도 모두 만듦)"""
+        self.load_pending()
+        self.select_shapes(self.shapes)
+    
+    def invert_selection(self) -> None:
+        """선택된 도형은 해제하고 나머지 도형을 선택"""
+        self.load_pending()
+        selected = self.selection.ids()
+        self.select_shapes([shape for shape in self.shapes if shape.id not in selected])
+    
+    def select_by_type(self, shape_type: str, extend: bool = False) -> None:
+        """
+        종류가 shape_type('rectangle', 'line', ...)인 도형 선택
+        
+        extend가 True이면 기존 선택에 추가한다.
+        """
+        if shape_type not in SHAPE_TYPE_NAMES:
+            raise ValueError(f"Unknown shape type: {shape_type}")
+        self.load_pending()
+        code = SHAPE_TYPE_NAMES.index(shape_type)
+        shapes = [shape for shape in self.shapes if shape_type_code(shape) == code]
+        if extend:
+            self.add_to_selection(shapes)
+        else:
+            self.select_shapes(shapes)
+    
+    def _selection_changed(self, added: List[BaseShape], removed: List[BaseShape]) -> None:
+        if added or removed:
+            self._record_selection(added, removed)
+            self.notify_observers()
+    
+    def _record_selection(self, added: List[BaseShape], removed: List[BaseShape]) -> None:
+        if added:
+            self._pending_changes.add(ChangeKind.SELECTED, [shape.id for shape in added], ['selected'])
+        if removed:
+            self._pending_changes.add(ChangeKind.DESELECTED, [shape.id for shape in removed], ['selected'])
+    
     def add_observer(self, observer) -> None:
         """옵저버 등록"""
         if observer not in self.observers:
             self.observers.append(observer)
     
+    @contextmanager
+    def batch(self):
+        """
+        알림을 모아 한 번에 보내는 트랜잭션 (중첩 가능)
+        
+            with canvas.batch():
+                canvas.add_shapes(shapes)
+                canvas.select_shapes(shapes)
+        
+        블록 안의 notify_observers 호출은 미뤄지고, 가장 바깥 블록이 끝날 때
+        쌓인 변경 기록을 ChangeSet 하나로 한 번 알린다. 예외로 빠져나와도
+        이미 적용된 변경은 알린다 (되돌리지는 않음).
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and (self._batch_notify or self._pending_changes):
+                self._batch_notify = False
+                self.notify_observers()
+    
     def notify_observers(self) -> None:
-        """옵저버 변경사항 알림"""
+        """
+        옵저버 변경사항 알림
+        
+        쌓여 있던 변경 기록을 ChangeSet으로 묶어 전달한다. 기록이 없으면
+        무엇이 바뀌었는지 알 수 없으므로 full_refresh로 알린다.
+        batch() 블록 안에서는 블록이 끝날 때까지 미뤄진다.
+        """
+        if self._batch_depth:
+            self._batch_notify = True
+            return
+        changes = self._pending_changes
+        self._pending_changes = ChangeSet()
+        if not changes:
+            changes.full_refresh = True
         for observer in self.observers:
-            observer.update() 
\ No newline at end of file
+            observer.update(changes)
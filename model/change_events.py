@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class ChangeKind(Enum):
+    """모델 변경 종류"""
+    SHAPE_ADDED = "shape_added"
+    SHAPE_REMOVED = "shape_removed"
+    SHAPE_MOVED = "shape_moved"
+    PROPERTY_CHANGED = "property_changed"
+    Z_REORDERED = "z_reordered"
+    SELECTED = "selected"  # 선택에 추가됨
+    DESELECTED = "deselected"  # 선택에서 빠짐
+    GROUP_CHANGED = "group_changed"  # 그룹 구성 변경 (다시 그릴 필요 없음)
+
+
+@dataclass(frozen=True)
+class ChangeRecord:
+    """변경 기록 한 건 (대상 도형 id와 변경된 속성 이름)"""
+    kind: ChangeKind
+    shape_ids: Tuple[str, ...]
+    fields: FrozenSet[str] = frozenset()
+
+
+# 다시 그려야 하는 변경 종류 (삭제 제외)
+_DIRTY_KINDS = {
+    ChangeKind.SHAPE_ADDED,
+    ChangeKind.SHAPE_MOVED,
+    ChangeKind.PROPERTY_CHANGED,
+    ChangeKind.Z_REORDERED,
+    ChangeKind.SELECTED,
+    ChangeKind.DESELECTED,
+}
+
+
+class ChangeSet:
+    """
+    notify_observers 한 번에 전달되는 변경 기록 모음
+
+    full_refresh가 True이면 변경 내용을 알 수 없으므로 전체를 다시
+    처리해야 한다 (기록 없이 notify_observers가 호출된 경우).
+    """
+
+    def __init__(self, records: Optional[Iterable[ChangeRecord]] = None, full_refresh: bool = False):
+        self.records: List[ChangeRecord] = list(records or [])
+        self.full_refresh = full_refresh
+
+    def __iter__(self) -> Iterator[ChangeRecord]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __bool__(self) -> bool:
+        return self.full_refresh or bool(self.records)
+
+    def __repr__(self) -> str:
+        return f"ChangeSet({self.records!r}, full_refresh={self.full_refresh})"
+
+    def add(self, kind: ChangeKind, shape_ids: Iterable[str], fields: Iterable[str] = ()) -> None:
+        """변경 기록 추가"""
+        self.records.append(ChangeRecord(kind, tuple(shape_ids), frozenset(fields)))
+
+    def merge(self, other: "ChangeSet") -> None:
+        """다른 변경 모음을 뒤에 이어 붙임"""
+        self.records.extend(other.records)
+        self.full_refresh = self.full_refresh or other.full_refresh
+
+    def ids(self, *kinds: ChangeKind) -> Set[str]:
+        """주어진 종류의 변경에 포함된 도형 id 집합"""
+        result: Set[str] = set()
+        for record in self.records:
+            if record.kind in kinds:
+                result.update(record.shape_ids)
+        return result
+
+    def added_ids(self) -> Set[str]:
+        return self.ids(ChangeKind.SHAPE_ADDED) - self.removed_ids()
+
+    def removed_ids(self) -> Set[str]:
+        """삭제된 도형 id (같은 변경 모음 안에서 다시 추가된 도형 제외)"""
+        removed: Set[str] = set()
+        for record in self.records:
+            if record.kind == ChangeKind.SHAPE_REMOVED:
+                removed.update(record.shape_ids)
+            elif record.kind == ChangeKind.SHAPE_ADDED:
+                removed.difference_update(record.shape_ids)
+        return removed
+
+    def dirty_ids(self) -> Set[str]:
+        """다시 그려야 하는 (남아 있는) 도형 id"""
+        return self.ids(*_DIRTY_KINDS) - self.removed_ids()
+
+    def reordered_ids(self) -> Set[str]:
+        """쌓임 순서를 다시 맞춰야 하는 도형 id (추가 + z-order 변경)"""
+        return self.ids(ChangeKind.SHAPE_ADDED, ChangeKind.Z_REORDERED) - self.removed_ids()
+
+    def selection_diff(self) -> Tuple[Set[str], Set[str]]:
+        """
+        (새로 선택된 도형 id, 선택 해제된 도형 id)
+
+        같은 변경 모음 안에서 선택했다가 해제한 도형은 양쪽 모두에서 빠진다.
+        """
+        added: Set[str] = set()
+        removed: Set[str] = set()
+        for record in self.records:
+            if record.kind == ChangeKind.SELECTED:
+                for shape_id in record.shape_ids:
+                    if shape_id in removed:
+                        removed.discard(shape_id)
+                    else:
+                        added.add(shape_id)
+            elif record.kind == ChangeKind.DESELECTED:
+                for shape_id in record.shape_ids:
+                    if shape_id in added:
+                        added.discard(shape_id)
+                    else:
+                        removed.add(shape_id)
+        return added, removed
+
+    def fields_for(self, shape_id: str) -> Set[str]:
+        """도형에서 변경된 속성 이름 집합"""
+        result: Set[str] = set()
+        for record in self.records:
+            if shape_id in record.shape_ids:
+                result.update(record.fields)
+        return result
+
+    def has(self, kind: ChangeKind) -> bool:
+        return any(record.kind == kind for record in self.records)
@@ -0,0 +1,484 @@
+"""
+문서 저장/불러오기 (컬럼 기반 바이너리 포맷)
+
+파일 구조 (little-endian)::
+
+    header   : magic(4) version(u16) flags(u16) shape_count(u32) column_count(u16)
+    body     : (flags & FLAG_ZLIB 이면 zlib 압축)
+      strings: count(u32) lengths(u32 * count) utf-8 blob
+      columns: name_len(u8) name typecode(u8) byte_len(u32) raw bytes  * column_count
+
+도형은 z-order 순으로 저장되며, 문자열 속성(id, text, 글꼴, 색상, 이미지 경로)은
+문자열 테이블 인덱스로 저장된다. 선택 컬럼 group은 도형이 속한 그룹 id들을
+최상위 그룹부터 '/'로 이은 경로다 (그룹에 속하지 않으면 빈 문자열). 불러올 때는 컬럼을 array로 한 번에 읽은 뒤
+__init__ (uuid 생성)을 거치지 않고 도형 객체를 만든다.
+"""
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Tuple
+from .base_shape import BaseShape
+from .geometry import ShapeGeometry
+from .shape_composite import ShapeGroup
+from .shapes.rectangle import Rectangle
+from .shapes.ellipse import Ellipse
+from .shapes.line import Line
+from .shapes.text import Text
+from .shapes.image import Image
+
+try:
+    import numpy as np
+except ImportError:  # NumPy는 선택 의존성
+    np = None
+
+MAGIC = b'MRDH'
+VERSION = 1
+FLAG_ZLIB = 1
+
+SHAPE_CLASSES = [Rectangle, Ellipse, Line, Text, Image]
+SHAPE_TYPE_NAMES = ['rectangle', 'ellipse', 'line', 'text', 'image']
+
+BIT_FRAME = 1
+BIT_SHADOW = 2
+
+# 컬럼 이름 -> array typecode
+COLUMNS = {
+    'type': 'B',
+    'id': 'I',
+    'x': 'd',
+    'y': 'd',
+    'width': 'd',
+    'height': 'd',
+    'z_order': 'q',
+    'flags': 'B',
+    'fill': 'I',
+    'outline': 'I',
+    'text': 'I',
+    'x2': 'd',
+    'y2': 'd',
+    'font': 'I',
+    'font_size': 'i',
+    'text_color': 'I',
+    'image_path': 'I',
+}
+
+# 없어도 되는 컬럼 (이전에 저장된 문서에는 없음)
+OPTIONAL_COLUMNS = {
+    'group': 'I',
+}
+
+_HEADER = struct.Struct('<4sHHIH')
+_type_codes: Dict[type, int] = {}
+
+
+class DocumentFormatError(ValueError):
+    """파일이 문서 포맷이 아니거나 손상된 경우"""
+
+
+def shape_type_code(shape: BaseShape) -> int:
+    """도형 클래스의 타입 코드 (ShapeStore의 stored 클래스 포함)"""
+    cls = type(shape)
+    code = _type_codes.get(cls)
+    if code is None:
+        code = next(i for i, base in enumerate(SHAPE_CLASSES) if issubclass(cls, base))
+        _type_codes[cls] = code
+    return code
+
+
+def _number(value):
+    """정수 값은 int로 (float 컬럼에서 읽은 값)"""
+    return int(value) if value.is_integer() else value
+
+
+def dumps(shapes: Iterable[BaseShape], compress: bool = True) -> bytes:
+    """도형 목록 (z-order 순)을 바이트로 직렬화"""
+    strings: List[str] = []
+    string_index: Dict[str, int] = {}
+
+    def intern(value) -> int:
+        value = '' if value is None else str(value)
+        index = string_index.get(value)
+        if index is None:
+            index = string_index[value] = len(strings)
+            strings.append(value)
+        return index
+
+    intern('')
+    columns = {name: array(code) for name, code in {**COLUMNS, **OPTIONAL_COLUMNS}.items()}
+    c = columns
+    group_paths: Dict[int, int] = {}  # id(그룹) -> 경로 문자열 인덱스
+
+    def group_path(group) -> int:
+        index = group_paths.get(id(group))
+        if index is None:
+            path = group.id if group._parent is None else strings[group_path(group._parent)] + '/' + group.id
+            index = group_paths[id(group)] = intern(path)
+        return index
+
+    count = 0
+    for shape in shapes:
+        code = shape_type_code(shape)
+        cls = SHAPE_CLASSES[code]
+        c['type'].append(code)
+        c['id'].append(intern(shape.id))
+        c['x'].append(shape.x)
+        c['y'].append(shape.y)
+        c['width'].append(shape.width)
+        c['height'].append(shape.height)
+        c['z_order'].append(shape.z_order)
+        c['flags'].append((BIT_FRAME if shape.has_frame else 0) | (BIT_SHADOW if shape.has_shadow else 0))
+        c['fill'].append(intern(shape.fill))
+        c['outline'].append(intern(shape.outline))
+        c['text'].append(intern(shape.text))
+        c['x2'].append(shape.x2 if cls is Line else 0)
+        c['y2'].append(shape.y2 if cls is Line else 0)
+        if cls is Text:
+            c['font'].append(intern(shape.font))
+            c['font_size'].append(shape.font_size)
+            c['text_color'].append(intern(shape.text_color))
+        else:
+            c['font'].append(0)
+            c['font_size'].append(0)
+            c['text_color'].append(0)
+        c['image_path'].append(intern(shape.image_path) if cls is Image else 0)
+        c['group'].append(group_path(shape._parent) if shape._parent is not None else 0)
+        count += 1
+
+    encoded = [s.encode('utf-8') for s in strings]
+    lengths = array('I', [len(b) for b in encoded])
+    parts = [struct.pack('<I', len(encoded)), _le_bytes(lengths), b''.join(encoded)]
+    for name, column in columns.items():
+        raw = _le_bytes(column)
+        parts.append(struct.pack('<B', len(name)) + name.encode('ascii'))
+        parts.append(struct.pack('<BI', ord(column.typecode), len(raw)))
+        parts.append(raw)
+    body = b''.join(parts)
+
+    flags = 0
+    if compress:
+        body = zlib.compress(body, 1)
+        flags |= FLAG_ZLIB
+    return _HEADER.pack(MAGIC, VERSION, flags, count, len(columns)) + body
+
+
+def loads(data: bytes) -> List[BaseShape]:
+    """바이트에서 도형 목록 (z-order 순) 복원"""
+    count, columns, strings = read_columns(data)
+    return build_shapes(columns, strings, range(count))
+
+
+def read_columns(data) -> Tuple[int, Dict[str, array], List[str]]:
+    """헤더를 검사하고 컬럼과 문자열 테이블만 읽음 (도형 객체는 만들지 않음)"""
+    count, column_count, body = _read_header(data)
+    columns, strings = _read_body(body, count, column_count, lazy=False)
+    return count, columns, strings
+
+
+def _read_header(data):
+    """헤더 검사 후 (도형 수, 컬럼 수, 본문 memoryview) 반환"""
+    if len(data) < _HEADER.size:
+        raise DocumentFormatError("File is too short to be a document")
+    magic, version, flags, count, column_count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise DocumentFormatError("Not a Miridih document")
+    if version > VERSION:
+        raise DocumentFormatError(f"Unsupported document version {version}")
+    body = memoryview(data)[_HEADER.size:]
+    if flags & FLAG_ZLIB:
+        try:
+            body = memoryview(zlib.decompress(body))
+        except zlib.error as e:
+            raise DocumentFormatError(f"Corrupt document: {e}") from e
+    return count, column_count, body
+
+
+def _read_body(body: memoryview, count: int, column_count: int, lazy: bool):
+    """
+    문자열 테이블과 컬럼 읽기
+
+    lazy=True이면 컬럼은 본문 버퍼를 복사하지 않는 memoryview로, 문자열은
+    처음 접근할 때 디코딩하는 LazyStrings로 반환한다.
+    """
+    try:
+        (string_count,) = struct.unpack_from('<I', body, 0)
+        offset = 4
+        lengths = _read_array('I', body[offset:offset + 4 * string_count])
+        offset += 4 * string_count
+        if lazy:
+            strings = LazyStrings(body, offset, lengths)
+            offset += sum(lengths)
+        else:
+            strings = []
+            for length in lengths:
+                strings.append(str(body[offset:offset + length], 'utf-8'))
+                offset += length
+
+        columns = {}
+        for _ in range(column_count):
+            name_len = body[offset]
+            name = str(body[offset + 1:offset + 1 + name_len], 'ascii')
+            offset += 1 + name_len
+            typecode, byte_len = struct.unpack_from('<BI', body, offset)
+            offset += 5
+            raw = body[offset:offset + byte_len]
+            if len(raw) != byte_len:
+                raise ValueError(f"column {name} is truncated")
+            if lazy and (sys.byteorder == 'little' or array(chr(typecode)).itemsize == 1):
+                columns[name] = raw.cast(chr(typecode))
+            else:
+                columns[name] = _read_array(chr(typecode), raw)
+            offset += byte_len
+    except (struct.error, IndexError, ValueError, TypeError) as e:
+        raise DocumentFormatError(f"Corrupt document: {e}") from e
+
+    missing = [name for name in COLUMNS if name not in columns or len(columns[name]) != count]
+    missing += [name for name in OPTIONAL_COLUMNS if name in columns and len(columns[name]) != count]
+    if missing:
+        raise DocumentFormatError(f"Corrupt document: bad columns {missing}")
+    return columns, strings
+
+
+class LazyStrings:
+    """문자열 테이블 (인덱스로 처음 접근할 때 디코딩)"""
+
+    def __init__(self, body: memoryview, offset: int, lengths: array):
+        self._body = body
+        self._starts = array('Q', accumulate(lengths, initial=offset))
+        self._decoded: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._starts) - 1
+
+    def __getitem__(self, index: int) -> str:
+        value = self._decoded.get(index)
+        if value is None:
+            if not 0 <= index < len(self):
+                raise IndexError(index)
+            value = str(self._body[self._starts[index]:self._starts[index + 1]], 'utf-8')
+            self._decoded[index] = value
+        return value
+
+    def release(self) -> None:
+        self._body = None
+
+
+def build_shapes(columns: Dict[str, array], strings: List[str], rows: Iterable[int],
+                 groups: Optional[Dict[str, ShapeGroup]] = None) -> List[BaseShape]:
+    """
+    컬럼의 주어진 row들로 도형 객체 생성 (__init__ 생략)
+
+    그룹에 속한 도형은 groups (그룹 경로 -> ShapeGroup)의 그룹에 추가한다.
+    없는 그룹은 만들어 넣으므로, 같은 dict로 나누어 만들면 같은 그룹에 모인다.
+    """
+    c = columns
+    group_column = c.get('group')
+    if groups is None:
+        groups = {}
+    types, ids = c['type'], c['id']
+    xs, ys, widths, heights = c['x'], c['y'], c['width'], c['height']
+    z_orders, flags = c['z_order'], c['flags']
+    fills, outlines, texts = c['fill'], c['outline'], c['text']
+    shapes = []
+    for row in rows:
+        code = types[row]
+        cls = SHAPE_CLASSES[code]
+        shape = cls.__new__(cls)
+        shape.id = strings[ids[row]]
+        shape.x = _number(xs[row])
+        shape.y = _number(ys[row])
+        shape.width = _number(widths[row])
+        shape.height = _number(heights[row])
+        shape.text = strings[texts[row]]
+        shape.z_order = z_orders[row]
+        shape.has_frame = bool(flags[row] & BIT_FRAME)
+        shape.has_shadow = bool(flags[row] & BIT_SHADOW)
+        shape.selected = False
+        shape.fill = strings[fills[row]]
+        shape.outline = strings[outlines[row]]
+        shape._canvas = None
+        shape._store = None
+        shape._row = -1
+        shape._parent = None
+        if code < 3:
+            shape.shape_type = SHAPE_TYPE_NAMES[code]
+        if cls is Line:
+            shape.x2 = _number(c['x2'][row])
+            shape.y2 = _number(c['y2'][row])
+        elif cls is Text:
+            shape.font = strings[c['font'][row]]
+            shape.font_size = c['font_size'][row]
+            shape.text_color = strings[c['text_color'][row]]
+        elif cls is Image:
+            shape.image_path = strings[c['image_path'][row]]
+        if group_column is not None and group_column[row]:
+            _group_for_path(strings[group_column[row]], groups).add(shape)
+        shapes.append(shape)
+    return shapes
+
+
+def _group_for_path(path: str, groups: Dict[str, ShapeGroup]) -> ShapeGroup:
+    group = groups.get(path)
+    if group is None:
+        parent_path, _, group_id = path.rpartition('/')
+        group = groups[path] = ShapeGroup(group_id=group_id)
+        if parent_path:
+            _group_for_path(parent_path, groups).add(group)
+    return group
+
+
+def save_document(shapes: Iterable[BaseShape], path: str, compress: bool = True) -> None:
+    """도형 목록을 파일로 저장"""
+    data = dumps(shapes, compress)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def load_document(path: str) -> List[BaseShape]:
+    """파일에서 도형 목록 불러오기"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+class LazyDocument:
+    """
+    메모리 맵으로 연 문서 (필요한 row만 도형 객체로 만듦)
+
+    압축하지 않은 파일은 mmap 위의 컬럼을 복사 없이 읽는다. 아직 도형으로
+    만들지 않은 row도 bounds/z_order 컬럼으로 영역 검색과 z-order 비교에
+    참여할 수 있다. row 순서가 곧 z-order 순서이다.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # 빈 파일은 매핑할 수 없음
+                raise DocumentFormatError("File is too short to be a document") from e
+        try:
+            self.count, column_count, self._body = _read_header(self._map)
+            self.columns, self.strings = _read_body(self._body, self.count, column_count, lazy=True)
+            self.geometry = ShapeGeometry.from_columns(range(self.count), self.columns,
+                                                       line_type=SHAPE_TYPE_NAMES.index('line'))
+        except Exception:
+            # 예외의 traceback이 본문 뷰를 참조하므로 매핑은 GC에 맡긴다
+            self._map = self._body = None
+            raise
+        self.loaded = bytearray(self.count)  # row별 도형 생성 여부 (0/1)
+        self.groups: Dict[str, ShapeGroup] = {}  # 그룹 경로 -> 지금까지 만든 그룹
+        self.remaining = self.count
+        self._cursor = 0
+
+    def build(self, rows: List[int]) -> List[BaseShape]:
+        """row들을 도형으로 만들고 생성 완료로 표시"""
+        shapes = build_shapes(self.columns, self.strings, rows, self.groups)
+        for row in rows:
+            self.loaded[row] = 1
+        self.remaining -= len(rows)
+        return shapes
+
+    def next_rows(self, limit: int) -> List[int]:
+        """아직 만들지 않은 row를 아래쪽(z-order 낮은 쪽)부터 최대 limit개 반환"""
+        rows = []
+        loaded, cursor = self.loaded, self._cursor
+        while len(rows) < limit:
+            cursor = loaded.find(0, cursor)
+            if cursor < 0:
+                cursor = self.count
+                break
+            rows.append(cursor)
+            cursor += 1
+        self._cursor = cursor
+        return rows
+
+    def grouped_rows(self) -> List[int]:
+        """그룹에 속한 도형의 row 목록"""
+        column = self.columns.get('group')
+        if column is None:
+            return []
+        if np is None:
+            return [row for row, path in enumerate(column) if path]
+        return np.flatnonzero(np.frombuffer(column, dtype=np.uint32)).tolist()
+
+    def rows_at(self, x: float, y: float) -> List[int]:
+        """(x, y)를 포함하는 아직 만들지 않은 row 목록"""
+        return self._pending(self.geometry.point_mask(x, y))
+
+    def rows_in_rect(self, x1: float, y1: float, x2: float, y2: float,
+                     contained: bool = False) -> List[int]:
+        """영역과 겹치는 (contained=True면 완전히 포함되는) 아직 만들지 않은 row 목록"""
+        return self._pending(self.geometry.rect_mask(x1, y1, x2, y2, contained))
+
+    def pending_bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        """아직 만들지 않은 row 전체의 bounding box (없으면 None)"""
+        if not self.remaining:
+            return None
+        if np is None:
+            g, rows = self.geometry, [r for r in range(self.count) if not self.loaded[r]]
+            return (min(g.x1[r] for r in rows), min(g.y1[r] for r in rows),
+                    max(g.x2[r] for r in rows), max(g.y2[r] for r in rows))
+        pending = np.frombuffer(self.loaded, dtype=np.uint8) == 0
+        g = self.geometry
+        return (float(g.x1[pending].min()), float(g.y1[pending].min()),
+                float(g.x2[pending].max()), float(g.y2[pending].max()))
+
+    def first_pending(self, start: int = 0) -> int:
+        """start 이상인 첫 번째 미생성 row (없으면 -1)"""
+        return self.loaded.find(0, start)
+
+    def last_pending(self, end: Optional[int] = None) -> int:
+        """end 미만인 마지막 미생성 row (없으면 -1)"""
+        return self.loaded.rfind(0, 0, self.count if end is None else end)
+
+    def position(self, z_order: int, row: int) -> int:
+        """정렬 키 (z_order, row)가 들어갈 row 위치 (이진 탐색)"""
+        z = self.columns['z_order']
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if (z[mid], mid) < (z_order, row):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def close(self) -> None:
+        """컬럼 뷰를 해제하고 매핑을 닫음 (이미 만든 도형은 그대로 사용 가능)"""
+        for column in getattr(self, 'columns', {}).values():
+            if isinstance(column, memoryview):
+                column.release()
+        self.columns = {}
+        if isinstance(getattr(self, 'strings', None), LazyStrings):
+            self.strings.release()
+        self.geometry = None
+        body = getattr(self, '_body', None)
+        if body is not None:
+            body.release()
+            self._body = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _pending(self, mask) -> List[int]:
+        if np is None:
+            loaded = self.loaded
+            return [row for row, hit in enumerate(mask) if hit and not loaded[row]]
+        mask &= np.frombuffer(self.loaded, dtype=np.uint8) == 0
+        return np.flatnonzero(mask).tolist()
+
+
+def _le_bytes(column: array) -> bytes:
+    if sys.byteorder == 'big' and column.itemsize > 1:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _read_array(typecode: str, raw) -> array:
+    column = array(typecode)
+    column.frombytes(raw)
+    if sys.byteorder == 'big' and column.itemsize > 1:
+        column.byteswap()
+    return column
@@ -0,0 +1,169 @@
+"""
+도형 전체에 대한 일괄 기하 연산
+
+NumPy가 설치되어 있으면 bounds, 점 포함/영역 교차 마스크, z_order 최소/최대를
+벡터 연산으로 한 번에 계산하고, 없으면 같은 결과를 순수 Python으로 계산한다.
+"""
+from typing import List, Optional, Sequence, Tuple
+from .base_shape import BaseShape
+from .shape_store import FLAG_LIVE, TYPE_LINE, ShapeStore
+from .shapes.line import Line
+
+try:
+    import numpy as np
+except ImportError:  # NumPy는 선택 의존성
+    np = None
+
+Bounds = Tuple[float, float, float, float]
+
+
+class ShapeGeometry:
+    """
+    도형 목록의 bounding box (x1, y1, x2, y2)와 z_order 컬럼 묶음
+
+    마스크 연산 결과의 i번째 값은 shapes[i]에 대응한다. 빈 row가 섞인
+    ShapeStore에서 만든 경우 빈 row의 마스크 값은 항상 False이다.
+    """
+
+    def __init__(self, shapes: Sequence[Optional[BaseShape]], x1, y1, x2, y2, z, live=None):
+        self.shapes = shapes
+        self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+        self.z = z
+        self.live = live
+
+    def __len__(self) -> int:
+        return len(self.shapes)
+
+    @classmethod
+    def from_shapes(cls, shapes: Sequence[BaseShape]) -> "ShapeGeometry":
+        """도형 목록에서 컬럼 생성 (선은 두 끝점 기준)"""
+        xs = [s.x for s in shapes]
+        ys = [s.y for s in shapes]
+        x2s = [s.x + (s.x2 if isinstance(s, Line) else s.width) for s in shapes]
+        y2s = [s.y + (s.y2 if isinstance(s, Line) else s.height) for s in shapes]
+        zs = [s.z_order for s in shapes]
+        if np is None:
+            x1 = [min(a, b) for a, b in zip(xs, x2s)]
+            x2 = [max(a, b) for a, b in zip(xs, x2s)]
+            y1 = [min(a, b) for a, b in zip(ys, y2s)]
+            y2 = [max(a, b) for a, b in zip(ys, y2s)]
+            return cls(shapes, x1, y1, x2, y2, zs)
+        xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+        x2s, y2s = np.asarray(x2s, dtype=float), np.asarray(y2s, dtype=float)
+        return cls(shapes, np.minimum(xs, x2s), np.minimum(ys, y2s),
+                   np.maximum(xs, x2s), np.maximum(ys, y2s), np.asarray(zs, dtype=np.int64))
+
+    @classmethod
+    def from_store(cls, store: ShapeStore) -> "ShapeGeometry":
+        """
+        ShapeStore 컬럼에서 생성
+
+        NumPy가 있으면 컬럼 버퍼를 복사 없이 읽어 계산한다. 버퍼를 참조하는
+        배열이 남아 있으면 array 컬럼의 크기를 바꿀 수 없으므로 결과에는
+        새로 계산된 배열만 보관한다.
+        """
+        if np is None:
+            rows = [shape for shape in store.rows if shape is not None]
+            return cls.from_shapes(rows)
+        columns = store.columns
+        live = (np.frombuffer(columns['flags'], dtype=np.uint8) & FLAG_LIVE) != 0
+        return cls.from_columns(store.rows, columns, live, line_type=TYPE_LINE)
+
+    @classmethod
+    def from_columns(cls, shapes: Sequence, columns, live=None,
+                     line_type: Optional[int] = None) -> "ShapeGeometry":
+        """
+        x, y, width, height (double), z_order (int64) 컬럼 버퍼에서 생성
+
+        shapes[i]는 컬럼의 i번째 row에 대응하는 값이다 (도형 객체가 아니어도 된다).
+        line_type을 주면 type (uint8) 컬럼이 그 값인 row는 선으로 보고
+        width/height 대신 x2/y2 (double) 컬럼을 끝점 오프셋으로 사용한다.
+        """
+        lines = line_type is not None
+        if np is None:
+            xs, ys = columns['x'], columns['y']
+            widths, heights = columns['width'], columns['height']
+            if lines:
+                widths = [x2 if t == line_type else w
+                          for t, w, x2 in zip(columns['type'], widths, columns['x2'])]
+                heights = [y2 if t == line_type else h
+                           for t, h, y2 in zip(columns['type'], heights, columns['y2'])]
+            x2s = [a + w for a, w in zip(xs, widths)]
+            y2s = [b + h for b, h in zip(ys, heights)]
+            return cls(shapes,
+                       [min(a, b) for a, b in zip(xs, x2s)], [min(a, b) for a, b in zip(ys, y2s)],
+                       [max(a, b) for a, b in zip(xs, x2s)], [max(a, b) for a, b in zip(ys, y2s)],
+                       list(columns['z_order']), live)
+        x = np.frombuffer(columns['x'], dtype=np.float64)
+        y = np.frombuffer(columns['y'], dtype=np.float64)
+        width = np.frombuffer(columns['width'], dtype=np.float64)
+        height = np.frombuffer(columns['height'], dtype=np.float64)
+        if lines:
+            is_line = np.frombuffer(columns['type'], dtype=np.uint8) == line_type
+            width = np.where(is_line, np.frombuffer(columns['x2'], dtype=np.float64), width)
+            height = np.where(is_line, np.frombuffer(columns['y2'], dtype=np.float64), height)
+        x2 = x + width
+        y2 = y + height
+        z = np.frombuffer(columns['z_order'], dtype=np.int64).copy()
+        return cls(shapes, np.minimum(x, x2), np.minimum(y, y2),
+                   np.maximum(x, x2), np.maximum(y, y2), z, live)
+
+    def _masked(self, mask):
+        if self.live is not None:
+            mask &= self.live
+        return mask
+
+    def bounds(self) -> Bounds:
+        """전체 도형을 감싸는 bounding box (도형이 없으면 (0, 0, 0, 0))"""
+        if np is None:
+            if not self.shapes:
+                return (0, 0, 0, 0)
+            return (min(self.x1), min(self.y1), max(self.x2), max(self.y2))
+        live = self.live
+        if live is None:
+            if len(self.shapes) == 0:
+                return (0, 0, 0, 0)
+            x1, y1, x2, y2 = self.x1, self.y1, self.x2, self.y2
+        else:
+            if not live.any():
+                return (0, 0, 0, 0)
+            x1, y1, x2, y2 = self.x1[live], self.y1[live], self.x2[live], self.y2[live]
+        return (float(x1.min()), float(y1.min()), float(x2.max()), float(y2.max()))
+
+    def point_mask(self, x: float, y: float):
+        """(x, y)를 포함하는 도형 마스크"""
+        if np is None:
+            return [a <= x <= c and b <= y <= d
+                    for a, b, c, d in zip(self.x1, self.y1, self.x2, self.y2)]
+        return self._masked((self.x1 <= x) & (x <= self.x2) & (self.y1 <= y) & (y <= self.y2))
+
+    def rect_mask(self, x1: float, y1: float, x2: float, y2: float, contained: bool = False):
+        """영역과 겹치는 (contained=True면 영역 안에 완전히 들어가는) 도형 마스크"""
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        if np is None:
+            if contained:
+                return [x1 <= a and c <= x2 and y1 <= b and d <= y2
+                        for a, b, c, d in zip(self.x1, self.y1, self.x2, self.y2)]
+            return [a <= x2 and x1 <= c and b <= y2 and y1 <= d
+                    for a, b, c, d in zip(self.x1, self.y1, self.x2, self.y2)]
+        if contained:
+            mask = (x1 <= self.x1) & (self.x2 <= x2) & (y1 <= self.y1) & (self.y2 <= y2)
+        else:
+            mask = (self.x1 <= x2) & (x1 <= self.x2) & (self.y1 <= y2) & (y1 <= self.y2)
+        return self._masked(mask)
+
+    def z_extrema(self) -> Optional[Tuple[int, int]]:
+        """z_order 최소/최대 (도형이 없으면 None)"""
+        if np is None:
+            return (min(self.z), max(self.z)) if self.z else None
+        z = self.z if self.live is None else self.z[self.live]
+        if len(z) == 0:
+            return None
+        return (int(z.min()), int(z.max()))
+
+    def select(self, mask) -> List[BaseShape]:
+        """마스크가 True인 도형 목록"""
+        if np is None:
+            return [shape for shape, hit in zip(self.shapes, mask) if hit]
+        return [self.shapes[i] for i in np.flatnonzero(mask)]
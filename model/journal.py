@@ -0,0 +1,227 @@
+"""
+변경 기록 저널 (추가만 하는 파일)
+
+파일 구조::
+
+    header : magic(4) version(u16)
+    record : payload_len(u32) crc32(u32) payload(JSON, utf-8)  * n
+
+첫 번째 레코드는 항상 ["base", 기준 문서 경로 또는 None] 이며, 이후 레코드는
+기준 문서에 순서대로 적용할 변경이다.
+
+    ["add", 도형 상태]            ["remove", id]        ["clear"]
+    ["set", id, {속성: 값}]       ["z", 연산 이름, [id, ...]]
+    ["place", [[id, z_order, 바로 아래 도형 id 또는 None], ...]]
+    ["group", group id, [자식 도형/그룹 id, ...]]    ["ungroup", group id]
+    ["join", group id, 자식 도형/그룹 id, 위치 또는 None]
+
+비정상 종료로 마지막 레코드가 잘렸거나 손상된 경우 그 앞까지만 유효하다.
+"""
+import json
+import os
+import struct
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .base_shape import BaseShape
+from .document_io import SHAPE_CLASSES, SHAPE_TYPE_NAMES, shape_type_code
+from .shape_composite import ShapeGroup
+
+MAGIC = b'MRDJ'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sH')
+_RECORD = struct.Struct('<II')
+
+# 도형 상태에 포함하지 않는 속성 (문서 내용이 아닌 것)
+_TRANSIENT = {'selected'}
+
+Record = List[Any]
+
+
+def shape_state(shape: BaseShape) -> Dict[str, Any]:
+    """도형의 저장 대상 속성 전체를 dict로 반환"""
+    state = {'type': SHAPE_TYPE_NAMES[shape_type_code(shape)]}
+    for cls in type(shape).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if not name.startswith('_') and name not in _TRANSIENT:
+                state[name] = getattr(shape, name)
+    return state
+
+
+def shape_from_state(state: Dict[str, Any]) -> BaseShape:
+    """shape_state로 만든 dict에서 도형 복원"""
+    cls = SHAPE_CLASSES[SHAPE_TYPE_NAMES.index(state['type'])]
+    shape = cls.__new__(cls)
+    shape._canvas = None
+    shape._store = None
+    shape._row = -1
+    shape._parent = None
+    shape.selected = False
+    for name, value in state.items():
+        if name != 'type':
+            setattr(shape, name, value)
+    return shape
+
+
+class Journal:
+    """
+    저널 파일에 레코드 추가
+
+    append는 메모리에만 쌓고, sync를 호출할 때 한 번에 쓰고 fsync한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._buffer: List[bytes] = []
+        self.size = 0  # 파일에 쓴 바이트 수 (버퍼 제외)
+
+    def reset(self, base: Optional[str]) -> None:
+        """기준 문서만 기록된 새 저널로 교체 (임시 파일에 쓴 뒤 원자적으로 교체)"""
+        self.close()
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION))
+            f.write(_encode(['base', base]))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._open()
+
+    def resume(self, valid_size: int) -> None:
+        """기존 저널에 이어서 기록 (잘린 마지막 레코드는 잘라냄)"""
+        self.close()
+        with open(self.path, 'r+b') as f:
+            f.truncate(valid_size)
+        self._open()
+
+    def append(self, record: Record) -> None:
+        """레코드 추가 (다음 sync 때 파일에 기록)"""
+        self._buffer.append(_encode(record))
+
+    @property
+    def pending(self) -> int:
+        """아직 파일에 쓰지 않은 레코드 수"""
+        return len(self._buffer)
+
+    def sync(self) -> int:
+        """쌓인 레코드를 쓰고 fsync (쓴 바이트 수 반환)"""
+        if not self._buffer or self._file is None:
+            return 0
+        data = b''.join(self._buffer)
+        self._buffer = []
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.size += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> None:
+        self._file = open(self.path, 'ab')
+        self.size = self._file.tell()
+
+
+def read_journal(path: str) -> Tuple[Optional[str], List[Record], int]:
+    """
+    저널 읽기
+
+    (기준 문서 경로, 변경 레코드 목록, 유효한 바이트 수) 반환.
+    파일이 저널이 아니면 ValueError.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < _HEADER.size or _HEADER.unpack_from(data, 0)[0] != MAGIC:
+        raise ValueError(f"Not a journal file: {path}")
+    records = []
+    offset = _HEADER.size
+    for record, end in _iter_records(data, offset):
+        records.append(record)
+        offset = end
+    if not records or records[0][0] != 'base':
+        raise ValueError(f"Journal has no base record: {path}")
+    return records[0][1], records[1:], offset
+
+
+def replay(canvas, records: List[Record]) -> int:
+    """
+    레코드를 Canvas에 순서대로 적용 (적용한 레코드 수 반환)
+
+    이미 없는 도형을 가리키는 레코드는 건너뛴다. 알림은 마지막에 한 번만 보낸다.
+    """
+    with canvas.batch():
+        applied = 0
+        for record in records:
+            op = record[0]
+            if op == 'add':
+                shape = shape_from_state(record[1])
+                if canvas.get_shape(shape.id) is None:
+                    canvas.add_shape(shape)
+                    applied += 1
+            elif op == 'clear':
+                canvas.clear()
+                applied += 1
+            elif op in ('remove', 'set'):
+                shape = canvas.get_shape(record[1])
+                if shape is None:
+                    continue
+                if op == 'remove':
+                    canvas.remove_shape(shape)
+                else:
+                    for name, value in record[2].items():
+                        setattr(shape, name, value)
+                    shape._notify_changed(*record[2])
+                applied += 1
+            elif op == 'z':
+                shapes = [s for s in map(canvas.get_shape, record[2]) if s is not None]
+                getattr(canvas, record[1])(shapes)
+                applied += 1
+            elif op == 'place':
+                placement = [(canvas.get_shape(shape_id), z_order, canvas.get_shape(below_id) if below_id else None)
+                             for shape_id, z_order, below_id in record[1]]
+                canvas.place_shapes([p for p in placement if p[0] is not None])
+                applied += 1
+            elif op == 'group':
+                children = [canvas.groups.get(i) or canvas.get_shape(i) for i in record[2]]
+                children = [c for c in children if c is not None]
+                if children and record[1] not in canvas.groups:
+                    canvas.group_shapes(children, ShapeGroup(group_id=record[1]))
+                    applied += 1
+            elif op == 'join':
+                group = canvas.groups.get(record[1]) or ShapeGroup(group_id=record[1])
+                child = canvas.groups.get(record[2]) or canvas.get_shape(record[2])
+                if child is not None and child._parent is None:
+                    canvas.join_group(child, group, record[3])
+                    applied += 1
+            elif op == 'ungroup':
+                group = canvas.groups.get(record[1])
+                if group is not None:
+                    canvas.ungroup(group)
+                    applied += 1
+    return applied
+
+
+def _encode(record: Record) -> bytes:
+    payload = json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return _RECORD.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _iter_records(data: bytes, offset: int) -> Iterator[Tuple[Record, int]]:
+    """손상되지 않은 레코드와 그 끝 위치를 차례로 반환 (손상된 곳에서 멈춤)"""
+    while offset + _RECORD.size <= len(data):
+        length, crc = _RECORD.unpack_from(data, offset)
+        start = offset + _RECORD.size
+        payload = data[start:start + length]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            return
+        try:
+            record = json.loads(payload)
+        except ValueError:
+            return
+        offset = start + length
+        yield record, offset
@@ -0,0 +1,89 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .base_shape import BaseShape
+
+
+class Selection:
+    """
+    선택된 도형 목록 (선택한 순서 유지)
+
+    도형 id를 키로 하는 dict라서 포함 여부 확인, 추가, 제거가 도형 하나당 O(1)이다.
+    변경 메서드는 도형의 selected 플래그를 함께 맞추고, 실제로 선택/해제된
+    도형만 돌려준다 (이미 선택된 도형을 다시 선택해도 아무 일도 없음).
+    """
+
+    def __init__(self):
+        self._shapes: Dict[str, BaseShape] = {}
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    def __bool__(self) -> bool:
+        return bool(self._shapes)
+
+    def __iter__(self) -> Iterator[BaseShape]:
+        return iter(self._shapes.values())
+
+    def __contains__(self, shape) -> bool:
+        return self._shapes.get(getattr(shape, 'id', None)) is shape
+
+    def __repr__(self) -> str:
+        return f"Selection({list(self._shapes)!r})"
+
+    def get(self, shape_id: str) -> Optional[BaseShape]:
+        """id로 선택된 도형 찾기 (선택되지 않았으면 None)"""
+        return self._shapes.get(shape_id)
+
+    def ids(self):
+        """선택된 도형 id (선택한 순서, set처럼 비교 가능한 view)"""
+        return self._shapes.keys()
+
+    def first(self) -> Optional[BaseShape]:
+        return next(iter(self._shapes.values()), None)
+
+    def to_list(self) -> List[BaseShape]:
+        return list(self._shapes.values())
+
+    def add(self, shapes: Iterable[BaseShape]) -> List[BaseShape]:
+        """선택에 추가하고 새로 선택된 도형 목록 반환"""
+        added = []
+        for shape in shapes:
+            if shape.id not in self._shapes:
+                self._shapes[shape.id] = shape
+                shape.selected = True
+                added.append(shape)
+        return added
+
+    def discard(self, shapes: Iterable[BaseShape]) -> List[BaseShape]:
+        """선택에서 빼고 선택 해제된 도형 목록 반환"""
+        removed = []
+        for shape in shapes:
+            if self._shapes.pop(shape.id, None) is not None:
+                shape.selected = False
+                removed.append(shape)
+        return removed
+
+    def replace(self, shapes: Iterable[BaseShape]) -> Tuple[List[BaseShape], List[BaseShape]]:
+        """
+        선택을 shapes로 교체하고 (새로 선택된 도형, 선택 해제된 도형) 반환
+
+        양쪽에 모두 있는 도형은 건드리지 않는다. 순서는 shapes 순서를 따른다.
+        """
+        new: Dict[str, BaseShape] = {}
+        for shape in shapes:
+            new.setdefault(shape.id, shape)
+        removed = [shape for shape_id, shape in self._shapes.items() if shape_id not in new]
+        added = [shape for shape_id, shape in new.items() if shape_id not in self._shapes]
+        for shape in removed:
+            shape.selected = False
+        for shape in added:
+            shape.selected = True
+        self._shapes = new
+        return added, removed
+
+    def clear(self) -> List[BaseShape]:
+        """선택을 모두 해제하고 해제된 도형 목록 반환"""
+        removed = list(self._shapes.values())
+        for shape in removed:
+            shape.selected = False
+        self._shapes = {}
+        return removed
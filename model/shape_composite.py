@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any
+import uuid
+from .base_shape import BaseShape
+from .geometry import ShapeGeometry
 
 class ShapeComponent(ABC):
     @abstractmethod
@@ -19,15 +22,51 @@ class ShapeComponent(ABC):
         pass
 
 class ShapeGroup(ShapeComponent):
-    def __init__(self):
+    """
+    도형 그룹 (중첩 가능)
+    
+    자식은 도형 또는 다른 ShapeGroup이며, 자식의 _parent가 이 그룹을 가리킨다.
+    bounding box는 캐시해 두고 자식이 이동/크기 변경되면 조상 그룹들의 캐시만
+    무효화한다. 도형 검색은 Canvas의 공간 인덱스가 맡고, 그룹 bounds는
+    Canvas.components_in_rect, overlaps_rect, is_point_inside에서 하위 트리를
+    건너뛰는 데 쓴다.
+    """
+    
+    def __init__(self, shapes: Optional[List[ShapeComponent]] = None, group_id: Optional[str] = None):
+        self.id = group_id or str(uuid.uuid4())
         self.shapes: List[ShapeComponent] = []
         self.selected = False
+        self._parent: Optional["ShapeGroup"] = None  # 이 그룹을 포함하는 그룹
+        self._bounds = None  # 캐시된 bounding box (None이면 다시 계산)
+        for shape in shapes or ():
+            self.add(shape)
     
-    def add(self, shape: ShapeComponent):
-        self.shapes.append(shape)
+    def add(self, shape: ShapeComponent, index: Optional[int] = None):
+        """자식 추가 (index를 주면 그 위치에 끼워 넣음)"""
+        if shape._parent is not None:
+            raise ValueError("Shape already belongs to a group")
+        if index is None:
+            self.shapes.append(shape)
+        else:
+            self.shapes.insert(index, shape)
+        shape._parent = self
+        self.invalidate_bounds()
     
     def remove(self, shape: ShapeComponent):
         self.shapes.remove(shape)
+        shape._parent = None
+        self.invalidate_bounds()
+    
+    def invalidate_bounds(self) -> None:
+        """
+        이 그룹과 조상 그룹의 bounds 캐시 무효화
+        
+        캐시가 이미 없는 그룹에서 멈춘다 (그 조상도 이미 무효화되어 있음).
+        """
+        group = self
+        while group is not None and group._bounds is not None:
+            group._bounds = None
+            group = group._parent
     
     def draw(self) -> Dict[str, Any]:
         # Draw all shapes in the group
@@ -42,18 +81,47 @@ class ShapeGroup(ShapeComponent):
         }
     
     def is_point_inside(self, x: float, y: float) -> bool:
+        x1, y1, x2, y2 = self.get_bounds()
+        if not self.shapes or not (x1 <= x <= x2 and y1 <= y <= y2):
+            return False
         return any(shape.is_point_inside(x, y) for shape in self.shapes)
     
+    def overlaps_rect(self, x1: float, y1: float, x2: float, y2: float) -> bool:
+        """
+        영역 (정규화된 x1 <= x2, y1 <= y2)과 겹치는 도형이 있는지
+        
+        bounds가 영역과 겹치지 않는 그룹은 자식을 보지 않고, 영역 안에 통째로
+        들어가는 그룹은 자식을 하나씩 검사하지 않는다.
+        """
+        bx1, by1, bx2, by2 = self.get_bounds()
+        if not self.shapes or bx2 < x1 or x2 < bx1 or by2 < y1 or y2 < by1:
+            return False
+        if x1 <= bx1 and bx2 <= x2 and y1 <= by1 and by2 <= y2:
+            return True
+        leaves = [shape for shape in self.shapes if isinstance(shape, BaseShape)]
+        if leaves and any(ShapeGeometry.from_shapes(leaves).rect_mask(x1, y1, x2, y2)):
+            return True
+        return any(shape.overlaps_rect(x1, y1, x2, y2)
+                   for shape in self.shapes if isinstance(shape, ShapeGroup))
+    
     def move(self, dx: float, dy: float):
         for shape in self.shapes:
             shape.move(dx, dy)
     
     def get_bounds(self) -> tuple:
+        if self._bounds is None:
+            self._bounds = self._compute_bounds()
+        return self._bounds
+    
+    def _compute_bounds(self) -> tuple:
         if not self.shapes:
             return (0, 0, 0, 0)
         
-        # Get bounds of all shapes
-        bounds = [shape.get_bounds() for shape in self.shapes]
+        # Leaf shapes are reduced in one batch; nested groups contribute their own (cached) bounds
+        leaves = [shape for shape in self.shapes if isinstance(shape, BaseShape)]
+        bounds = [shape.get_bounds() for shape in self.shapes if not isinstance(shape, BaseShape)]
+        if leaves:
+            bounds.append(ShapeGeometry.from_shapes(leaves).bounds())
         min_x = min(b[0] for b in bounds)
         min_y = min(b[1] for b in bounds)
         max_x = max(b[2] for b in bounds)
@@ -61,12 +129,36 @@ class ShapeGroup(ShapeComponent):
         
         return (min_x, min_y, max_x, max_y)
     
+    def leaves(self) -> List[BaseShape]:
+        """하위 그룹을 포함한 모든 도형"""
+        return list(self._iter_leaves())
+    
+    def groups(self) -> Iterator["ShapeGroup"]:
+        """이 그룹과 모든 하위 그룹"""
+        yield self
+        for shape in self.shapes:
+            if isinstance(shape, ShapeGroup):
+                yield from shape.groups()
+    
+    def _iter_leaves(self) -> Iterator[BaseShape]:
+        for shape in self.shapes:
+            if isinstance(shape, ShapeGroup):
+                yield from shape._iter_leaves()
+            else:
+                yield shape
+    
     def select(self):
         self.selected = True
         for shape in self.shapes:
-            shape.selected = True
+            if isinstance(shape, ShapeGroup):
+                shape.select()
+            else:
+                shape.selected = True
     
     def deselect(self):
         self.selected = False
         for shape in self.shapes:
-            shape.selected = False 
\ No newline at end of file
+            if isinstance(shape, ShapeGroup):
+                shape.deselect()
+            else:
+                shape.selected = False
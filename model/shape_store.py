@@ -0,0 +1,215 @@
+from array import array
+from typing import Dict, List, Optional, Type
+from .base_shape import BaseShape
+from .shapes.line import Line
+
+FLAG_FRAME = 1
+FLAG_SHADOW = 2
+FLAG_SELECTED = 4
+FLAG_LIVE = 8  # 사용 중인 row 표시 (빈 row는 0)
+
+FLAG_FIELDS = {'has_frame': FLAG_FRAME, 'has_shadow': FLAG_SHADOW, 'selected': FLAG_SELECTED}
+FLOAT_FIELDS = ('x', 'y', 'width', 'height')
+STYLE_FIELDS = ('fill', 'outline')
+STORED_FIELDS = FLOAT_FIELDS + ('z_order',) + tuple(FLAG_FIELDS) + STYLE_FIELDS
+LINE_FIELDS = ('x2', 'y2')  # 선의 끝점 오프셋 (선의 width/height는 선 굵기)
+
+TYPE_SHAPE = 0
+TYPE_LINE = 1  # type 컬럼 값: 이 row의 bounds는 width/height 대신 x2/y2로 계산
+
+
+class StringTable:
+    """문자열 intern 테이블 (문자열 <-> 인덱스)"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def intern(self, value: str) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+class _FloatColumn:
+    """float 컬럼에 저장되는 좌표/크기 속성 (정수 값은 int로 돌려줌)"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, shape, owner=None):
+        if shape is None:
+            return self
+        value = shape._store.columns[self.name][shape._row]
+        return int(value) if value.is_integer() else value
+
+    def __set__(self, shape, value):
+        shape._store.columns[self.name][shape._row] = value
+
+
+class _IntColumn:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, shape, owner=None):
+        if shape is None:
+            return self
+        return shape._store.columns[self.name][shape._row]
+
+    def __set__(self, shape, value):
+        shape._store.columns[self.name][shape._row] = int(value)
+
+
+class _FlagColumn:
+    """flags 컬럼의 비트 하나로 저장되는 bool 속성"""
+
+    def __init__(self, bit: int):
+        self.bit = bit
+
+    def __get__(self, shape, owner=None):
+        if shape is None:
+            return self
+        return bool(shape._store.columns['flags'][shape._row] & self.bit)
+
+    def __set__(self, shape, value):
+        flags = shape._store.columns['flags']
+        if value:
+            flags[shape._row] |= self.bit
+        else:
+            flags[shape._row] &= ~self.bit
+
+
+class _StyleColumn:
+    """StringTable 인덱스로 저장되는 색상 속성"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, shape, owner=None):
+        if shape is None:
+            return self
+        store = shape._store
+        return store.strings.strings[store.columns[self.name][shape._row]]
+
+    def __set__(self, shape, value):
+        store = shape._store
+        store.columns[self.name][shape._row] = store.strings.intern(value)
+
+
+class ShapeStore:
+    """
+    struct-of-arrays 도형 저장소
+
+    좌표, 크기, z_order, 플래그, 스타일을 도형 객체 대신 타입이 지정된
+    array 컬럼에 보관한다. attach된 도형은 같은 클래스의 "stored" 변형으로
+    바뀌어 속성 접근이 컬럼을 읽고 쓰므로, 기존 도형 클래스와
+    컨트롤러는 그대로 동작한다.
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, array] = {name: array('d') for name in FLOAT_FIELDS + LINE_FIELDS}
+        self.columns['z_order'] = array('q')
+        self.columns['flags'] = array('B')
+        self.columns['type'] = array('B')
+        for name in STYLE_FIELDS:
+            self.columns[name] = array('I')
+        self.strings = StringTable()
+        self.rows: List[Optional[BaseShape]] = []  # row -> 도형 (빈 row는 None)
+        self._free_rows: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.rows) - len(self._free_rows)
+
+    def attach(self, shape: BaseShape) -> None:
+        """도형의 속성 값을 컬럼으로 옮기고 stored 클래스로 전환"""
+        if shape._store is not None:
+            raise ValueError("Shape is already attached to a ShapeStore")
+        fields = stored_fields(type(shape))
+        values = {name: getattr(shape, name) for name in fields}
+        for name in fields:
+            delattr(shape, name)
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self.rows[row] = shape
+        else:
+            row = len(self.rows)
+            self.rows.append(shape)
+            for column in self.columns.values():
+                column.append(0)
+
+        shape._store = self
+        shape._row = row
+        self.columns['flags'][row] = FLAG_LIVE
+        self.columns['type'][row] = TYPE_LINE if isinstance(shape, Line) else TYPE_SHAPE
+        for name in LINE_FIELDS:
+            self.columns[name][row] = 0
+        shape.__class__ = stored_class(type(shape))
+        for name, value in values.items():
+            setattr(shape, name, value)
+
+    def detach(self, shape: BaseShape) -> None:
+        """컬럼 값을 도형 객체로 되돌리고 원래 클래스로 전환"""
+        if shape._store is not self:
+            return
+        values = {name: getattr(shape, name) for name in stored_fields(type(shape))}
+        row = shape._row
+        shape.__class__ = type(shape).__bases__[1]
+        shape._store = None
+        shape._row = -1
+        for name, value in values.items():
+            setattr(shape, name, value)
+        self.columns['flags'][row] = 0
+        self.rows[row] = None
+        self._free_rows.append(row)
+
+    def clear(self) -> None:
+        for shape in self.rows:
+            if shape is not None:
+                self.detach(shape)
+        for column in self.columns.values():
+            del column[:]
+        self.rows = []
+        self._free_rows = []
+
+    def live_rows(self) -> List[int]:
+        """사용 중인 row 번호 목록"""
+        return [row for row, shape in enumerate(self.rows) if shape is not None]
+
+
+class StoredShape:
+    """ShapeStore 컬럼을 속성으로 노출하는 mixin"""
+    __slots__ = ()
+
+
+for _name in FLOAT_FIELDS:
+    setattr(StoredShape, _name, _FloatColumn(_name))
+StoredShape.z_order = _IntColumn('z_order')
+for _name, _bit in FLAG_FIELDS.items():
+    setattr(StoredShape, _name, _FlagColumn(_bit))
+for _name in STYLE_FIELDS:
+    setattr(StoredShape, _name, _StyleColumn(_name))
+
+_stored_classes: Dict[type, type] = {}
+
+
+def stored_fields(shape_class: type) -> tuple:
+    """shape_class 도형에서 컬럼으로 옮기는 속성 이름"""
+    return STORED_FIELDS + LINE_FIELDS if issubclass(shape_class, Line) else STORED_FIELDS
+
+
+def stored_class(shape_class: Type[BaseShape]) -> type:
+    """도형 클래스의 stored 변형 반환 (클래스당 한 번 생성)"""
+    cls = _stored_classes.get(shape_class)
+    if cls is None:
+        namespace = {'__slots__': (), '__module__': __name__}
+        if issubclass(shape_class, Line):
+            namespace.update((name, _FloatColumn(name)) for name in LINE_FIELDS)
+        cls = type(shape_class.__name__, (StoredShape, shape_class), namespace)
+        _stored_classes[shape_class] = cls
+    return cls
@@ -4,6 +4,8 @@ from ..base_shape import BaseShape
 class Ellipse(BaseShape):
     """타원 생성"""
     
+    __slots__ = ('shape_type',)
+    
     def __init__(self):
         super().__init__()
         self.shape_type = "ellipse"
@@ -4,6 +4,8 @@ from ..base_shape import BaseShape
 class Image(BaseShape):
     """이미지 생성"""
     
+    __slots__ = ('image_path',)
+    
     def __init__(self, x: int, y: int, image_path: str, width: int = 200, height: int = 200):
         super().__init__()
         self.x = x
@@ -40,4 +42,7 @@ class Image(BaseShape):
         elif property_name in ['x', 'y', 'width', 'height', 'z_order']:
             setattr(self, property_name, int(value))
         elif property_name == 'selected':
-            self.selected = value 
\ No newline at end of file
+            self.selected = value
+        else:
+            return
+        self._notify_changed(property_name) 
\ No newline at end of file
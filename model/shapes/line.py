@@ -1,9 +1,11 @@
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from ..base_shape import BaseShape
 
 class Line(BaseShape):
     """선 생성"""
     
+    __slots__ = ('shape_type', 'x2', 'y2')
+    
     def __init__(self):
         super().__init__()
         self.shape_type = "line"
@@ -25,9 +27,19 @@ class Line(BaseShape):
             'outline': self.outline
         }
     
+    def get_bounds(self) -> Tuple[float, float, float, float]:
+        """
+        두 끝점 (x, y), (x + x2, y + y2)를 감싸는 bounding box 반환
+        (width는 선 두께이므로 사용하지 않음)
+        """
+        x1, x2 = sorted((self.x, self.x + self.x2))
+        y1, y2 = sorted((self.y, self.y + self.y2))
+        return (x1, y1, x2, y2)
+    
     def resize(self, dw: int, dh: int) -> None:
         """
         기본 resize 함수를 override하여 선의 끝점을 조정
         """
         self.x2 += dw
-        self.y2 += dh 
\ No newline at end of file
+        self.y2 += dh
+        self._notify_changed('x2', 'y2') 
\ No newline at end of file
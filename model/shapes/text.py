@@ -4,6 +4,8 @@ from ..base_shape import BaseShape
 class Text(BaseShape):
     """텍스트 생성"""
     
+    __slots__ = ('font', 'font_size', 'text_color')
+    
     def __init__(self, x: int, y: int, text: str, width: int = 100, height: int = 30):
         super().__init__()
         self.x = x
@@ -45,4 +47,7 @@ class Text(BaseShape):
         elif property_name in ['x', 'y', 'width', 'height', 'z_order']:
             setattr(self, property_name, int(value))
         elif property_name == 'selected':
-            self.selected = value 
\ No newline at end of file
+            self.selected = value
+        else:
+            return
+        self._notify_changed(property_name) 
\ No newline at end of file
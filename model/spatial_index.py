@@ -0,0 +1,102 @@
+from typing import Dict, List, Tuple
+from .base_shape import BaseShape
+
+Bounds = Tuple[float, float, float, float]
+
+
+class SpatialIndex:
+    """
+    균일 격자(uniform grid) 기반 공간 인덱스
+
+    도형은 bounding box가 걸치는 모든 셀에 등록되며, 점/영역 질의는
+    해당 셀의 후보만 검사한다. 셀을 너무 많이 차지하는 큰 도형은
+    별도 목록에 두어 삽입/이동 비용이 도형 크기에 비례하지 않게 한다.
+    """
+
+    def __init__(self, cell_size: int = 128, max_cells: int = 64):
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+        self._cells: Dict[Tuple[int, int], Dict[str, BaseShape]] = {}
+        self._oversized: Dict[str, BaseShape] = {}
+        self._entries: Dict[str, Tuple[int, int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _cell_range(self, bounds: Bounds) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (int(bounds[0] // size), int(bounds[1] // size),
+                int(bounds[2] // size), int(bounds[3] // size))
+
+    def insert(self, shape: BaseShape) -> None:
+        """도형 등록"""
+        cx1, cy1, cx2, cy2 = cell_range = self._cell_range(shape.get_bounds())
+        self._entries[shape.id] = cell_range
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > self.max_cells:
+            self._oversized[shape.id] = shape
+            return
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                self._cells.setdefault((cx, cy), {})[shape.id] = shape
+
+    def remove(self, shape: BaseShape) -> None:
+        """도형 등록 해제"""
+        cell_range = self._entries.pop(shape.id, None)
+        if cell_range is None:
+            return
+        if self._oversized.pop(shape.id, None) is not None:
+            return
+        cx1, cy1, cx2, cy2 = cell_range
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell is not None:
+                    cell.pop(shape.id, None)
+                    if not cell:
+                        del self._cells[(cx, cy)]
+
+    def update(self, shape: BaseShape) -> None:
+        """이동/크기 변경된 도형 재등록 (셀이 바뀐 경우에만)"""
+        if self._entries.get(shape.id) == self._cell_range(shape.get_bounds()):
+            return
+        self.remove(shape)
+        self.insert(shape)
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._oversized.clear()
+        self._entries.clear()
+
+    def query_point(self, x: float, y: float) -> List[BaseShape]:
+        """(x, y)를 포함하는 도형 목록 반환 (순서 없음)"""
+        size = self.cell_size
+        candidates = list(self._cells.get((int(x // size), int(y // size)), {}).values())
+        candidates.extend(self._oversized.values())
+        result = []
+        for shape in candidates:
+            x1, y1, x2, y2 = shape.get_bounds()
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                result.append(shape)
+        return result
+
+    def query_rect(self, x1: float, y1: float, x2: float, y2: float) -> List[BaseShape]:
+        """영역 (x1, y1, x2, y2)와 겹치는 도형 목록 반환 (순서 없음)"""
+        x1, x2 = sorted((x1, x2))
+        y1, y2 = sorted((y1, y2))
+        cx1, cy1, cx2, cy2 = self._cell_range((x1, y1, x2, y2))
+        found: Dict[str, BaseShape] = dict(self._oversized)
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self._cells):
+            for cell in self._cells.values():
+                found.update(cell)
+        else:
+            for cx in range(cx1, cx2 + 1):
+                for cy in range(cy1, cy2 + 1):
+                    cell = self._cells.get((cx, cy))
+                    if cell:
+                        found.update(cell)
+        result = []
+        for shape in found.values():
+            sx1, sy1, sx2, sy2 = shape.get_bounds()
+            if sx1 <= x2 and x1 <= sx2 and sy1 <= y2 and y1 <= sy2:
+                result.append(shape)
+        return result
@@ -0,0 +1,222 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .base_shape import BaseShape
+
+ZKey = Tuple[int, float]
+
+# 이 개수보다 많은 도형을 한 번에 옮길 때는 개별 삭제 대신 목록을 재구성
+BULK_THRESHOLD = 32
+
+
+class ZOrderList:
+    """
+    z-order 순으로 항상 정렬된 상태를 유지하는 도형 목록
+
+    정렬 키는 (z_order, seq) 이며 seq는 같은 z_order 안에서 추가된 순서를
+    나타낸다. id -> 키 맵으로 도형의 위치를 O(log n)에 찾는다.
+    """
+
+    def __init__(self):
+        self._keys: List[ZKey] = []
+        self._shapes: List[BaseShape] = []
+        self._key_of: Dict[str, ZKey] = {}
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    def __iter__(self) -> Iterator[BaseShape]:
+        return iter(self._shapes)
+
+    def __contains__(self, shape: BaseShape) -> bool:
+        return shape.id in self._key_of
+
+    def __getitem__(self, index: int) -> BaseShape:
+        return self._shapes[index]
+
+    def key(self, shape: BaseShape) -> ZKey:
+        """도형의 정렬 키 반환"""
+        return self._key_of[shape.id]
+
+    def index(self, shape: BaseShape) -> int:
+        """도형의 z-order 상 위치 반환 (O(log n))"""
+        return bisect_left(self._keys, self._key_of[shape.id])
+
+    def get(self, shape_id: str) -> Optional[BaseShape]:
+        key = self._key_of.get(shape_id)
+        if key is None:
+            return None
+        return self._shapes[bisect_left(self._keys, key)]
+
+    def add(self, shape: BaseShape) -> None:
+        """도형 추가 (같은 z_order 안에서는 맨 위)"""
+        self._insert(shape, (shape.z_order, self._new_seq()))
+
+    def remove(self, shape: BaseShape) -> None:
+        """도형 제거"""
+        index = self.index(shape)
+        del self._keys[index]
+        del self._shapes[index]
+        del self._key_of[shape.id]
+
+    def remove_many(self, shapes: Iterable[BaseShape]) -> None:
+        """도형 여러 개 제거 (개수가 많으면 목록을 한 번만 훑음)"""
+        self._detach(shapes)
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._shapes.clear()
+        self._key_of.clear()
+
+    def reset(self, shapes: Iterable[BaseShape]) -> None:
+        """목록 전체 교체 (z_order 기준 안정 정렬, 같은 z_order는 주어진 순서)"""
+        self._shapes = sorted(shapes, key=lambda s: s.z_order)
+        self._keys = []
+        self._key_of = {}
+        for shape in self._shapes:
+            key = (shape.z_order, self._new_seq())
+            self._keys.append(key)
+            self._key_of[shape.id] = key
+
+    def reserve(self, count: int) -> int:
+        """
+        seq 번호 count개를 예약하고 첫 번호를 반환
+
+        나중에 add_many로 추가할 도형들의 순서를 미리 정해 둘 때 사용한다.
+        """
+        first = self._next_seq + 1
+        self._next_seq += count
+        return first
+
+    def add_many(self, shapes: List[BaseShape], seqs: List[int]) -> None:
+        """
+        예약해 둔 seq로 도형들을 한 번에 추가
+
+        새 키들이 걸치는 구간만 다시 정렬하므로, 키가 몰려 있으면 목록
+        크기와 관계없이 추가되는 개수에 비례하는 비용으로 끝난다.
+        """
+        if not shapes:
+            return
+        items = sorted(((shape.z_order, seq), shape) for shape, seq in zip(shapes, seqs))
+        lo = bisect_left(self._keys, items[0][0])
+        hi = bisect_left(self._keys, items[-1][0])
+        merged = sorted(items + list(zip(self._keys[lo:hi], self._shapes[lo:hi])),
+                        key=lambda item: item[0])
+        self._keys[lo:hi] = [key for key, _ in merged]
+        self._shapes[lo:hi] = [shape for _, shape in merged]
+        for key, shape in items:
+            self._key_of[shape.id] = key
+
+    def reposition(self, shape: BaseShape) -> None:
+        """
+        z_order 속성이 바뀐 도형을 올바른 위치로 재배치
+
+        새 z_order 안에서는 맨 위에 놓는다. 이전 seq를 유지하면 결과가 저장된
+        문서에 남지 않는 추가 순서에 따라 달라지므로, 순서만으로 결정되게 한다.
+        """
+        key = self._key_of[shape.id]
+        if key[0] == shape.z_order:
+            return
+        self.remove(shape)
+        self._insert(shape, (shape.z_order, self._new_seq()))
+
+    def place(self, shape: BaseShape, z_order: int, below: Optional[BaseShape]) -> None:
+        """
+        도형을 z_order로 바꾸고 below 바로 위 (None이면 맨 아래)에 배치
+
+        실행 취소처럼 이전 배치를 되돌릴 때 사용한다. 같은 z_order의 두 도형
+        사이에 들어가야 하면 두 seq의 중간값을 쓴다. 요청한 배치가 z_order
+        정렬과 맞지 않으면 해당 z_order의 맨 위에 놓는다.
+        """
+        if shape in self:
+            self.remove(shape)
+        index = self.index(below) + 1 if below is not None else 0
+        lower = self._keys[index - 1] if index > 0 else None
+        upper = self._keys[index] if index < len(self._keys) else None
+        if (lower is not None and lower[0] > z_order) or (upper is not None and upper[0] < z_order):
+            seq = self._new_seq()
+        elif upper is not None and upper[0] == z_order:
+            if lower is not None and lower[0] == z_order:
+                seq = (lower[1] + upper[1]) / 2
+            else:
+                seq = upper[1] - 1
+        else:
+            seq = self._new_seq()
+        shape.z_order = z_order
+        self._insert(shape, (z_order, seq))
+
+    def restore(self, positions: List[Tuple[BaseShape, ZKey]]) -> None:
+        """
+        도형들을 기록해 둔 정렬 키로 되돌림 (실행 취소용)
+
+        모두 뺀 뒤 다시 넣으므로 함께 되돌리는 도형끼리의 위치에 의존하지 않는다.
+        seq는 재사용되지 않으므로 기록한 키가 다른 도형의 키와 겹치지 않는다.
+        """
+        self._detach(shape for shape, _ in positions)
+        for shape, key in positions:
+            shape.z_order = key[0]
+            self._insert(shape, key)
+
+    def swap(self, a: BaseShape, b: BaseShape) -> None:
+        """두 도형의 z-order 위치 교환 (z_order 값과 seq를 함께 교환)"""
+        index_a, index_b = self.index(a), self.index(b)
+        key_a, key_b = self._keys[index_a], self._keys[index_b]
+        a.z_order, b.z_order = key_b[0], key_a[0]
+        self._key_of[a.id], self._key_of[b.id] = key_b, key_a
+        self._shapes[index_a], self._shapes[index_b] = b, a
+
+    def move_to_front(self, shapes: List[BaseShape]) -> None:
+        """도형들을 주어진 순서대로 맨 위로 이동"""
+        if not shapes:
+            return
+        top = self._keys[-1][0]
+        self._detach(shapes)
+        for i, shape in enumerate(shapes):
+            shape.z_order = top + 1 + i
+            self._append(shape, (shape.z_order, self._new_seq()))
+
+    def move_to_back(self, shapes: List[BaseShape]) -> None:
+        """도형들을 맨 아래로 이동 (첫 번째 도형이 바로 아래에 위치)"""
+        if not shapes:
+            return
+        bottom = self._keys[0][0]
+        self._detach(shapes)
+        keys, moved = [], []
+        for i, shape in enumerate(shapes):
+            shape.z_order = bottom - 1 - i
+            key = (shape.z_order, self._new_seq())
+            self._key_of[shape.id] = key
+            keys.append(key)
+            moved.append(shape)
+        keys.reverse()
+        moved.reverse()
+        self._keys[:0] = keys
+        self._shapes[:0] = moved
+
+    def _new_seq(self) -> int:
+        self._next_seq += 1
+        return self._next_seq
+
+    def _insert(self, shape: BaseShape, key: ZKey) -> None:
+        index = bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self._shapes.insert(index, shape)
+        self._key_of[shape.id] = key
+
+    def _append(self, shape: BaseShape, key: ZKey) -> None:
+        self._keys.append(key)
+        self._shapes.append(shape)
+        self._key_of[shape.id] = key
+
+    def _detach(self, shapes: Iterable[BaseShape]) -> None:
+        shapes = list(shapes)
+        if len(shapes) <= BULK_THRESHOLD:
+            for shape in shapes:
+                self.remove(shape)
+            return
+        ids = {shape.id for shape in shapes}
+        kept = [(k, s) for k, s in zip(self._keys, self._shapes) if s.id not in ids]
+        self._keys = [k for k, _ in kept]
+        self._shapes = [s for _, s in kept]
+        for shape_id in ids:
+            del self._key_of[shape_id]
@@ -0,0 +1,26 @@
+import pytest
+
+from model.canvas import Canvas
+
+
+@pytest.fixture
+def canvas():
+    """싱글톤을 비운 새 Canvas"""
+    Canvas._instance = None
+    yield Canvas()
+    Canvas._instance = None
+
+
+@pytest.fixture
+def view():
+    """화면 없이 동작하는 CanvasView"""
+    from tests.helpers import HeadlessCanvasView
+    return HeadlessCanvasView()
+
+
+@pytest.fixture
+def controller(canvas, view):
+    """headless 뷰/속성 패널에 연결된 컨트롤러"""
+    from controller.canvas_controller import CanvasController
+    from tests.helpers import FakePropertyPanel
+    return CanvasController(view, FakePropertyPanel())
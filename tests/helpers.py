@@ -0,0 +1,304 @@
+"""
+테스트 공용 도우미
+
+화면 없이 실제 CanvasView 코드를 돌릴 수 있도록 tk.Canvas 대신 아이템과
+태그, 쌓임 순서를 메모리에 보관하는 HeadlessCanvas를 제공한다.
+"""
+import tkinter as tk
+from collections import Counter
+
+from model.shape_factory import ShapeFactory
+from view.canvas_view import CanvasView
+
+
+def make_shapes(count, kind='rectangle', rng=None, z_orders=1):
+    """x, y가 흩어진 도형 count개 (rng가 없으면 대각선으로 배치)"""
+    shapes = []
+    for i in range(count):
+        shape = ShapeFactory.create_shape(kind if isinstance(kind, str) else rng.choice(kind))
+        if rng is None:
+            shape.x, shape.y = i * 30, i * 30
+        else:
+            shape.x, shape.y = rng.randrange(2000), rng.randrange(2000)
+            shape.z_order = rng.randrange(z_orders)
+        shapes.append(shape)
+    return shapes
+
+
+class FakeWidget:
+    """after/after_idle 콜백을 모아 두었다가 run_pending으로 실행"""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.idle_calls = 0  # after_idle 호출 수
+        self._next_id = 0
+
+    def after(self, delay, callback, *args):
+        self._next_id += 1
+        self.callbacks[self._next_id] = (callback, args)
+        return self._next_id
+
+    def after_idle(self, callback, *args):
+        self.idle_calls += 1
+        return self.after(0, callback, *args)
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, {}
+        for callback, args in callbacks.values():
+            callback(*args)
+
+
+class Recorder:
+    """Canvas 옵저버: 받은 ChangeSet을 모아 둠"""
+
+    def __init__(self, canvas):
+        self.changes = []
+        canvas.add_observer(self)
+
+    def update(self, changes):
+        self.changes.append(changes)
+
+    def diffs(self):
+        diffs = [changes.selection_diff() for changes in self.changes]
+        self.changes = []
+        return diffs
+
+
+class HeadlessCanvas(FakeWidget, tk.Canvas):
+    """
+    그리지 않는 tk.Canvas 대용 (Tk 호출 수는 calls에 셈)
+
+    CanvasView와 tk.Canvas 사이에 끼도록 tk.Canvas를 상속하지만 tk.Canvas의
+    메서드는 부르지 않는다. 쌓임 순서는 stack (아래부터) 에 보관한다.
+    """
+
+    def __init__(self, master=None, width=800, height=600, **options):
+        FakeWidget.__init__(self)
+        self.calls = Counter()
+        self.items = {}  # item id -> {'kind', 'coords', 'options', 'tags'}
+        self.stack = []
+        self.options = {}
+        self._size = (width, height)
+        self._origin = [0.0, 0.0]  # 왼쪽 위 모서리의 canvas 좌표
+        self._last_item = 0
+
+    # 아이템
+    def create_rectangle(self, *coords, **options):
+        return self._create('rectangle', coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self._create('oval', coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._create('line', coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create('text', coords, options)
+
+    def create_image(self, *coords, **options):
+        return self._create('image', coords, options)
+
+    def coords(self, tag, *coords):
+        self.calls['coords'] += 1
+        items = self._find(tag)
+        if coords and items:
+            self.items[items[0]]['coords'] = tuple(coords)
+        return list(self.items[items[0]]['coords']) if items else []
+
+    def itemconfigure(self, tag, **options):
+        self.calls['itemconfigure'] += 1
+        for item in self._find(tag):
+            self.items[item]['options'].update(options)
+
+    itemconfig = itemconfigure
+
+    def itemcget(self, tag, name):
+        items = self._find(tag)
+        return self.items[items[0]]['options'].get(name, '') if items else ''
+
+    def delete(self, *tags):
+        self.calls['delete'] += 1
+        for tag in tags:
+            for item in self._find(tag):
+                del self.items[item]
+                self.stack.remove(item)
+
+    def move(self, tag, dx, dy):
+        self.calls['move'] += 1
+        for item in self._find(tag):
+            coords = self.items[item]['coords']
+            self.items[item]['coords'] = tuple(c + (dx if i % 2 == 0 else dy) for i, c in enumerate(coords))
+
+    def tag_raise(self, tag, above=None):
+        self.calls['tag_raise'] += 1
+        items = self._find(tag)
+        if not items:
+            return
+        for item in items:
+            self.stack.remove(item)
+        anchors = self._find(above) if above is not None else ()
+        index = self.stack.index(anchors[-1]) + 1 if anchors else len(self.stack)
+        self.stack[index:index] = items
+
+    def tag_lower(self, tag, below=None):
+        self.calls['tag_lower'] += 1
+        items = self._find(tag)
+        if not items:
+            return
+        for item in items:
+            self.stack.remove(item)
+        anchors = self._find(below) if below is not None else ()
+        index = self.stack.index(anchors[0]) if anchors else 0
+        self.stack[index:index] = items
+
+    def addtag_withtag(self, new_tag, tag):
+        for item in self._find(tag):
+            if new_tag not in self.items[item]['tags']:
+                self.items[item]['tags'].append(new_tag)
+
+    def dtag(self, tag, remove=None):
+        remove = tag if remove is None else remove
+        for item in self._find(tag):
+            if remove in self.items[item]['tags']:
+                self.items[item]['tags'].remove(remove)
+
+    def gettags(self, tag):
+        items = self._find(tag)
+        return tuple(self.items[items[0]]['tags']) if items else ()
+
+    def find_withtag(self, tag):
+        return tuple(self._find(tag))
+
+    def find_all(self):
+        return tuple(self.stack)
+
+    # 위젯
+    def bind(self, sequence=None, func=None, add=None):
+        pass
+
+    def configure(self, cnf=None, **options):
+        self.options.update(cnf or {}, **options)
+
+    config = configure
+
+    def cget(self, key):
+        return {'width': self._size[0], 'height': self._size[1]}.get(key, self.options.get(key, ''))
+
+    def winfo_width(self):
+        return self._size[0]
+
+    def winfo_height(self):
+        return self._size[1]
+
+    def canvasx(self, x, gridspacing=None):
+        return x + self._origin[0]
+
+    def canvasy(self, y, gridspacing=None):
+        return y + self._origin[1]
+
+    def xview(self, *args):
+        if args and args[0] == 'moveto':
+            self.xview_moveto(float(args[1]))
+
+    def yview(self, *args):
+        if args and args[0] == 'moveto':
+            self.yview_moveto(float(args[1]))
+
+    def xview_moveto(self, fraction):
+        x1, _, x2, _ = self.options.get('scrollregion', (0, 0, 0, 0))
+        self._origin[0] = x1 + fraction * (x2 - x1)
+
+    def yview_moveto(self, fraction):
+        _, y1, _, y2 = self.options.get('scrollregion', (0, 0, 0, 0))
+        self._origin[1] = y1 + fraction * (y2 - y1)
+
+    def xview_scroll(self, number, what):
+        self._origin[0] += number * self.options.get('xscrollincrement', 1)
+
+    def yview_scroll(self, number, what):
+        self._origin[1] += number * self.options.get('yscrollincrement', 1)
+
+    def scan_mark(self, x, y):
+        pass
+
+    def scan_dragto(self, x, y, gain=10):
+        pass
+
+    def _create(self, kind, coords, options):
+        self.calls['create_' + kind] += 1
+        self._last_item += 1
+        options = dict(options)
+        tags = options.pop('tags', ())
+        tags = [tags] if isinstance(tags, str) else list(tags)
+        self.items[self._last_item] = {'kind': kind, 'coords': tuple(coords),
+                                       'options': options, 'tags': tags}
+        self.stack.append(self._last_item)
+        return self._last_item
+
+    def _find(self, tag):
+        if isinstance(tag, int):
+            return [tag] if tag in self.items else []
+        if tag == 'all':
+            return list(self.stack)
+        return [item for item in self.stack if tag in self.items[item]['tags']]
+
+
+class HeadlessCanvasView(CanvasView, HeadlessCanvas):
+    """HeadlessCanvas 위에서 도는 실제 CanvasView"""
+
+    def __init__(self, width=800, height=600):
+        # CanvasView.__init__의 super().__init__()은 HeadlessCanvas로 간다
+        CanvasView.__init__(self, None)
+        self._size = (width, height)
+
+    def stacking(self):
+        """화면에 쌓인 순서대로의 도형 id (아래부터)"""
+        order = []
+        for item in self.stack:
+            for tag in self.items[item]['tags']:
+                if tag.startswith('shape-'):
+                    shape_id = tag[len('shape-'):]
+                    if not order or order[-1] != shape_id:
+                        order.append(shape_id)
+                    break
+        return order
+
+
+class Var:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class FakePropertyPanel:
+    """속성 패널 대용 (갱신 호출 수를 셈)"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.properties = None
+        self.font_var = Var("Arial")
+        self.font_size_var = Var("12")
+        self.color_var = Var("black")
+        self.property_changed_callback = None
+
+    def update_properties(self, properties):
+        self.calls['update_properties'] += 1
+        self.properties = properties
+
+    def show_multi_select_properties(self):
+        self.calls['show_multi_select_properties'] += 1
+
+    def clear_properties(self):
+        self.calls['clear_properties'] += 1
+        self.properties = None
+
+    def set_property_changed_callback(self, callback):
+        self.property_changed_callback = callback
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from controller import autosave
+from controller.autosave import Autosave
+from model.canvas import Canvas
+from tests.helpers import FakeWidget, make_shapes
+
+
+def new_canvas():
+    Canvas._instance = None
+    return Canvas()
+
+
+def test_instances_use_separate_journals(canvas, tmp_path):
+    first = Autosave(FakeWidget(), canvas, str(tmp_path))
+    second = Autosave(FakeWidget(), new_canvas(), str(tmp_path))
+    assert first.start() is False
+    assert second.start() is False
+    assert first.slot != second.slot
+    assert first.journal.path != second.journal.path
+    first.stop()
+    second.stop()
+    # 저널과 함께 잠금 파일도 지움
+    assert os.listdir(tmp_path) == []
+
+
+def test_crashed_session_is_recovered_by_next_instance(canvas, tmp_path):
+    crashed = Autosave(FakeWidget(), canvas, str(tmp_path))
+    crashed.start()
+    running = Autosave(FakeWidget(), new_canvas(), str(tmp_path))
+    running.start()
+    shapes = make_shapes(4)
+    canvas.add_shapes(shapes)
+    crashed.journal.sync()
+    # 프로세스가 죽은 것처럼 잠금만 풀린다 (저널은 남아 있음)
+    crashed.journal.close()
+    crashed._lock.close()
+
+    restored = new_canvas()
+    recovering = Autosave(FakeWidget(), restored, str(tmp_path))
+    assert recovering.start() is True
+    assert recovering.slot == crashed.slot
+    assert [s.id for s in restored.get_shapes()] == [s.id for s in shapes]
+    # 실행 중인 인스턴스의 저널은 건드리지 않는다
+    assert os.path.exists(running.journal.path)
+    recovering.stop()
+    running.stop()
+
+
+def test_orphaned_slot_is_preferred_over_free_slot(canvas, tmp_path):
+    first = Autosave(FakeWidget(), canvas, str(tmp_path))
+    first.start()
+    crashed_canvas = new_canvas()
+    crashed = Autosave(FakeWidget(), crashed_canvas, str(tmp_path))
+    crashed.start()
+    crashed_canvas.add_shapes(make_shapes(2))
+    crashed.journal.sync()
+    crashed.journal.close()
+    crashed._lock.close()
+    first.stop()
+
+    restored = new_canvas()
+    recovering = Autosave(FakeWidget(), restored, str(tmp_path))
+    assert recovering.start() is True
+    assert recovering.slot == crashed.slot == 2
+    assert len(restored.get_shapes()) == 2
+    recovering.stop()
+
+
+@pytest.mark.skipif(autosave.fcntl is None, reason="flock only")
+def test_lock_on_replaced_file_is_retried(tmp_path, monkeypatch):
+    path = str(tmp_path / 'journal-1.lock')
+    flock = autosave.fcntl.flock
+    locked = []
+
+    def racing_flock(fd, operation):
+        flock(fd, operation)
+        if not locked:
+            # 잠그는 사이에 이전 소유자가 파일을 지우고 다른 인스턴스가 새로 만듦
+            os.remove(path)
+            open(path, 'wb').close()
+        locked.append(fd)
+
+    monkeypatch.setattr(autosave.fcntl, 'flock', racing_flock)
+    lock = autosave._try_lock(path)
+    assert len(locked) == 2
+    assert os.path.samestat(os.fstat(lock.fileno()), os.stat(path))
+    lock.close()
@@ -0,0 +1,82 @@
+import pytest
+
+from controller.history import AddShapes, MoveShapes
+from model.change_events import ChangeKind
+from tests.helpers import Recorder, make_shapes
+
+
+def test_batch_sends_one_notification(canvas):
+    recorder = Recorder(canvas)
+    shapes = make_shapes(4)
+    with canvas.batch():
+        for shape in shapes:
+            canvas.add_shape(shape)
+        shapes[0].move(5, 5)
+        canvas.select_shapes(shapes[:2])
+        canvas.bring_to_front([shapes[0]])
+        assert recorder.changes == []
+    assert len(recorder.changes) == 1
+    changes = recorder.changes[0]
+    assert not changes.full_refresh
+    assert changes.ids(ChangeKind.SHAPE_ADDED) == {s.id for s in shapes}
+    assert changes.selection_diff() == ({s.id for s in shapes[:2]}, set())
+
+
+def test_nested_batches_notify_once_at_outermost_exit(canvas):
+    recorder = Recorder(canvas)
+    with canvas.batch():
+        with canvas.batch():
+            canvas.add_shapes(make_shapes(2))
+        assert recorder.changes == []
+        canvas.add_shapes(make_shapes(1))
+    assert len(recorder.changes) == 1
+    assert len(recorder.changes[0].ids(ChangeKind.SHAPE_ADDED)) == 3
+
+
+def test_empty_batch_does_not_notify(canvas):
+    recorder = Recorder(canvas)
+    with canvas.batch():
+        pass
+    assert recorder.changes == []
+
+
+def test_batch_notifies_applied_changes_on_error(canvas):
+    recorder = Recorder(canvas)
+    with pytest.raises(RuntimeError):
+        with canvas.batch():
+            canvas.add_shapes(make_shapes(2))
+            raise RuntimeError
+    assert len(canvas.shapes) == 2
+    assert len(recorder.changes) == 1
+    assert canvas._batch_depth == 0
+
+
+def test_bulk_add_and_remove_notify_once(canvas):
+    recorder = Recorder(canvas)
+    shapes = make_shapes(50)
+    canvas.add_shapes(shapes)
+    canvas.select_shapes(shapes[:10])
+    recorder.changes = []
+    canvas.remove_shapes(shapes[:30] + [shapes[0]])
+    assert len(recorder.changes) == 1
+    changes = recorder.changes[0]
+    assert changes.removed_ids() == {s.id for s in shapes[:30]}
+    assert changes.selection_diff() == (set(), {s.id for s in shapes[:10]})
+    assert canvas.get_shapes() == shapes[30:]
+
+
+def test_undo_and_redo_notify_once(controller):
+    canvas = controller.canvas
+    shapes = make_shapes(20)
+    canvas.add_shapes(shapes)
+    controller.history.push(AddShapes(shapes))
+    canvas.select_shapes(shapes)
+    controller.history.push(MoveShapes(shapes, 5, 5))
+    for shape in shapes:
+        shape.move(5, 5)
+    recorder = Recorder(canvas)
+    controller.undo()
+    controller.undo()
+    controller.redo()
+    assert len(recorder.changes) == 3
+    assert len(canvas.shapes) == 20 and shapes[0].x == 0
@@ -0,0 +1,75 @@
+from tests.helpers import make_shapes
+
+
+def items(view):
+    return {shape_id: [item for _, item in entries] for shape_id, entries in view.shape_items.items()}
+
+
+def test_redraw_keeps_items_of_unchanged_shapes(view):
+    shapes = make_shapes(5)
+    view.draw_shapes(shapes)
+    before = items(view)
+    shapes[2].fill = 'red'
+    view.draw_shapes(shapes)
+    after = items(view)
+    assert after == before
+    rectangle = next(item for kind, item in view.shape_items[shapes[2].id] if kind == 'rectangle')
+    assert view.itemcget(rectangle, 'fill') == 'red'
+
+
+def test_vanished_shapes_lose_their_items(view):
+    shapes = make_shapes(4)
+    view.draw_shapes(shapes)
+    gone = items(view)[shapes[1].id]
+    view.draw_shapes(shapes[:1] + shapes[2:])
+    assert shapes[1].id not in view.shape_items
+    assert not set(gone) & set(view.find_all())
+
+
+def test_stacking_follows_z_order(view):
+    shapes = make_shapes(5)
+    view.draw_shapes(shapes)
+    assert view.stacking() == [s.id for s in shapes]
+    reordered = [shapes[3], shapes[0], shapes[4], shapes[1], shapes[2]]
+    view.draw_shapes(reordered)
+    assert view.stacking() == [s.id for s in reordered]
+    # 새 도형은 z-order 위치에 끼워 넣는다
+    new, = make_shapes(1)
+    view.draw_shapes(reordered[:2] + [new] + reordered[2:])
+    assert view.stacking() == [s.id for s in reordered[:2] + [new] + reordered[2:]]
+
+
+def test_selected_tag_follows_selection(view):
+    shapes = make_shapes(3)
+    view.draw_shapes(shapes)
+    shapes[1].selected = True
+    view.draw_shapes(shapes)
+    assert set(view.find_withtag('selected')) == set(items(view)[shapes[1].id])
+    shapes[1].selected = False
+    view.draw_shapes(shapes)
+    assert view.find_withtag('selected') == ()
+
+
+def rendered(canvas, view):
+    return [s.id for s in canvas.get_shapes() if s.id in view.shape_items]
+
+
+def test_incremental_updates_keep_display_order(controller):
+    import random
+    rng = random.Random(5)
+    canvas, view = controller.canvas, controller.canvas_view
+    canvas.add_shapes(make_shapes(40))
+    controller.scheduler.flush()
+    for _ in range(10):
+        canvas.select_shapes(rng.sample(canvas.get_shapes(), 3))
+        rng.choice([controller.bring_to_front, controller.send_to_back,
+                    controller.bring_forward, controller.send_backward])()
+        controller.scheduler.flush()
+    canvas.remove_shapes(canvas.get_shapes()[:2])
+    controller.scheduler.flush()
+    assert view.stacking() == rendered(canvas, view)
+    # 다음 전체 그리기는 이미 맞게 쌓인 아이템을 다시 쌓지 않음
+    view.calls.clear()
+    controller._render_viewport()
+    assert view.calls['tag_raise'] <= 1
+    assert view.stacking() == rendered(canvas, view)
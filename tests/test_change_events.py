@@ -0,0 +1,50 @@
+from model.change_events import ChangeKind, ChangeSet
+from tests.helpers import Recorder, make_shapes
+
+
+def test_change_records_describe_edits(canvas):
+    a, b = make_shapes(2)
+    canvas.add_shapes([a, b])
+    recorder = Recorder(canvas)
+    a.move(3, 4)
+    canvas.notify_observers()
+    b.set_property('fill', 'red')
+    canvas.notify_observers()
+    a.z_order = 5
+    a._notify_changed('z_order')
+    canvas.notify_observers()
+    canvas.remove_shape(b)
+    moved, modified, reordered, removed = recorder.changes
+    assert moved.ids(ChangeKind.SHAPE_MOVED) == {a.id} and not moved.has(ChangeKind.PROPERTY_CHANGED)
+    assert modified.fields_for(b.id) == {'fill'}
+    assert reordered.reordered_ids() == {a.id}
+    assert removed.removed_ids() == {b.id}
+    assert not any(changes.full_refresh for changes in recorder.changes)
+
+
+def test_removed_then_re_added_shape_is_not_removed():
+    changes = ChangeSet()
+    changes.add(ChangeKind.SHAPE_REMOVED, ['a', 'b'])
+    changes.add(ChangeKind.SHAPE_ADDED, ['a'])
+    changes.add(ChangeKind.PROPERTY_CHANGED, ['b'], ['fill'])
+    assert changes.removed_ids() == {'b'}
+    assert changes.added_ids() == {'a'}
+    assert changes.dirty_ids() == {'a'}
+    assert changes.reordered_ids() == {'a'}
+
+
+def test_merge_keeps_records_and_full_refresh():
+    first = ChangeSet()
+    first.add(ChangeKind.SHAPE_MOVED, ['a'], ['x'])
+    second = ChangeSet(full_refresh=True)
+    second.add(ChangeKind.PROPERTY_CHANGED, ['a'], ['fill'])
+    first.merge(second)
+    assert first.full_refresh and len(first) == 2
+    assert first.fields_for('a') == {'x', 'fill'}
+    assert not ChangeSet() and ChangeSet(full_refresh=True)
+
+
+def test_notify_without_records_is_full_refresh(canvas):
+    recorder = Recorder(canvas)
+    canvas.notify_observers()
+    assert recorder.changes[-1].full_refresh
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from model.document_io import DocumentFormatError, dumps, loads
+from model.journal import shape_state
+from model.shape_composite import ShapeGroup
+from model.shape_factory import ShapeFactory
+from tests.helpers import make_shapes
+
+
+def group_path(shape):
+    path, group = [], shape._parent
+    while group is not None:
+        path.append(group.id)
+        group = group._parent
+    return path[::-1]
+
+
+def document(rng):
+    """모든 도형 종류, 비ASCII 문자열, 중첩 그룹을 포함한 문서 (z-order 순)"""
+    shapes = []
+    for i, kind in enumerate(['rectangle', 'ellipse', 'line', 'text', 'image'] * 4):
+        shape = ShapeFactory.create_shape(kind, text='안녕 ✓' if kind == 'text' else None,
+                                          image_path=f'/tmp/사진{i}.png' if kind == 'image' else None)
+        shape.x, shape.y = rng.uniform(-500, 500), rng.uniform(-500, 500)
+        shape.z_order = i // 3
+        shape.has_frame, shape.has_shadow = rng.random() < 0.5, rng.random() < 0.5
+        if kind == 'line':
+            shape.x2, shape.y2 = rng.uniform(-50, 50), rng.uniform(-50, 50)
+        shapes.append(shape)
+    inner = ShapeGroup(shapes[1:4])
+    ShapeGroup([inner, shapes[7]])
+    ShapeGroup(shapes[10:12])
+    return shapes
+
+
+@pytest.mark.parametrize('compress', [True, False])
+def test_dumps_loads_round_trip(compress):
+    shapes = document(random.Random(3))
+    loaded = loads(dumps(shapes, compress=compress))
+    assert [shape_state(s) for s in loaded] == [shape_state(s) for s in shapes]
+    assert [group_path(s) for s in loaded] == [group_path(s) for s in shapes]
+    # 같은 그룹에 속한 도형은 같은 그룹 객체를 공유한다
+    assert loaded[1]._parent is loaded[2]._parent is loaded[3]._parent
+    assert loaded[1]._parent._parent is loaded[7]._parent
+
+
+def test_loads_rejects_bad_data():
+    data = dumps(make_shapes(3))
+    with pytest.raises(DocumentFormatError):
+        loads(b'XXXX' + data[4:])
+    with pytest.raises(DocumentFormatError):
+        loads(data[:len(data) // 2])
@@ -0,0 +1,42 @@
+from tests.helpers import make_shapes
+
+
+def test_drag_moves_items_without_rebuilding(controller):
+    canvas, view = controller.canvas, controller.canvas_view
+    shapes = make_shapes(5)
+    canvas.add_shapes(shapes)
+    canvas.select_shapes(shapes[:2])
+    controller.scheduler.flush()
+    items = {shape_id: list(entries) for shape_id, entries in view.shape_items.items()}
+    view.calls.clear()
+
+    for _ in range(10):
+        controller.on_shape_drag(2, 1)
+    controller.scheduler.flush()
+    # 드래그 중에는 모델을 바꾸지 않고 선택된 아이템만 한 번에 옮김
+    assert view.calls['move'] == 1
+    assert (shapes[0].x, shapes[0].y) == (0, 0)
+    rectangle = items[shapes[0].id][0][1]
+    assert view.coords(rectangle)[:2] == [20, 10]
+
+    view.calls.clear()
+    controller.on_shape_drag_end()
+    controller.scheduler.flush()
+    assert [(s.x, s.y) for s in shapes[:2]] == [(20, 10), (50, 40)]
+    # 이미 옮긴 아이템은 다시 만들거나 설정하지 않음
+    assert not any(name.startswith('create_') for name in view.calls)
+    assert view.calls['coords'] == 0
+    assert {i: list(e) for i, e in view.shape_items.items()} == items
+
+
+def test_drag_is_one_undo_step(controller):
+    canvas = controller.canvas
+    shape, = make_shapes(1)
+    canvas.add_shape(shape)
+    canvas.select_shapes([shape])
+    for _ in range(4):
+        controller.on_shape_drag(5, 0)
+    controller.on_shape_drag_end()
+    assert shape.x == 20
+    controller.undo()
+    assert shape.x == 0
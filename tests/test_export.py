@@ -0,0 +1,38 @@
+import re
+
+import pytest
+
+import export
+from model.document_io import save_document
+from tests.helpers import make_shapes
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = str(tmp_path / 'board.mrdh')
+    save_document(make_shapes(3), path)
+    return path
+
+
+def svg_size(path):
+    with open(path) as f:
+        head = f.read(4096)
+    width, height = re.search(r'<svg[^>]* width="([\d.]+)" height="([\d.]+)"', head).groups()
+    view_box = re.search(r'viewBox="([^"]+)"', head).group(1).split()
+    return float(width), float(height), float(view_box[2]), float(view_box[3])
+
+
+def test_svg_export_applies_scale(document, tmp_path):
+    (tmp_path / 'plain').mkdir()
+    (tmp_path / 'scaled').mkdir()
+    plain = export.export_document(document, str(tmp_path / 'plain'), 'svg')
+    scaled = export.export_document(document, str(tmp_path / 'scaled'), 'svg', scale=2)
+    assert plain['error'] is None and scaled['error'] is None
+    width, height, box_width, box_height = svg_size(plain['outputs'][0])
+    assert (width, height) == (box_width, box_height)
+    assert svg_size(scaled['outputs'][0]) == (width * 2, height * 2, box_width, box_height)
+
+
+def test_rejects_non_positive_scale(document, tmp_path):
+    with pytest.raises(SystemExit):
+        export.main([document, '-o', str(tmp_path), '--scale', '0'])
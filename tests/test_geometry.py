@@ -0,0 +1,50 @@
+import pytest
+
+from model import geometry
+from model.geometry import ShapeGeometry
+from model.shape_factory import ShapeFactory
+from model.shapes.line import Line
+
+
+def line(x, y, x2, y2):
+    shape = ShapeFactory.create_shape('line')
+    shape.x, shape.y, shape.x2, shape.y2 = x, y, x2, y2
+    return shape
+
+
+def rect(x, y, width, height):
+    shape = ShapeFactory.create_shape('rectangle')
+    shape.x, shape.y, shape.width, shape.height = x, y, width, height
+    return shape
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(geometry, 'np', None)
+    return request.param
+
+
+def test_line_bounds_use_endpoints(backend):
+    shapes = [line(10, 10, 500, 400), rect(0, 50, 5, 5), line(300, 300, -100, -250)]
+    geo = ShapeGeometry.from_shapes(shapes)
+    assert tuple(geo.bounds()) == (0, 10, 510, 410)
+
+
+def test_line_subclass_uses_endpoints(backend):
+    class Connector(Line):
+        __slots__ = ()
+
+    shape = Connector()
+    shape.x, shape.y, shape.x2, shape.y2 = 10, 10, 500, 400
+    assert tuple(ShapeGeometry.from_shapes([shape]).bounds()) == (10, 10, 510, 410)
+
+
+def test_canvas_bounds_and_contained_query_with_lines(canvas, backend):
+    long_line = line(10, 10, 500, 400)
+    canvas.add_shapes([long_line, rect(100, 100, 20, 20)])
+    assert canvas.get_bounds() == (10, 10, 510, 410)
+    assert long_line not in canvas.shapes_in_rect(0, 0, 200, 200, contained=True)
+    assert long_line in canvas.shapes_in_rect(0, 0, 600, 600, contained=True)
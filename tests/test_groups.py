@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from model.shape_composite import ShapeGroup
+from tests.helpers import make_shapes
+
+
+def brute_components(canvas, x1, y1, x2, y2, contained):
+    """최상위 도형/그룹을 하나씩 검사한 기대값"""
+    tops = {id(canvas.top_level(s)): canvas.top_level(s) for s in canvas.get_shapes()}
+    found = set()
+    for top in tops.values():
+        bx1, by1, bx2, by2 = top.get_bounds()
+        if contained:
+            hit = x1 <= bx1 and bx2 <= x2 and y1 <= by1 and by2 <= y2
+        elif isinstance(top, ShapeGroup):
+            hit = any(sx1 <= x2 and x1 <= sx2 and sy1 <= y2 and y1 <= sy2
+                      for sx1, sy1, sx2, sy2 in (s.get_bounds() for s in top.leaves()))
+        else:
+            hit = bx1 <= x2 and x1 <= bx2 and by1 <= y2 and y1 <= by2
+        if hit:
+            found.add(top.id)
+    return found
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_components_in_rect_with_nested_groups(canvas, seed):
+    rng = random.Random(seed)
+    shapes = make_shapes(200, rng=rng)
+    canvas.add_shapes(shapes)
+    for _ in range(30):
+        canvas.group_shapes(rng.sample(shapes, rng.randint(2, 6)))
+    for _ in range(40):
+        x1, y1 = rng.randrange(2000), rng.randrange(2000)
+        x2, y2 = x1 + rng.randrange(1, 800), y1 + rng.randrange(1, 800)
+        for contained in (False, True):
+            got = {c.id for c in canvas.components_in_rect(x1, y1, x2, y2, contained)}
+            assert got == brute_components(canvas, x1, y1, x2, y2, contained)
+
+
+def test_group_bounds_follow_moved_child(canvas):
+    a, b, c = make_shapes(3)
+    canvas.add_shapes([a, b, c])
+    inner = canvas.group_shapes([a, b])
+    outer = canvas.group_shapes([inner, c])
+    assert outer.get_bounds() == (0, 0, c.x + c.width, c.y + c.height)
+    a.move(-50, -50)
+    assert inner.get_bounds()[:2] == (-50, -50)
+    assert outer.get_bounds()[:2] == (-50, -50)
+    assert outer.is_point_inside(a.x + 1, a.y + 1)
+    assert not outer.is_point_inside(-49, 500)
+
+
+def test_find_shape_at_returns_topmost_and_selects_group(canvas):
+    a, b = make_shapes(2)
+    b.x, b.y = a.x + 5, a.y + 5
+    canvas.add_shapes([a, b])
+    group = canvas.group_shapes([a, b])
+    hit = canvas.find_shape_at(a.x + 10, a.y + 10)
+    assert hit is b
+    assert canvas.top_level(hit) is group
+    assert set(canvas.selection_unit(hit)) == {a, b}
+
+
+def test_click_selects_whole_group(controller):
+    canvas = controller.canvas
+    a, b, c = make_shapes(3)
+    canvas.add_shapes([a, b, c])
+    canvas.group_shapes([a, c])
+    controller.on_canvas_click(a.x + 1, a.y + 1)
+    assert set(canvas.selected_shapes) == {a, c}
+    controller.on_canvas_click(b.x + 1, b.y + 1, multi_select=True)
+    assert set(canvas.selected_shapes) == {a, b, c}
+    controller.on_canvas_click(-500, -500)
+    assert canvas.selected_shapes == []
+
+
+def test_group_queries_skip_subtrees_outside_rect(canvas, monkeypatch):
+    a, b, c, d, e = make_shapes(5)
+    d.x = d.y = 1000
+    canvas.add_shapes([a, b, c, d, e])
+    deep = canvas.group_shapes([c])
+    far = canvas.group_shapes([deep, e])
+    near = canvas.group_shapes([a, b])
+    outer = canvas.group_shapes([far, near, d])
+    visited = []
+    overlaps_rect = ShapeGroup.overlaps_rect
+
+    def spy(group, *rect):
+        visited.append(group)
+        return overlaps_rect(group, *rect)
+
+    monkeypatch.setattr(ShapeGroup, 'overlaps_rect', spy)
+    assert canvas.components_in_rect(-10, -10, 5, 5) == [outer]
+    # far의 bounds (60, 60)~는 영역과 겹치지 않으므로 그 하위 그룹은 보지 않음
+    assert visited == [outer, far, near]
+    visited.clear()
+    assert canvas.components_in_rect(-2000, -2000, -1000, -1000) == []
+    assert visited == [outer]
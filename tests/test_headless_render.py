@@ -0,0 +1,92 @@
+import io
+import struct
+import subprocess
+import sys
+import zlib
+
+import pytest
+
+from model.shape_factory import ShapeFactory
+from view import raster
+from view.raster import export_png, parse_color, render_png
+
+
+def rect(x, y, width, height, fill='red'):
+    shape = ShapeFactory.create_shape('rectangle')
+    shape.x, shape.y, shape.width, shape.height = x, y, width, height
+    shape.fill = fill
+    return shape
+
+
+def decode_png(data):
+    """encode_png가 만든 PNG (필터 없는 8비트 RGB) -> (width, height, 픽셀 함수)"""
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    offset, chunks = 8, {}
+    while offset < len(data):
+        length, = struct.unpack_from('>I', data, offset)
+        kind = data[offset + 4:offset + 8]
+        chunks[kind] = chunks.get(kind, b'') + data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+    width, height = struct.unpack_from('>II', chunks[b'IHDR'])
+    raw = zlib.decompress(chunks[b'IDAT'])
+    stride = width * 3 + 1
+
+    def pixel(x, y):
+        start = y * stride + 1 + x * 3
+        return tuple(raw[start:start + 3])
+
+    return width, height, pixel
+
+
+def test_primitives_do_not_import_tkinter():
+    code = "import sys, view.primitives, view.raster; print('tkinter' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
+
+
+def test_pure_python_backend_draws_shapes():
+    shapes = [rect(10, 10, 20, 20), rect(20, 20, 20, 20, fill='blue')]
+    width, height, pixel = decode_png(render_png(shapes, region=(0, 0, 50, 50), use_pillow=False))
+    assert (width, height) == (50, 50)
+    assert pixel(15, 15) == (255, 0, 0)
+    assert pixel(30, 30) == (0, 0, 255)  # 위 도형이 나중에 그려짐
+    assert pixel(5, 5) == (255, 255, 255)
+    assert pixel(10, 20) == (0, 0, 0)  # 외곽선
+
+
+def test_scale_and_region_map_model_to_pixels():
+    data = render_png([rect(110, 110, 10, 10)], scale=2, region=(100, 100, 130, 130), use_pillow=False)
+    width, height, pixel = decode_png(data)
+    assert (width, height) == (60, 60)
+    assert pixel(30, 30) == (255, 0, 0)
+    assert pixel(50, 50) == (255, 255, 255)
+
+
+def test_default_region_covers_shapes():
+    width, height, _ = decode_png(render_png([rect(0, 0, 40, 10)], use_pillow=False))
+    assert width >= 40 and height >= 10
+
+
+def test_parse_color():
+    assert parse_color('') is None
+    assert parse_color('#f00') == (255, 0, 0)
+    assert parse_color('#00ff00') == (0, 255, 0)
+    assert parse_color('Light Blue') is not None
+
+
+def test_pillow_and_pure_python_agree_on_fills():
+    pil = pytest.importorskip('PIL.Image')
+    shapes = [rect(10, 10, 20, 20), rect(20, 20, 20, 20, fill='blue')]
+    with_pillow = pil.open(io.BytesIO(render_png(shapes, region=(0, 0, 50, 50)))).convert('RGB')
+    _, _, pixel = decode_png(render_png(shapes, region=(0, 0, 50, 50), use_pillow=False))
+    for point in [(15, 15), (30, 30), (5, 5), (45, 45)]:
+        assert with_pillow.getpixel(point) == pixel(*point)
+
+
+def test_export_png_draws_the_whole_canvas(canvas, tmp_path, monkeypatch):
+    monkeypatch.setattr(raster, 'PILImage', None)
+    canvas.add_shapes([rect(0, 0, 10, 10), rect(100, 50, 10, 10, fill='green')])
+    path = tmp_path / 'out.png'
+    export_png(canvas, str(path))
+    width, height, _ = decode_png(path.read_bytes())
+    assert width >= 110 and height >= 60
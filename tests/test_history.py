@@ -0,0 +1,173 @@
+import random
+
+import pytest
+
+from controller.history import AddShapes, Command, History, MoveShapes
+from tests.helpers import make_shapes
+
+
+def order(canvas):
+    return [(shape.id, shape.z_order) for shape in canvas.shapes]
+
+
+def test_command_is_abstract():
+    with pytest.raises(TypeError):
+        Command()
+
+
+def test_send_to_back_undo_restores_stacking(controller):
+    canvas = controller.canvas
+    a, b, c = make_shapes(3)
+    for shape in (a, b, c):
+        canvas.add_shape(shape)
+    before = order(canvas)
+    canvas.select_shapes([a, c])
+    controller.send_to_back()
+    assert [s for s in canvas.shapes] == [c, a, b]
+    after = order(canvas)
+
+    controller.undo()
+    assert order(canvas) == before
+    controller.redo()
+    assert order(canvas) == after
+
+
+def test_z_order_property_undo_restores_stacking(controller):
+    canvas = controller.canvas
+    shapes = make_shapes(3)
+    for shape in shapes:
+        canvas.add_shape(shape)
+    before = order(canvas)
+    canvas.select_shapes(shapes[:2])
+    controller.on_property_changed('z_order', '-1')
+    after = order(canvas)
+
+    controller.undo()
+    assert order(canvas) == before
+    controller.redo()
+    assert order(canvas) == after
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_random_reorders_undo_redo(controller, seed):
+    rng = random.Random(seed)
+    canvas = controller.canvas
+    for shape in make_shapes(12, rng=rng, z_orders=3):
+        canvas.add_shape(shape)
+    operations = [controller.bring_to_front, controller.send_to_back,
+                  controller.bring_forward, controller.send_backward,
+                  lambda: controller.on_property_changed('z_order', str(rng.randrange(-2, 4)))]
+    states = [order(canvas)]
+    for _ in range(40):
+        canvas.select_shapes(rng.sample(canvas.get_shapes(), rng.randrange(1, 5)))
+        undo_depth = len(controller.history._undo)
+        rng.choice(operations)()
+        if len(controller.history._undo) > undo_depth:
+            states.append(order(canvas))
+        else:
+            assert order(canvas) == states[-1]
+
+    for state in reversed(states[:-1]):
+        controller.undo()
+        assert order(canvas) == state
+    for state in states[1:]:
+        controller.redo()
+        assert order(canvas) == state
+
+
+def test_commands_skip_shapes_removed_later(controller):
+    canvas = controller.canvas
+    shapes = make_shapes(3)
+    for shape in shapes:
+        canvas.add_shape(shape)
+    canvas.select_shapes([shapes[0]])
+    controller.bring_to_front()
+    canvas.remove_shapes([shapes[0]])
+
+    controller.undo()
+    assert shapes[0] not in canvas.shapes
+    assert canvas.find_shape_at(shapes[1].x + 1, shapes[1].y + 1) is shapes[1]
+    assert len(canvas.shapes) == 2
+
+
+def test_move_and_add_commands_skip_removed_shapes(canvas):
+    a, b = make_shapes(2)
+    history = History()
+    canvas.add_shapes([a, b])
+    history.push(AddShapes([a, b]))
+    a.move(5, 0)
+    history.push(MoveShapes([a], 5, 0))
+    canvas.remove_shapes([a])
+
+    history.undo(canvas)  # 이동 취소: a는 이미 없음
+    assert a.x == 5
+    history.undo(canvas)  # 추가 취소
+    assert len(canvas.shapes) == 0
+    history.redo(canvas)
+    assert list(canvas.shapes) == [b]
+
+
+def test_journal_replay_matches_after_undo_redo(controller, tmp_path):
+    from model.canvas import Canvas
+    from model.journal import Journal, read_journal, replay
+
+    rng = random.Random(7)
+    canvas = controller.canvas
+    canvas.journal = Journal(str(tmp_path / 'edits.mrdj'))
+    canvas.journal.reset(None)
+    for shape in make_shapes(10, rng=rng, z_orders=2):
+        canvas.add_shape(shape)
+    for _ in range(20):
+        canvas.select_shapes(rng.sample(canvas.get_shapes(), 3))
+        rng.choice([controller.bring_to_front, controller.send_to_back,
+                    controller.bring_forward, controller.send_backward])()
+    for _ in range(8):
+        controller.undo()
+    for _ in range(3):
+        controller.redo()
+    expected = order(canvas)
+    canvas.journal.close()
+
+    _, records, _ = read_journal(canvas.journal.path)
+    Canvas._instance = None
+    replayed = Canvas()
+    replay(replayed, records)
+    assert order(replayed) == expected
+
+
+def structure(canvas):
+    """그룹별 자식 id (순서 포함)과 각 그룹의 부모"""
+    return sorted((g.id, [c.id for c in g.shapes], g._parent.id if g._parent else None)
+                  for g in canvas.groups.values())
+
+
+def test_undo_redo_of_add_inside_group(canvas, tmp_path):
+    from model.canvas import Canvas
+    from model.journal import Journal, read_journal, replay
+
+    canvas.journal = Journal(str(tmp_path / 'edits.mrdj'))
+    canvas.journal.reset(None)
+    a, b, c, d = make_shapes(4)
+    history = History()
+    canvas.add_shapes([a, b])
+    added = [c, d]
+    canvas.add_shapes(added)
+    history.push(AddShapes(added))
+    # 추가한 뒤 History 밖에서 그룹에 넣음: d만 든 그룹은 실행 취소로 비게 됨
+    inner = canvas.group_shapes([d])
+    outer = canvas.group_shapes([a, c, inner, b])
+    expected = structure(canvas)
+
+    history.undo(canvas)
+    assert list(canvas.shapes) == [a, b]
+    assert inner.id not in canvas.groups and [s.id for s in outer.shapes] == [a.id, b.id]
+    history.redo(canvas)
+    assert structure(canvas) == expected
+    assert canvas.selection_unit(d) == outer.leaves()
+    canvas.journal.close()
+
+    _, records, _ = read_journal(canvas.journal.path)
+    Canvas._instance = None
+    replayed = Canvas()
+    replay(replayed, records)
+    assert structure(replayed) == expected
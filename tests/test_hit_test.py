@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from model.spatial_index import SpatialIndex
+from tests.helpers import make_shapes
+
+
+def test_index_tracks_moved_and_removed_shapes():
+    a, b = make_shapes(2)
+    index = SpatialIndex(cell_size=50)
+    index.insert(a)
+    index.insert(b)
+    assert index.query_point(a.x + 1, a.y + 1) == [a]
+    a.move(500, 500)
+    index.update(a)
+    assert index.query_point(a.x + 1, a.y + 1) == [a]
+    assert a not in index.query_point(1, 1)
+    index.remove(b)
+    assert index.query_point(b.x + 1, b.y + 1) == [] and len(index) == 1
+
+
+def test_oversized_shapes_are_found_everywhere():
+    big, = make_shapes(1)
+    big.width = big.height = 10000
+    index = SpatialIndex(cell_size=10, max_cells=4)
+    index.insert(big)
+    assert not index._cells
+    assert index.query_point(9000, 9000) == [big]
+    assert index.query_rect(5000, 5000, 5001, 5001) == [big]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_click_hits_topmost_shape(controller, seed):
+    """공간 인덱스로 찾은 도형이 모든 도형을 훑은 결과와 같아야 한다"""
+    rng = random.Random(seed)
+    canvas = controller.canvas
+    canvas.add_shapes(make_shapes(300, kind=['rectangle', 'ellipse', 'line'], rng=rng, z_orders=5))
+    for shape in rng.sample(canvas.get_shapes(), 50):
+        shape.move(rng.randint(-100, 100), rng.randint(-100, 100))
+    for _ in range(200):
+        x, y = rng.uniform(-100, 2200), rng.uniform(-100, 2200)
+        hits = [s for s in canvas.get_shapes() if s.is_point_inside(x, y)]
+        expected = hits[-1] if hits else None
+        assert controller.on_canvas_click(x, y, check_only=True)['shape'] is expected
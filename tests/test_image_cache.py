@@ -0,0 +1,141 @@
+import os
+
+import pytest
+
+from view import image_cache
+from view.image_cache import ImageCache
+
+
+class FakePhoto:
+    def __init__(self, width, height):
+        self._size = (width, height)
+
+    def width(self):
+        return self._size[0]
+
+    def height(self):
+        return self._size[1]
+
+
+class ManualLoader:
+    """ImageLoader stand-in: decodes run when the test calls finish()"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, key, callback):
+        self.submitted.append((key, callback))
+
+    def finish(self, error=None):
+        jobs, self.submitted = self.submitted, []
+        for key, callback in jobs:
+            callback(key, b'pixels', error)
+
+
+@pytest.fixture(autouse=True)
+def fake_photos(monkeypatch):
+    monkeypatch.setattr(image_cache, 'pixels_to_photo', lambda pixels, w, h: FakePhoto(w, h))
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """decode_pixels 대신 호출만 기록"""
+    calls = []
+
+    def decode(path, width, height):
+        calls.append((path, width, height))
+        return b'pixels'
+
+    monkeypatch.setattr(image_cache, 'decode_pixels', decode)
+    return calls
+
+
+def test_lru_evicts_least_recently_used(decodes):
+    cache = ImageCache(max_bytes=2 * 10 * 10 * 4)
+    cache.get('a', 10, 10)
+    cache.get('b', 10, 10)
+    cache.get('a', 10, 10)  # a가 가장 최근
+    cache.get('c', 10, 10)
+    assert ('a', 10, 10) in cache and ('b', 10, 10) not in cache
+    assert cache.stats()['hits'] == 1 and cache.evictions == 1
+    assert decodes == [('a', 10, 10), ('b', 10, 10), ('c', 10, 10)]
+
+
+def test_images_are_decoded_per_display_size(decodes):
+    cache = ImageCache()
+    small = cache.get('a', 10, 10)
+    assert cache.get('a', 10.4, 10) is small
+    cache.get('a', 40, 20)
+    assert decodes == [('a', 10, 10), ('a', 40, 20)]
+    assert cache.bytes_used == (10 * 10 + 40 * 20) * 4
+
+
+def test_pinned_images_are_not_evicted(decodes):
+    cache = ImageCache(max_bytes=10 * 10 * 4)
+    shown = cache.acquire('shape', 'a', 10, 10)
+    cache.get('b', 10, 10)
+    assert ('a', 10, 10) in cache and ('b', 10, 10) not in cache
+    # 같은 owner가 다른 크기를 받으면 이전 이미지는 풀림
+    assert cache.acquire('shape', 'a', 20, 20) is not shown
+    cache.get('c', 10, 10)
+    assert ('a', 10, 10) not in cache
+
+
+def test_decode_pixels_scales_to_display_size(tmp_path):
+    Image = pytest.importorskip('PIL.Image')
+    path = str(tmp_path / 'big.png')
+    Image.new('RGB', (400, 300), (255, 0, 0)).save(path)
+    assert image_cache.decode_pixels(path, 40, 30).size == (40, 30)
+
+
+def test_decode_completes_when_pinned_images_fill_budget():
+    loader = ManualLoader()
+    cache = ImageCache(max_bytes=10 * 10 * 4, loader=loader)
+    ready = []
+
+    def on_ready(owner):
+        ready.append(cache.request(owner, owner, 10, 10, on_ready))
+
+    assert cache.request('a', 'a', 10, 10, on_ready) is None
+    loader.finish()
+    assert isinstance(ready.pop(), FakePhoto)  # 'a' pinned, budget full
+
+    assert cache.request('b', 'b', 10, 10, on_ready) is None
+    loader.finish()
+    assert isinstance(ready.pop(), FakePhoto)
+    assert loader.submitted == []  # not submitted again
+    assert cache.bytes_used > cache.max_bytes
+    assert cache.evictions == 0
+
+
+def test_released_images_are_evicted_back_to_budget():
+    loader = ManualLoader()
+    cache = ImageCache(max_bytes=10 * 10 * 4, loader=loader)
+    for owner in 'ab':
+        cache.request(owner, owner, 10, 10, lambda o: None)
+        loader.finish()
+    cache.release('a')
+    assert cache.bytes_used <= cache.max_bytes
+    assert ('b', 10, 10) in cache and ('a', 10, 10) not in cache
+
+
+def test_failed_decode_is_retried_after_file_changes(tmp_path):
+    path = str(tmp_path / 'broken.png')
+    with open(path, 'wb') as f:
+        f.write(b'broken')
+    loader = ManualLoader()
+    cache = ImageCache(loader=loader)
+    calls = []
+
+    cache.request('s', path, 10, 10, calls.append)
+    loader.finish(error=ValueError('bad image'))
+    assert calls == ['s']
+    with pytest.raises(ValueError):
+        cache.request('s', path, 10, 10, calls.append)
+
+    with open(path, 'wb') as f:
+        f.write(b'fixed image')
+    os.utime(path, (1, 1))
+    assert cache.request('s', path, 10, 10, calls.append) is None
+    loader.finish()
+    assert isinstance(cache.request('s', path, 10, 10, calls.append), FakePhoto)
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from tests.helpers import FakeWidget
+from view.image_loader import ImageLoader
+
+
+def wait_for(widget, timeout=5.0):
+    """진행 중인 디코드가 모두 끝나 콜백이 불릴 때까지 폴링 실행"""
+    deadline = time.monotonic() + timeout
+    while widget.callbacks:
+        assert time.monotonic() < deadline, "decode did not finish"
+        time.sleep(0.01)
+        widget.run_pending()
+
+
+def test_decode_runs_off_the_tk_thread():
+    widget = FakeWidget()
+    main = threading.get_ident()
+    threads, results = [], []
+
+    def decode(path, width, height):
+        threads.append(threading.get_ident())
+        return (path, width, height)
+
+    loader = ImageLoader(widget, decode, max_workers=2)
+    loader.submit(('a.png', 10, 20),
+                  lambda key, result, error: results.append((result, error, threading.get_ident())))
+    assert results == []  # 제출 즉시 돌아옴
+    wait_for(widget)
+    loader.shutdown()
+    assert threads and threads[0] != main
+    assert results == [(('a.png', 10, 20), None, main)]
+
+
+def test_concurrent_requests_share_one_decode():
+    widget = FakeWidget()
+    release = threading.Event()
+    calls, results = [], []
+
+    def decode(path, width, height):
+        calls.append(path)
+        release.wait(5)
+        return path
+
+    loader = ImageLoader(widget, decode)
+    key = ('a.png', 10, 10)
+    loader.submit(key, lambda k, r, e: results.append(('first', r)))
+    loader.submit(key, lambda k, r, e: results.append(('second', r)))
+    assert loader.is_loading(key)
+    release.set()
+    wait_for(widget)
+    loader.shutdown()
+    assert calls == ['a.png']
+    assert results == [('first', 'a.png'), ('second', 'a.png')]
+    assert not loader.is_loading(key)
+
+
+def test_decode_errors_reach_the_callback():
+    widget = FakeWidget()
+    errors = []
+
+    def decode(path, width, height):
+        raise OSError('broken')
+
+    loader = ImageLoader(widget, decode)
+    loader.submit(('bad.png', 1, 1), lambda k, r, e: errors.append((r, e)))
+    wait_for(widget)
+    loader.shutdown()
+    assert len(errors) == 1 and errors[0][0] is None
+    assert isinstance(errors[0][1], OSError)
@@ -0,0 +1,106 @@
+import json
+
+from controller.instrumentation import Instrumentation
+from tests.helpers import make_shapes
+
+
+class FakeOverlay:
+    def __init__(self):
+        self.shown = []
+        self.hidden = False
+
+    def show(self, fps, frame_ms, item_count):
+        self.shown.append((fps, frame_ms, item_count))
+
+    def raise_(self):
+        pass
+
+    def hide(self):
+        self.hidden = True
+
+
+def names(instrumentation):
+    return [event[0] for event in instrumentation.events]
+
+
+def item_total(view):
+    return sum(len(items) for items in view.shape_items.values())
+
+
+def test_uninstall_restores_original_methods(controller):
+    canvas, view = controller.canvas, controller.canvas_view
+    before = [set(vars(obj)) for obj in (canvas, view, controller.scheduler, controller.property_panel)]
+    controller.enable_instrumentation()
+    assert 'find_shape_at' in vars(canvas) and '_frame' in vars(controller.scheduler)
+    controller.disable_instrumentation()
+    after = [set(vars(obj)) for obj in (canvas, view, controller.scheduler, controller.property_panel)]
+    assert after == before
+
+
+def test_frames_record_item_counts(controller):
+    instrumentation = controller.enable_instrumentation()
+    shapes = make_shapes(3)
+    controller.canvas.add_shapes(shapes)
+    controller.scheduler.flush()
+    name, _, duration, args = instrumentation.last_frame()
+    assert duration >= 0
+    assert args['created'] == item_total(controller.canvas_view) > 0
+    assert args['deleted'] == 0
+
+    controller.canvas.remove_shapes(shapes[:1])
+    controller.scheduler.flush()
+    args = instrumentation.last_frame()[3]
+    assert args['created'] == 0 and args['deleted'] > 0
+    assert args['items'] == item_total(controller.canvas_view)
+
+
+def test_hot_paths_are_recorded(controller):
+    shape, = make_shapes(1)
+    controller.canvas.add_shape(shape)
+    controller.scheduler.flush()
+    instrumentation = controller.enable_instrumentation()
+    controller.on_canvas_click(shape.x + 1, shape.y + 1)
+    controller.scheduler.flush()
+    recorded = set(names(instrumentation))
+    assert {'hit_test.find_shape_at', 'canvas.notify_observers', 'CanvasController.update',
+            'property_panel.update_properties', 'view.update_shapes', 'frame'} <= recorded
+
+
+def test_percentiles_and_summary():
+    instrumentation = Instrumentation()
+    for ms in range(1, 101):
+        instrumentation.record('frame', ms, ms * 1_000_000)
+    assert instrumentation.percentiles('frame') == {50: 50.0, 90: 90.0, 99: 99.0}
+    assert instrumentation.percentiles('missing') == {}
+    summary = instrumentation.summary()['frame']
+    assert summary['count'] == 100 and summary['max_ms'] == 100.0 and summary['mean_ms'] == 50.5
+
+
+def test_ring_buffer_keeps_latest_events():
+    instrumentation = Instrumentation(capacity=3)
+    for i in range(5):
+        instrumentation.record('frame', i, 1)
+    assert [event[1] for event in instrumentation.events] == [2, 3, 4]
+
+
+def test_chrome_trace(tmp_path):
+    instrumentation = Instrumentation()
+    instrumentation.record('view.draw_shapes', 2000, 5000)
+    instrumentation.record('frame', 1000, 9000, {'items': 4})
+    path = tmp_path / 'trace.json'
+    instrumentation.write_chrome_trace(str(path))
+    events = json.loads(path.read_text())['traceEvents']
+    assert [(e['name'], e['cat'], e['ph'], e['ts'], e['dur']) for e in events] == [
+        ('view.draw_shapes', 'view', 'X', 2.0, 5.0), ('frame', 'frame', 'X', 1.0, 9.0)]
+    assert events[1]['args'] == {'items': 4}
+
+
+def test_overlay_is_updated_per_frame(controller):
+    overlay = FakeOverlay()
+    controller.set_perf_overlay(overlay)
+    controller.canvas.add_shapes(make_shapes(2))
+    controller.scheduler.flush()
+    fps, frame_ms, items = overlay.shown[-1]
+    assert fps >= 1 and frame_ms >= 0 and items == item_total(controller.canvas_view)
+    controller.set_perf_overlay(None)
+    assert overlay.hidden and controller.instrumentation.overlay is None
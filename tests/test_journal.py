@@ -0,0 +1,130 @@
+import os
+import random
+
+import pytest
+
+from model.canvas import Canvas
+from model.document_io import load_document, save_document
+from model.journal import Journal, read_journal, replay, shape_state
+from tests.helpers import make_shapes
+
+
+def state(canvas):
+    """z-order 순 도형 상태와 그룹 구성"""
+    shapes = [(shape_state(s), s._parent.id if s._parent is not None else None)
+              for s in canvas.get_shapes()]
+    groups = sorted((g.id, sorted(c.id for c in g.shapes)) for g in canvas.groups.values())
+    return shapes, groups
+
+
+def replayed(path, base_shapes=()):
+    base, records, _ = read_journal(path)
+    Canvas._instance = None
+    canvas = Canvas()
+    canvas.load_shapes(list(base_shapes))
+    replay(canvas, records)
+    return canvas
+
+
+def edit(canvas, rng, steps):
+    """추가/삭제/속성 변경/z-order/그룹 연산을 무작위로 적용"""
+    for _ in range(steps):
+        shapes = canvas.get_shapes()
+        op = rng.choice(['add', 'remove', 'move', 'fill', 'z', 'group', 'ungroup'] if shapes else ['add'])
+        if op == 'add':
+            canvas.add_shapes(make_shapes(rng.randint(1, 3), rng=rng, z_orders=3))
+        elif op == 'remove':
+            canvas.remove_shapes(rng.sample(shapes, 1))
+        elif op == 'move':
+            shape = rng.choice(shapes)
+            shape.move(rng.randint(-20, 20), rng.randint(-20, 20))
+        elif op == 'fill':
+            rng.choice(shapes).set_property('fill', rng.choice(['red', 'blue', '']))
+        elif op == 'z':
+            picked = rng.sample(shapes, min(len(shapes), 2))
+            getattr(canvas, rng.choice(['bring_to_front', 'send_to_back',
+                                        'bring_forward', 'send_backward']))(picked)
+        elif op == 'group' and len(shapes) >= 2:
+            canvas.group_shapes(rng.sample(shapes, 2))
+        elif op == 'ungroup' and canvas.groups:
+            canvas.ungroup(rng.choice(list(canvas.groups.values())))
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_replay_reproduces_canvas(canvas, tmp_path, seed):
+    rng = random.Random(seed)
+    path = str(tmp_path / 'edits.mrdj')
+    canvas.journal = Journal(path)
+    canvas.journal.reset(None)
+    edit(canvas, rng, 80)
+    expected = state(canvas)
+    canvas.journal.close()
+    assert state(replayed(path)) == expected
+
+
+def test_replay_on_top_of_base_document(canvas, tmp_path):
+    base_path = str(tmp_path / 'base.mrdh')
+    base = make_shapes(5)
+    save_document(base, base_path)
+    canvas.load_shapes(base)
+    canvas.journal = Journal(str(tmp_path / 'edits.mrdj'))
+    canvas.journal.reset(base_path)
+    edit(canvas, random.Random(9), 30)
+    expected = state(canvas)
+    canvas.journal.close()
+
+    path, _, _ = read_journal(canvas.journal.path)
+    assert path == base_path
+    assert state(replayed(canvas.journal.path, load_document(path))) == expected
+
+
+def test_torn_tail_is_ignored_and_truncated_on_resume(canvas, tmp_path):
+    path = str(tmp_path / 'edits.mrdj')
+    journal = canvas.journal = Journal(path)
+    journal.reset(None)
+    canvas.add_shapes(make_shapes(3))
+    journal.sync()
+    expected = state(canvas)
+    valid_size = os.path.getsize(path)
+    canvas.add_shape(make_shapes(1)[0])
+    journal.close()
+    # 마지막 레코드를 쓰다가 죽은 것처럼 끝을 잘라냄
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 5)
+
+    _, records, size = read_journal(path)
+    assert size == valid_size
+    assert state(replayed(path)) == expected
+
+    journal = Journal(path)
+    journal.resume(size)
+    assert os.path.getsize(path) == valid_size
+    journal.append(['clear'])
+    journal.close()
+    _, records, _ = read_journal(path)
+    assert records[-1] == ['clear']
+
+
+def test_corrupt_record_stops_replay(tmp_path):
+    path = str(tmp_path / 'edits.mrdj')
+    journal = Journal(path)
+    journal.reset(None)
+    journal.append(['clear'])
+    journal.sync()
+    good = os.path.getsize(path)
+    journal.append(['clear'])
+    journal.append(['clear'])
+    journal.close()
+    with open(path, 'r+b') as f:
+        f.seek(good + 9)  # 두 번째 레코드의 payload 한 바이트를 바꿈
+        f.write(b'X')
+    _, records, size = read_journal(path)
+    assert records == [['clear']]
+    assert size == good
+
+
+def test_read_journal_rejects_other_files(tmp_path):
+    path = tmp_path / 'not-a-journal'
+    path.write_bytes(b'hello world')
+    with pytest.raises(ValueError):
+        read_journal(str(path))
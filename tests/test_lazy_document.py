@@ -0,0 +1,90 @@
+import random
+
+from model.document_io import LazyDocument, load_document, save_document
+from model.journal import shape_state
+from tests.helpers import make_shapes
+from tests.test_document_io import document
+
+
+def save(tmp_path, shapes, name='doc.mrdh'):
+    path = str(tmp_path / name)
+    save_document(sorted(shapes, key=lambda s: s.z_order), path, compress=False)
+    return path
+
+
+def test_lazy_document_builds_same_shapes(tmp_path):
+    shapes = document(random.Random(4))
+    path = str(tmp_path / 'doc.mrdh')
+    save_document(shapes, path, compress=False)
+    assert [shape_state(s) for s in load_document(path)] == [shape_state(s) for s in shapes]
+    lazy = LazyDocument(path)
+    built = lazy.build(list(range(lazy.count)))
+    assert [shape_state(s) for s in built] == [shape_state(s) for s in shapes]
+    lazy.close()
+
+
+def test_load_lazy_empty_document(canvas, tmp_path):
+    path = str(tmp_path / 'empty.mrdh')
+    save_document([], path, compress=False)
+    canvas.add_shapes(make_shapes(3))
+    canvas.load_lazy(LazyDocument(path), [])
+    assert canvas.lazy_document is None
+    assert canvas.get_shapes() == []
+    assert canvas.z_range() is None
+    assert canvas.load_pending() == 0
+    assert canvas.find_shape_at(0, 0) is None
+
+
+def test_load_lazy_materializes_on_demand(canvas, tmp_path):
+    shapes = make_shapes(50, rng=random.Random(1), z_orders=5)
+    canvas.load_lazy(LazyDocument(save(tmp_path, shapes)), [])
+    assert canvas.get_shapes() == []
+    low, high = canvas.z_range()
+    assert (low, high) == (min(s.z_order for s in shapes), max(s.z_order for s in shapes))
+    assert canvas.load_pending() == 0
+    assert canvas.lazy_document is None
+    assert sorted(s.id for s in canvas.get_shapes()) == sorted(s.id for s in shapes)
+
+
+def test_hit_test_builds_only_shapes_under_point(canvas, tmp_path):
+    shapes = make_shapes(20)
+    for i, shape in enumerate(shapes):
+        shape.x = shape.y = i * 200  # 서로 겹치지 않게
+    canvas.load_lazy(LazyDocument(save(tmp_path, shapes)), [])
+    target = shapes[7]
+    hit = canvas.find_shape_at(target.x + 1, target.y + 1)
+    assert hit.id == target.id
+    assert [s.id for s in canvas.get_shapes()] == [target.id]
+    assert canvas.lazy_document.remaining == 19
+
+
+def test_open_document_builds_visible_shapes_then_loads_in_chunks(controller, tmp_path):
+    shapes = make_shapes(50, rng=random.Random(2))
+    path = save(tmp_path, shapes)
+    controller.LOAD_CHUNK_SIZE = 10
+    controller.open_document(path)
+
+    x1, y1, x2, y2 = controller.canvas_view.visible_region()
+    visible = {s.id for s in shapes
+               if s.x <= x2 and x1 <= s.x + s.width and s.y <= y2 and y1 <= s.y + s.height}
+    assert 0 < len(visible) < len(shapes)
+    assert {s.id for s in controller.canvas.get_shapes()} == visible
+
+    remaining = controller.canvas.lazy_document.remaining
+    controller._load_chunk()
+    assert controller.canvas.lazy_document.remaining == remaining - controller.LOAD_CHUNK_SIZE
+    while controller.canvas.lazy_document is not None:
+        controller.canvas_view.run_pending()
+    assert [s.id for s in controller.canvas.get_shapes()] == [s.id for s in shapes]
+
+
+def test_bring_forward_builds_the_shape_it_passes(canvas, tmp_path):
+    shapes = make_shapes(10)
+    for i, shape in enumerate(shapes):
+        shape.z_order = i
+    canvas.load_lazy(LazyDocument(save(tmp_path, shapes)), [0])
+    first = canvas.get_shapes()[0]
+    canvas.bring_forward([first])
+    order = canvas.get_shapes()
+    assert [s.id for s in order] == [shapes[1].id, shapes[0].id]
+    assert order[1].z_order > order[0].z_order
@@ -0,0 +1,89 @@
+from model.shape_factory import ShapeFactory
+from view.level_of_detail import LevelOfDetail
+from view.primitives import shape_primitives
+
+
+def kinds(primitives):
+    return [kind for kind, _, _ in primitives]
+
+
+def item_kinds(view, shape):
+    return [kind for kind, _ in view.shape_items.get(shape.id, ())]
+
+
+def text_shape(x=0, y=0):
+    shape = ShapeFactory.create_shape('text', text='label')
+    shape.x, shape.y = x, y
+    return shape
+
+
+def test_inactive_at_actual_size():
+    lod = LevelOfDetail()
+    assert not lod.active(1.0) and not lod.active(2.0)
+    assert lod.active(0.5)
+    lod.enabled = False
+    assert not lod.active(0.5)
+
+
+def test_small_text_becomes_a_bar():
+    lod = LevelOfDetail()
+    props = text_shape().draw()
+    assert kinds(lod.primitives(props)) == kinds(shape_primitives(props)) == ['text']
+    bar = lod.primitives(dict(props, font_size=3))
+    assert kinds(bar) == ['rectangle'] and bar[0][2]['fill'] == lod.bar_color
+
+
+def test_small_images_become_flat_boxes():
+    lod = LevelOfDetail()
+    props = ShapeFactory.create_shape('image', image_path='/missing.png').draw()
+    resolved = []
+    box = lod.primitives(dict(props, width=8, height=8), lambda p: resolved.append(p))
+    assert kinds(box) == ['rectangle'] and box[0][2]['fill'] == lod.box_color
+    assert resolved == []  # 작은 이미지는 디코딩하지 않음
+
+
+def test_small_shapes_lose_shadow_and_label():
+    lod = LevelOfDetail()
+    props = dict(ShapeFactory.create_shape('rectangle').draw(), has_shadow=True, text='note')
+    full = lod.primitives(props)
+    small = lod.primitives(dict(props, width=10, height=10))
+    assert 'text' in kinds(full) and len(full) > len(small)
+    assert kinds(small) == ['rectangle']
+
+
+def test_view_simplifies_text_when_zoomed_out(controller):
+    view = controller.canvas_view
+    shape = text_shape(100, 100)
+    controller.canvas.load_shapes([shape])
+    controller.scheduler.flush()
+    assert item_kinds(view, shape) == ['text']
+    view.set_zoom(0.25)
+    controller.scheduler.flush()
+    assert item_kinds(view, shape) == ['rectangle']
+    view.lod.enabled = False
+    view.set_zoom(0.3)
+    controller.scheduler.flush()
+    assert item_kinds(view, shape) == ['text']
+
+
+def test_tiny_shapes_are_clustered(controller):
+    view = controller.canvas_view
+    shapes = []
+    for i in range(8):
+        shape = ShapeFactory.create_shape('rectangle')
+        shape.x, shape.y, shape.width, shape.height = 1000 + i * 4, 1000, 2, 2
+        shapes.append(shape)
+    controller.canvas.load_shapes(shapes)
+    view.set_zoom(0.1)
+    controller.scheduler.flush()
+    assert len(view.find_withtag('lod_cluster')) == 1
+    assert not any(shape.id in view.shape_items for shape in shapes)
+
+    # 선택한 도형은 묶지 않고 따로 그림
+    controller.canvas.select_shapes([shapes[0]])
+    controller.scheduler.flush()
+    assert shapes[0].id in view.shape_items
+    view.set_zoom(0.12)  # 전체 다시 그리기
+    controller.scheduler.flush()
+    assert len(view.find_withtag('lod_cluster')) == 1
+    assert shapes[0].id in view.shape_items and shapes[1].id not in view.shape_items
@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import pytest
+
+from tests.helpers import Recorder, make_shapes
+
+
+def event(x, y):
+    return SimpleNamespace(x=x, y=y, state=0)
+
+
+def drag(view, start, end, additive=False):
+    """select 모드에서 start부터 end까지 러버밴드 드래그"""
+    if additive:
+        view.on_multi_select(event(*start))
+    else:
+        view.on_click(event(*start))
+    view.on_drag(event((start[0] + end[0]) // 2, (start[1] + end[1]) // 2))
+    view.on_drag(event(*end))
+    view.on_release(event(*end))
+
+
+@pytest.fixture
+def board(controller):
+    """(10, 10)부터 대각선으로 30씩 떨어진 20x20 사각형 다섯 개"""
+    shapes = make_shapes(5)
+    for i, shape in enumerate(shapes):
+        shape.x = shape.y = 10 + i * 30
+        shape.width = shape.height = 20
+    controller.canvas.load_shapes(shapes)
+    controller.canvas_view.set_shape_type('select')
+    controller.scheduler.flush()
+    return shapes
+
+
+def selected(controller):
+    return sorted(controller.canvas.selection, key=controller.canvas.shapes.key)
+
+
+def test_drag_right_selects_contained_shapes(controller, board):
+    drag(controller.canvas_view, (0, 0), (75, 75))
+    assert selected(controller) == board[:2]  # 세 번째 도형은 걸치기만 함
+
+
+def test_drag_left_selects_touched_shapes(controller, board):
+    drag(controller.canvas_view, (95, 75), (0, 0))
+    assert selected(controller) == board[:3]
+
+
+def test_additive_drag_extends_selection(controller, board):
+    view = controller.canvas_view
+    drag(view, (0, 0), (35, 35))
+    drag(view, (95, 95), (155, 155), additive=True)
+    assert selected(controller) == [board[0], board[3], board[4]]
+
+
+def test_marquee_selects_whole_groups(controller, board):
+    group = controller.canvas.group_shapes([board[0], board[4]])
+    drag(controller.canvas_view, (35, 0), (0, 35))
+    assert selected(controller) == group.leaves()
+
+
+def test_selection_is_one_change_notification(controller, board):
+    recorder = Recorder(controller.canvas)
+    drag(controller.canvas_view, (0, 0), (155, 155))
+    assert recorder.diffs() == [({s.id for s in board}, set())]
+
+
+def test_preview_is_computed_once_per_frame(controller, board, monkeypatch):
+    view = controller.canvas_view
+    queries = []
+    components_in_rect = controller.canvas.components_in_rect
+    monkeypatch.setattr(controller.canvas, 'components_in_rect',
+                        lambda *args: queries.append(args) or components_in_rect(*args))
+    view.on_click(event(0, 0))
+    for x in range(10, 80, 5):
+        view.on_drag(event(x, x))
+    assert queries == []  # 드래그 중에는 프레임에서만 계산
+    controller.scheduler.flush()
+    assert len(queries) == 1
+    assert set(view._preview_items) == {s.id for s in board[:2]}
+    view.on_release(event(75, 75))
+    assert view._preview_items == {}
+    assert not view.find_withtag('marquee')
@@ -0,0 +1,83 @@
+import io
+
+import pytest
+
+from model.shape_factory import ShapeFactory
+from model.shapes.image import Image
+from model.shapes.text import Text
+from view import raster
+from view.raster import render_png, render_tiles
+
+PIL = pytest.importorskip('PIL.Image')
+
+
+def rect(x, y, width, height, fill='red'):
+    shape = ShapeFactory.create_shape('rectangle')
+    shape.x, shape.y, shape.width, shape.height = x, y, width, height
+    shape.fill = fill
+    return shape
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / 'pixel.png'
+    PIL.new('RGB', (8, 8), (0, 128, 255)).save(path)
+    return str(path)
+
+
+def test_images_decoded_only_for_overlapping_tiles(image_path, monkeypatch):
+    decoded = []
+    load_image = raster.load_image
+
+    def counting_load_image(path, width, height):
+        decoded.append(path)
+        return load_image(path, width, height)
+
+    monkeypatch.setattr(raster, 'load_image', counting_load_image)
+    shapes = [rect(0, 0, 400, 400), Image(320, 320, image_path, 50, 50)]
+    tiles = render_tiles(shapes, tile_size=100, region=(0, 0, 400, 400))
+    next(tiles)
+    # 첫 타일을 그릴 때는 마지막 타일의 이미지를 아직 디코딩하지 않는다
+    assert decoded == []
+    assert len(list(tiles)) == 15
+    assert decoded == [image_path]
+
+
+def test_tiles_match_full_render(image_path):
+    shapes = [rect(10, 10, 150, 60), rect(120, 90, 70, 70, fill='green'),
+              Image(60, 40, image_path, 80, 80)]
+    region = (0, 0, 200, 200)
+    full = PIL.open(io.BytesIO(render_png(shapes, region=region))).convert('RGB')
+    for row, column, data in render_tiles(shapes, tile_size=64, region=region):
+        tile = PIL.open(io.BytesIO(data)).convert('RGB')
+        box = (column * 64, row * 64, column * 64 + tile.width, row * 64 + tile.height)
+        assert tile.tobytes() == full.crop(box).tobytes(), (row, column)
+
+
+def test_empty_page_yields_one_tile():
+    tiles = list(render_tiles([]))
+    assert [(row, column) for row, column, _ in tiles] == [(0, 0)]
+
+
+def test_text_is_culled_by_its_estimated_extent(monkeypatch):
+    drawn = []
+    render_primitives = raster._render_primitives
+
+    def recording(shapes, scale, pillow):
+        drawn.append([shape.text for shape in shapes])
+        return render_primitives(shapes, scale, pillow)
+
+    monkeypatch.setattr(raster, '_render_primitives', recording)
+    near = Text(10, 10, "overflowing label " * 4)  # 상자(100x30)보다 긴 텍스트
+    far = Text(310, 310, "far")
+    list(render_tiles([near, far], tile_size=100, region=(0, 0, 400, 400)))
+    first_row = drawn[:4]
+    assert all(near.text in texts for texts in first_row)
+    assert all(far.text not in texts for texts in first_row)
+    assert drawn[-1] == [far.text]
+
+
+def test_default_region_covers_overflowing_text():
+    label = Text(0, 0, "a label much wider than its box")
+    (_, _, data), = render_tiles([label])
+    assert PIL.open(io.BytesIO(data)).width > 200
@@ -0,0 +1,81 @@
+from controller.redraw_scheduler import RedrawScheduler
+from model.change_events import ChangeKind, ChangeSet
+from tests.helpers import FakeWidget, make_shapes
+
+
+def changes(*ids):
+    change_set = ChangeSet()
+    change_set.add(ChangeKind.PROPERTY_CHANGED, list(ids))
+    return change_set
+
+
+def test_requests_coalesce_into_one_frame():
+    widget = FakeWidget()
+    rendered = []
+    scheduler = RedrawScheduler(widget, lambda dx, dy: None, rendered.append)
+    scheduler.request(changes('a'))
+    scheduler.request(changes('b'))
+    widget.run_pending()
+    assert len(rendered) == 1
+    assert scheduler.coalesced_events == 1
+    assert not widget.callbacks
+
+
+def test_request_during_render_schedules_next_frame():
+    widget = FakeWidget()
+    rendered = []
+
+    def render(change_set):
+        rendered.append(change_set)
+        if len(rendered) == 1:
+            scheduler.request(changes('late'))
+
+    scheduler = RedrawScheduler(widget, lambda dx, dy: None, render)
+    scheduler.request(changes('a'))
+    widget.run_pending()
+    assert len(rendered) == 1
+    assert widget.callbacks, "request made while rendering must schedule a frame"
+    widget.run_pending()
+    assert len(rendered) == 2
+    assert scheduler.pending_changes is None
+    assert not widget.callbacks
+
+
+def test_move_during_render_is_applied_next_frame():
+    widget = FakeWidget()
+    moves = []
+
+    def render(change_set):
+        if not moves:
+            scheduler.add_move(3, 4)
+
+    scheduler = RedrawScheduler(widget, lambda dx, dy: moves.append((dx, dy)), render)
+    scheduler.request()
+    widget.run_pending()
+    widget.run_pending()
+    assert moves == [(3, 4)]
+
+
+def test_move_only_frames_are_counted_and_paced():
+    widget = FakeWidget()
+    moves = []
+    scheduler = RedrawScheduler(widget, lambda dx, dy: moves.append((dx, dy)), lambda changes: None)
+    scheduler.add_move(1, 0)
+    widget.run_pending()
+    assert scheduler.frames == 1 and moves == [(1, 0)]
+    # 방금 프레임을 처리했으므로 다음 이동은 idle이 아니라 프레임 간격 뒤로 예약
+    scheduler.add_move(2, 0)
+    assert widget.idle_calls == 1
+    widget.run_pending()
+    assert scheduler.frames == 2 and moves == [(1, 0), (2, 0)]
+
+
+def test_drag_frames_are_recorded(controller):
+    shape, = make_shapes(1)
+    controller.canvas.add_shape(shape)
+    controller.canvas.select_shapes([shape])
+    controller.scheduler.flush()
+    instrumentation = controller.enable_instrumentation()
+    controller.on_shape_drag(3, 2)
+    controller.scheduler.flush()
+    assert [event[0] for event in instrumentation.events].count('frame') == 1
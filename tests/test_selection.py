@@ -0,0 +1,87 @@
+import pytest
+
+from model.change_events import ChangeKind, ChangeSet
+from model.selection import Selection
+from tests.helpers import Recorder, make_shapes
+
+
+def ids(shapes):
+    return {shape.id for shape in shapes}
+
+
+def test_selection_set_operations():
+    a, b, c = make_shapes(3)
+    selection = Selection()
+    assert selection.add([a, b, a]) == [a, b]
+    assert selection.add([b]) == []
+    assert a in selection and c not in selection
+    assert list(selection) == [a, b] and a.selected and b.selected
+    assert selection.replace([c, b]) == ([c], [a])
+    assert not a.selected and list(selection) == [c, b]
+    assert selection.discard([a, c]) == [c]
+    assert selection.first() is b
+    assert selection.clear() == [b]
+    assert not selection and not b.selected
+
+
+def test_contains_checks_identity():
+    a, = make_shapes(1)
+    selection = Selection()
+    selection.add([a])
+    copy = type(a).__new__(type(a))
+    copy.id = a.id
+    assert copy not in selection
+    assert selection.get(a.id) is a
+
+
+def test_canvas_reports_only_selection_changes(canvas):
+    a, b, c = shapes = make_shapes(3)
+    canvas.add_shapes(shapes)
+    recorder = Recorder(canvas)
+    canvas.select_shapes([a, b])
+    canvas.select_shapes([b, c])
+    canvas.select_shapes([c, b])  # 바뀐 게 없으면 알리지 않음
+    canvas.toggle_selection(a)
+    canvas.remove_from_selection([a, b])
+    assert recorder.diffs() == [
+        (ids([a, b]), set()),
+        (ids([c]), ids([a])),
+        (ids([a]), set()),
+        (set(), ids([a, b])),
+    ]
+    assert canvas.selected_shapes == [c]
+
+
+def test_select_all_invert_and_by_type(canvas):
+    rectangles = make_shapes(2)
+    lines = make_shapes(2, kind='line')
+    canvas.add_shapes(rectangles + lines)
+    recorder = Recorder(canvas)
+    canvas.select_by_type('line')
+    assert ids(canvas.selected_shapes) == ids(lines)
+    canvas.invert_selection()
+    assert ids(canvas.selected_shapes) == ids(rectangles)
+    canvas.select_by_type('line', extend=True)
+    canvas.select_all()  # 이미 모두 선택됨
+    assert recorder.diffs() == [(ids(lines), set()), (ids(rectangles), ids(lines)),
+                                (ids(lines), set())]
+    with pytest.raises(ValueError):
+        canvas.select_by_type('hexagon')
+
+
+def test_removed_shapes_leave_selection(canvas):
+    a, b = make_shapes(2)
+    canvas.add_shapes([a, b])
+    canvas.select_shapes([a, b])
+    recorder = Recorder(canvas)
+    canvas.remove_shape(a)
+    assert canvas.selected_shapes == [b]
+    assert recorder.diffs() == [(set(), ids([a]))]
+
+
+def test_selection_diff_cancels_select_then_deselect():
+    changes = ChangeSet()
+    changes.add(ChangeKind.SELECTED, ['a', 'b'])
+    changes.add(ChangeKind.DESELECTED, ['a', 'c'])
+    changes.add(ChangeKind.SELECTED, ['c'])
+    assert changes.selection_diff() == ({'b'}, set())
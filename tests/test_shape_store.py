@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from model import geometry
+from model.geometry import ShapeGeometry
+from model.shape_store import ShapeStore
+from model.shapes.line import Line
+from tests.helpers import make_shapes
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(geometry, 'np', None)
+    return request.param
+
+
+def snapshot(shape):
+    names = ('x', 'y', 'width', 'height', 'z_order', 'has_frame', 'has_shadow',
+             'selected', 'fill', 'outline')
+    if isinstance(shape, Line):
+        names += ('x2', 'y2')
+    return {name: getattr(shape, name) for name in names}
+
+
+def test_attached_shapes_read_and_write_columns():
+    a, b = make_shapes(2, kind='line')
+    a.x2, a.y2, a.fill = 40, -30, 'red'
+    before = snapshot(a)
+    store = ShapeStore()
+    store.attach(a)
+    store.attach(b)
+    assert isinstance(a, Line) and snapshot(a) == before
+    a.move(5, 5)
+    a.selected = True
+    assert store.columns['x'][a._row] == 5
+    assert store.columns['x2'][a._row] == 40
+    assert store.columns['flags'][a._row] & 4
+    store.detach(a)
+    assert type(a) is Line and a._store is None
+    assert snapshot(a) == dict(before, x=5, y=5, selected=True)
+    assert len(store) == 1
+
+
+def test_canvas_with_store_keeps_line_bounds(canvas, backend):
+    rng = random.Random(3)
+    shapes = make_shapes(60, kind=['rectangle', 'ellipse', 'line'], rng=rng, z_orders=3)
+    for shape in shapes:
+        if isinstance(shape, Line):
+            shape.x2, shape.y2 = rng.randint(-400, 400), rng.randint(-400, 400)
+    canvas.add_shapes(shapes)
+    expected = canvas.get_bounds()
+    canvas.use_shape_store()
+    assert canvas.get_bounds() == expected
+    assert canvas.get_bounds() == ShapeGeometry.from_shapes(shapes).bounds()
+    # 제거된 row는 bounds에서 빠지고 재사용된다
+    canvas.remove_shapes(shapes[:10])
+    assert canvas.get_bounds() == ShapeGeometry.from_shapes(shapes[10:]).bounds()
+    canvas.add_shapes(shapes[:10])
+    assert len(canvas.shape_store.rows) == len(shapes)
+    assert canvas.get_bounds() == expected
+
+
+def test_store_toggle_preserves_shapes(canvas):
+    shapes = make_shapes(5, kind='line')
+    canvas.add_shapes(shapes)
+    canvas.select_shapes(shapes[:2])
+    before = [snapshot(s) for s in canvas.get_shapes()]
+    canvas.use_shape_store()
+    assert [snapshot(s) for s in canvas.get_shapes()] == before
+    canvas.use_shape_store(False)
+    assert all(type(s) is Line for s in shapes)
+    assert [snapshot(s) for s in canvas.get_shapes()] == before
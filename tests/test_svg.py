@@ -0,0 +1,116 @@
+import io
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from model.shape_factory import ShapeFactory
+from model.shapes.image import Image
+from view.svg import SvgWriter, export_svg, write_svg
+
+SVG = '{http://www.w3.org/2000/svg}'
+XLINK = '{http://www.w3.org/1999/xlink}href'
+
+
+def rect(x, y, fill='red'):
+    shape = ShapeFactory.create_shape('rectangle')
+    shape.x, shape.y, shape.width, shape.height = x, y, 20, 10
+    shape.fill = fill
+    return shape
+
+
+def render(shapes, **options):
+    out = io.BytesIO()
+    write_svg(shapes, out, **options)
+    return ET.fromstring(out.getvalue())
+
+
+def shape_elements(root):
+    """배경과 style, symbol을 뺀 도형 요소"""
+    return [e for e in root if e.tag not in (SVG + 'style', SVG + 'symbol')][1:]
+
+
+@pytest.fixture
+def image_files(tmp_path):
+    """내용이 같은 이미지 파일 두 개와 다른 파일 하나"""
+    paths = [str(tmp_path / name) for name in ('a.png', 'b.png', 'c.png')]
+    for path, data in zip(paths, [b'same', b'same', b'other']):
+        with open(path, 'wb') as f:
+            f.write(data)
+    return paths
+
+
+def test_elements_follow_z_order():
+    shapes = [rect(0, 0), rect(30, 0), rect(60, 0)]
+    rects = shape_elements(render(shapes))
+    assert [float(e.get('x')) for e in rects] == [0, 30, 60]
+
+
+def test_identical_styles_share_one_class():
+    root = render([rect(i * 30, 0) for i in range(10)] + [rect(0, 30, fill='blue')])
+    classes = {e.get('class') for e in shape_elements(root)}
+    assert len(classes) == 2
+    style = root.find(SVG + 'style').text
+    assert style.count('{') == 2
+
+
+def test_images_are_embedded_once_per_content(image_files):
+    shapes = [Image(i * 60, 0, path, 50, 50) for i, path in enumerate(image_files)]
+    root = render(shapes)
+    symbols = root.findall(SVG + 'symbol')
+    uses = root.findall(SVG + 'use')
+    assert len(symbols) == 2 and len(uses) == 3
+    assert uses[0].get(XLINK) == uses[1].get(XLINK) != uses[2].get(XLINK)
+
+
+def test_linked_images_are_copied_once(image_files, tmp_path):
+    asset_dir = str(tmp_path / 'out_assets')
+    shapes = [Image(i * 60, 0, path, 50, 50) for i, path in enumerate(image_files)]
+    root = render(shapes, images='link', asset_dir=asset_dir)
+    hrefs = [e.get(XLINK) for e in root.findall(SVG + 'image')]
+    assert len(hrefs) == 3 and hrefs[0] == hrefs[1]
+    assert all(href.startswith('out_assets/') for href in hrefs)
+    assert len(os.listdir(asset_dir)) == 2
+
+
+def test_view_box_is_filled_in_after_the_last_shape():
+    root = render([rect(100, 50), rect(300, 200)], background='')
+    x, y, width, height = map(float, root.get('viewBox').split())
+    assert x <= 100 and y <= 50 and x + width >= 320 and y + height >= 210
+    assert (float(root.get('width')), float(root.get('height'))) == (width, height)
+
+
+def test_unseekable_output_needs_a_region():
+    class Pipe(io.BytesIO):
+        def seekable(self):
+            return False
+
+    with pytest.raises(ValueError):
+        SvgWriter(Pipe())
+    out = Pipe()
+    write_svg([rect(0, 0)], out, region=(0, 0, 100, 100))
+    assert ET.fromstring(out.getvalue()).get('viewBox') == '0 0 100 100'
+
+
+def test_output_is_streamed_in_chunks():
+    writes = []
+
+    class Recording(io.BytesIO):
+        def write(self, data):
+            writes.append(len(data))
+            return super().write(data)
+
+    out = Recording()
+    writer = SvgWriter(out, chunk_size=1024)
+    for i in range(500):
+        writer.create_rectangle(i, 0, i + 10, 10, fill='red')
+    assert len(writes) > 5 and max(writes) < 2048  # 끝나기 전에 나누어 씀
+    writer.close()
+    assert len(shape_elements(ET.fromstring(out.getvalue()))) == 500
+
+
+def test_export_svg_writes_the_whole_canvas(canvas, tmp_path):
+    canvas.add_shapes([rect(0, 0), rect(40, 0, fill='green')])
+    path = str(tmp_path / 'out.svg')
+    export_svg(canvas, path)
+    assert len(shape_elements(ET.parse(path).getroot())) == 2
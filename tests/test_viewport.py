@@ -0,0 +1,94 @@
+from tests.helpers import make_shapes
+
+
+def row_of_shapes(controller, count=40, spacing=200):
+    """x축으로 spacing 간격으로 놓인 도형 (화면 800x600에는 일부만 보임)"""
+    shapes = make_shapes(count)
+    for i, shape in enumerate(shapes):
+        shape.x, shape.y = i * spacing, 100
+    controller.canvas.load_shapes(shapes)
+    controller.scheduler.flush()
+    return shapes
+
+
+def drawn(view, shapes):
+    return [shape for shape in shapes if shape.id in view.shape_items]
+
+
+def in_region(shape, region):
+    x1, y1, x2, y2 = region
+    return (shape.x <= x2 and x1 <= shape.x + shape.width
+            and shape.y <= y2 and y1 <= shape.y + shape.height)
+
+
+def test_only_shapes_near_the_viewport_have_items(controller):
+    view = controller.canvas_view
+    shapes = row_of_shapes(controller)
+    region = view.culling_region()
+    assert drawn(view, shapes) == [s for s in shapes if in_region(s, region)]
+    assert len(drawn(view, shapes)) < len(shapes)
+
+
+def test_scrolling_within_the_margin_does_not_redraw(controller):
+    view = controller.canvas_view
+    shapes = row_of_shapes(controller)
+    items = view.calls['create_rectangle']
+    view.xview_scroll(5, 'units')  # 100 px
+    view._viewport_changed()
+    assert not controller._viewport_dirty
+    assert view.calls['create_rectangle'] == items
+
+    view.xview_scroll(100, 'units')
+    view._viewport_changed()
+    controller.scheduler.flush()
+    region = view.culling_region()
+    assert drawn(view, shapes) == [s for s in shapes if in_region(s, region)]
+    assert shapes[0] not in drawn(view, shapes)
+
+
+def test_offscreen_changes_create_no_items(controller):
+    view = controller.canvas_view
+    shapes = row_of_shapes(controller)
+    far = shapes[-1]
+    before = view.calls.copy()
+    controller.canvas.select_shapes([far])
+    far.move(10, 0)
+    controller.canvas.notify_observers()
+    controller.scheduler.flush()
+    assert far.id not in view.shape_items
+    assert all(view.calls[name] == before[name]
+               for name in ('create_rectangle', 'coords', 'itemconfigure', 'delete'))
+
+    far.move(-far.x + 20, 0)  # 화면 안으로
+    controller.canvas.notify_observers()
+    controller.scheduler.flush()
+    assert far.id in view.shape_items
+
+
+def test_zoom_keeps_the_anchor_point_and_scales_items(controller):
+    view = controller.canvas_view
+    shape = row_of_shapes(controller, count=1)[0]
+    anchor = (300, 200)
+    model_point = (view.canvasx(anchor[0]) / view.zoom, view.canvasy(anchor[1]) / view.zoom)
+    view.set_zoom(2.0, anchor)
+    controller.scheduler.flush()
+    assert (view.canvasx(anchor[0]) / 2, view.canvasy(anchor[1]) / 2) == model_point
+    _, item = view.shape_items[shape.id][-1]
+    x1, y1, x2, y2 = view.coords(item)
+    assert (x2 - x1, y2 - y1) == (shape.width * 2, shape.height * 2)
+
+
+def test_zoom_is_clamped(controller):
+    view = controller.canvas_view
+    view.set_zoom(1000)
+    assert view.zoom == view.MAX_ZOOM
+    view.set_zoom(0)
+    assert view.zoom == view.MIN_ZOOM
+
+
+def test_scroll_region_covers_content(controller):
+    view = controller.canvas_view
+    row_of_shapes(controller)
+    x1, y1, x2, y2 = view.options['scrollregion']
+    left, top, right, bottom = controller.canvas.get_bounds()
+    assert x1 <= left and y1 <= top and x2 >= right and y2 >= bottom
@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from model.z_order import BULK_THRESHOLD, ZOrderList
+from tests.helpers import make_shapes
+
+
+def check_invariants(z_list):
+    keys = [z_list.key(shape) for shape in z_list]
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+    assert [key[0] for key in keys] == [shape.z_order for shape in z_list]
+    for index, shape in enumerate(z_list):
+        assert z_list.index(shape) == index
+        assert z_list.get(shape.id) is shape
+
+
+def test_add_keeps_z_order_then_insertion_order():
+    z_list = ZOrderList()
+    shapes = make_shapes(6)
+    for shape, z_order in zip(shapes, [2, 0, 1, 0, 2, 1]):
+        shape.z_order = z_order
+        z_list.add(shape)
+    check_invariants(z_list)
+    assert list(z_list) == [shapes[i] for i in (1, 3, 2, 5, 0, 4)]
+
+
+def test_reset_is_stable_and_reposition_puts_shape_on_top():
+    shapes = make_shapes(5)
+    for shape, z_order in zip(shapes, [1, 0, 1, 0, 1]):
+        shape.z_order = z_order
+    z_list = ZOrderList()
+    z_list.reset(shapes)
+    assert list(z_list) == [shapes[i] for i in (1, 3, 0, 2, 4)]
+    shapes[4].z_order = 0
+    z_list.reposition(shapes[4])
+    check_invariants(z_list)
+    assert list(z_list) == [shapes[i] for i in (1, 3, 4, 0, 2)]
+
+
+@pytest.mark.parametrize('count', [5, BULK_THRESHOLD * 2])
+def test_move_to_front_and_back(count):
+    shapes = make_shapes(count)
+    z_list = ZOrderList()
+    z_list.reset(shapes)
+    moving = shapes[1:count:2]
+    z_list.move_to_front(moving)
+    check_invariants(z_list)
+    rest = [s for s in shapes if s not in moving]
+    assert list(z_list) == rest + moving
+    z_list.move_to_back(moving)
+    check_invariants(z_list)
+    assert list(z_list) == moving[::-1] + rest
+
+
+def test_add_many_with_reserved_seqs_interleaves():
+    shapes = make_shapes(6)
+    z_list = ZOrderList()
+    first = z_list.reserve(6)
+    z_list.add_many(shapes[3:], [first + 3, first + 4, first + 5])
+    z_list.add_many(shapes[:3], [first, first + 1, first + 2])
+    check_invariants(z_list)
+    assert list(z_list) == shapes
+
+
+def test_place_between_equal_z_orders():
+    shapes = make_shapes(3)
+    z_list = ZOrderList()
+    z_list.reset(shapes)
+    z_list.place(shapes[2], 0, shapes[0])
+    check_invariants(z_list)
+    assert list(z_list) == [shapes[0], shapes[2], shapes[1]]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_canvas_reorders_match_reference(canvas, seed):
+    """무작위 z-order 연산 결과를 단순 리스트로 계산한 기대값과 비교"""
+    rng = random.Random(seed)
+    shapes = make_shapes(40, rng=rng, z_orders=4)
+    canvas.add_shapes(shapes)
+    expected = sorted(shapes, key=lambda s: s.z_order)
+    for _ in range(200):
+        picked = rng.sample(expected, rng.randint(1, 5))
+        operation = rng.choice(['bring_to_front', 'send_to_back', 'bring_forward', 'send_backward'])
+        getattr(canvas, operation)(picked)
+        ids = {s.id for s in picked}
+        if operation == 'bring_to_front':
+            expected = [s for s in expected if s.id not in ids] + picked
+        elif operation == 'send_to_back':
+            expected = picked[::-1] + [s for s in expected if s.id not in ids]
+        elif operation == 'bring_forward':
+            for i in sorted((expected.index(s) for s in picked), reverse=True):
+                if i < len(expected) - 1 and expected[i + 1].id not in ids:
+                    expected[i], expected[i + 1] = expected[i + 1], expected[i]
+        else:
+            for i in sorted(expected.index(s) for s in picked):
+                if i > 0 and expected[i - 1].id not in ids:
+                    expected[i], expected[i - 1] = expected[i - 1], expected[i]
+        assert canvas.get_shapes() == expected, operation
+        check_invariants(canvas.shapes)
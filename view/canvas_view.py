@@ -1,16 +1,33 @@
 import tkinter as tk
 from tkinter import PhotoImage, filedialog, simpledialog
 from typing import Callable, Optional, Tuple, List
-import os
 from model.shape_composite import ShapeComponent, ShapeGroup
+from .image_cache import ImageCache, decode_pixels
+from .image_loader import ImageLoader
+from .level_of_detail import LevelOfDetail
+from .primitives import shape_primitives
 
 class CanvasView(tk.Canvas):
-    def __init__(self, master):
+    MIN_ZOOM = 0.05
+    MAX_ZOOM = 8.0
+    ZOOM_STEP = 1.25
+    # Screen pixels around the visible area that get items too, so small pans
+    # do not have to materialize anything
+    CULL_MARGIN = 256
+    
+    def __init__(self, master, image_cache_bytes=128 * 1024 * 1024):
         super().__init__(master, bg='white')
+        self.configure(xscrollincrement=20, yscrollincrement=20)
         self.bind('<Button-1>', self.on_click)
         self.bind('<B1-Motion>', self.on_drag)
         self.bind('<ButtonRelease-1>', self.on_release)
         self.bind('<Control-Button-1>', self.on_multi_select)
+        self.bind('<MouseWheel>', self.on_mouse_wheel)
+        self.bind('<Button-4>', self.on_mouse_wheel)
+        self.bind('<Button-5>', self.on_mouse_wheel)
+        self.bind('<ButtonPress-2>', self.on_pan_start)
+        self.bind('<B2-Motion>', self.on_pan)
+        self.bind('<Configure>', lambda event: self._viewport_changed())
         
         self.start_x = None
         self.start_y = None
@@ -21,85 +38,32 @@ class CanvasView(tk.Canvas):
         self.drag_start_x = None
         self.drag_start_y = None
         self.shape_drag_callback = None
+        self.shape_drag_end_callback = None
+        self.marquee_start = None  # model point where a rubber-band selection started
+        self.marquee_additive = False  # Ctrl held: add to the selection instead of replacing it
+        self.marquee_callback = None
+        self.marquee_end_callback = None
+        self._preview_items = {}  # shape id -> outline item previewing the marquee selection
         
         self.shape_selected_callback = None
         self.shape_created_callback = None
-        self.images = {}  # Store PhotoImage objects
-        self.selected_group = ShapeGroup()  # Track selected shapes as a group
-    
-    def prompt_for_image(self):
-        file_path = filedialog.askopenfilename(
-            filetypes=[("Image files", "*.png *.jpg *.jpeg *.gif *.bmp")]
-        )
-        if file_path:
-            try:
-                # Store the PhotoImage in self.images
-                self.images[file_path] = PhotoImage(file=file_path)
-                return file_path
-            except Exception as e:
-                print(f"Error loading image {file_path}: {e}")
-                return None
-        return None
-    
-    def _draw_shadow(self, props, shape_type='rectangle'):
+        self.viewport_changed_callback = None
         
-        shadow_color = 'gray'
-        shadow_steps = 0
-        
-        for i in range(shadow_steps):
-            alpha = 0.3 - (i * 0.1)  # Decreasing opacity
-            if shape_type == 'ellipse':
-                self.create_oval(
-                    props['x'] + i,
-                    props['y'] + i,
-                    props['x'] + props['width'] + i,
-                    props['y'] + props['height'] + i,
-                    fill=shadow_color,
-                    stipple='gray50',
-                    tags=('shadow',)
-                )
-            else: 
-                self.create_rectangle(
-                    props['x'] + i,
-                    props['y'] + i,
-                    props['x'] + props['width'] + i,
-                    props['y'] + props['height'] + i,
-                    fill=shadow_color,
-                    stipple='gray50',
-                    tags=('shadow',)
-                )
+        # View transform: canvas coordinates are model coordinates * zoom
+        self.zoom = 1.0
+        self.render_region = None  # model rect whose shapes have items (None: no culling)
+        self._content_bounds = (0, 0, 0, 0)  # model bounds the scroll region covers
+        self.lod = LevelOfDetail()  # simplification thresholds when zoomed out
+        self._clusters = {}  # cluster item id -> ids of the tiny shapes it stands for
+        self._clustered = {}  # shape id -> cluster item id
+        # PhotoImages decoded at display size, off the Tk thread
+        self.image_cache = ImageCache(image_cache_bytes, ImageLoader(self, decode_pixels))
+        self.shape_items = {}  # shape id -> [(item kind, Tk item id), ...]
+        self.shape_props = {}  # shape id -> draw() props the items were built from
+        self._render_order = []  # shape ids in the stacking order last rendered
+        self._selected_ids = set()  # shape ids whose items carry the 'selected' tag
+        self.selected_group = ShapeGroup()  # Track selected shapes as a group
     
-    def _draw_image(self, props):
-        image_path = props['image_path']
-        if image_path and os.path.exists(image_path):
-            if image_path not in self.images:
-                try:
-                    self.images[image_path] = PhotoImage(file=image_path)
-                except Exception as e:
-                    print(f"Error loading image {image_path}: {e}")
-                    return
-            
-            if props['has_shadow']:
-                self._draw_shadow(props, 'image')
-            
-            try:
-                self.create_image(
-                    props['x'], props['y'],
-                    image=self.images[image_path],
-                    anchor='nw'
-                )
-            except Exception as e:
-                print(f"Error drawing image {image_path}: {e}")
-            
-            if props['has_frame']:
-                self.create_rectangle(
-                    props['x'], props['y'],
-                    props['x'] + props['width'],
-                    props['y'] + props['height'],
-                    outline='black',
-                    width=2
-                )
-        
     def set_shape_type(self, shape_type: str):
         self.current_shape_type = shape_type
         if shape_type == "text":
@@ -109,43 +73,51 @@ class CanvasView(tk.Canvas):
     
     def prompt_for_image(self):
         file_path = filedialog.askopenfilename(
-            filetypes=[("Image files", "*.png *.jpg *.gif *.bmp")]
+            filetypes=[("Image files", "*.png *.jpg *.jpeg *.gif *.bmp")]
         )
         if file_path:
-            if file_path not in self.images:
-                try:
-                    self.images[file_path] = PhotoImage(file=file_path)
-                    return file_path
-                except:
-                    return None
+            # Start decoding at the default shape size; the shape shows a
+            # placeholder until the image is ready
+            self.image_cache.prefetch(file_path, 200, 200)
+            return file_path
+        return None
     
     def prompt_for_text(self):
         return simpledialog.askstring("Input", "Enter text:")
 
+    def event_point(self, event):
+        """Model coordinates (rounded to whole units) of a mouse event."""
+        return (round(self.canvasx(event.x) / self.zoom),
+                round(self.canvasy(event.y) / self.zoom))
+    
     def on_click(self, event):
+        x, y = self.event_point(event)
         # In select mode, only handle selection and dragging
         if self.current_shape_type == "select":
             if self.shape_selected_callback:
-                result = self.shape_selected_callback(event.x, event.y, check_only=True)
+                result = self.shape_selected_callback(x, y, check_only=True)
                 if result and result.get('is_selected', False):
                     # If clicking on a selected shape, start dragging
                     self.dragging_shape = True
-                    self.drag_start_x = event.x
-                    self.drag_start_y = event.y
+                    self.drag_start_x = x
+                    self.drag_start_y = y
                 else:
                     # Just select the shape
                     if not self.multi_select_mode:
                         self.selected_group.deselect()  # Clear previous selection
-                    self.shape_selected_callback(event.x, event.y)
+                    self.shape_selected_callback(x, y)
+                    if result is not None and result.get('shape') is None:
+                        # Pressed on empty space: start a rubber-band selection
+                        self._start_marquee(x, y, additive=False)
             return
 
         # For other modes, check if we're clicking on a selected shape first
         if self.shape_selected_callback:
-            result = self.shape_selected_callback(event.x, event.y, check_only=True)
+            result = self.shape_selected_callback(x, y, check_only=True)
             if result and result.get('is_selected', False):
                 self.dragging_shape = True
-                self.drag_start_x = event.x
-                self.drag_start_y = event.y
+                self.drag_start_x = x
+                self.drag_start_y = y
                 return
 
         # Create new shapes only if not in select mode and not clicking on existing shapes
@@ -153,34 +125,44 @@ class CanvasView(tk.Canvas):
             user_text = self.prompt_for_text()
             if user_text and self.shape_created_callback:
                 self.shape_created_callback(
-                    event.x, event.y, 100, 30, 'text',
+                    x, y, 100, 30, 'text',
                     {'text': user_text}
                 )
         elif self.current_shape_type == "image":
             file_path = self.prompt_for_image()
             if file_path and self.shape_created_callback:
                 self.shape_created_callback(
-                    event.x, event.y, 200, 200, 'image',
+                    x, y, 200, 200, 'image',
                     {'image_path': file_path}
                 )
         else:
-            self.start_x = event.x
-            self.start_y = event.y
+            self.start_x = x
+            self.start_y = y
 
     def on_multi_select(self, event):
         self.multi_select_mode = True
         if self.shape_selected_callback:
-            self.shape_selected_callback(event.x, event.y, multi_select=True)
+            x, y = self.event_point(event)
+            self.shape_selected_callback(x, y, multi_select=True)
+            if self.current_shape_type == "select":
+                result = self.shape_selected_callback(x, y, check_only=True)
+                if result is not None and result.get('shape') is None:
+                    self._start_marquee(x, y, additive=True)
     
     def on_drag(self, event):
-        if self.dragging_shape:
+        x, y = self.event_point(event)
+        if self.marquee_start is not None:
+            self._update_marquee(x, y)
+        elif self.dragging_shape:
             # Calculate the delta movement
-            dx = event.x - self.drag_start_x
-            dy = event.y - self.drag_start_y
+            dx = x - self.drag_start_x
+            dy = y - self.drag_start_y
+            if not (dx or dy):
+                return
             
             # Update the drag start position for the next movement
-            self.drag_start_x = event.x
-            self.drag_start_y = event.y
+            self.drag_start_x = x
+            self.drag_start_y = y
             
             # Move all selected shapes
             self.selected_group.move(dx, dy)
@@ -190,37 +172,34 @@ class CanvasView(tk.Canvas):
                 self.shape_drag_callback(dx, dy)
         elif self.start_x is not None and self.start_y is not None and self.current_shape_type != "select":
             self.delete("temp_shape")
+            coords = [c * self.zoom for c in (self.start_x, self.start_y, x, y)]
             if self.current_shape_type == "line":
-                self.create_line(
-                    self.start_x, self.start_y, event.x, event.y,
-                    fill='black', tags=("temp_shape",)
-                )
+                self.create_line(*coords, fill='black', tags=("temp_shape",))
             elif self.current_shape_type == "rectangle":
-                self.create_rectangle(
-                    self.start_x, self.start_y, event.x, event.y,
-                    outline='black', tags=("temp_shape",)
-                )
+                self.create_rectangle(*coords, outline='black', tags=("temp_shape",))
             elif self.current_shape_type == "ellipse":
-                self.create_oval(
-                    self.start_x, self.start_y, event.x, event.y,
-                    outline='black', tags=("temp_shape",)
-                )
+                self.create_oval(*coords, outline='black', tags=("temp_shape",))
     
     def on_release(self, event):
-        if self.dragging_shape:
+        x, y = self.event_point(event)
+        if self.marquee_start is not None:
+            self._finish_marquee(x, y)
+        elif self.dragging_shape:
             self.dragging_shape = False
             self.drag_start_x = None
             self.drag_start_y = None
+            if self.shape_drag_end_callback:
+                self.shape_drag_end_callback()
         elif self.current_shape_type not in ["text", "image"] and self.start_x is not None and self.start_y is not None:
             if self.shape_created_callback:
-                x1, y1 = min(self.start_x, event.x), min(self.start_y, event.y)
-                x2, y2 = max(self.start_x, event.x), max(self.start_y, event.y)
+                x1, y1 = min(self.start_x, x), min(self.start_y, y)
+                x2, y2 = max(self.start_x, x), max(self.start_y, y)
                 
                 if self.current_shape_type == "line":
                     self.shape_created_callback(
                         self.start_x, self.start_y,
-                        event.x - self.start_x,
-                        event.y - self.start_y,
+                        x - self.start_x,
+                        y - self.start_y,
                         shape_type=self.current_shape_type
                     )
                 else:
@@ -233,101 +212,446 @@ class CanvasView(tk.Canvas):
         self.start_y = None
         self.multi_select_mode = False
     
-    def draw_shapes(self, shapes):
-        self.delete("all")
+    # Marquee selection
+    def _start_marquee(self, x, y, additive):
+        self.marquee_start = (x, y)
+        self.marquee_additive = additive
+    
+    def _marquee_rect(self, x, y):
+        """(x1, y1, x2, y2, contained): dragging to the right selects shapes inside the
+        rectangle, dragging to the left selects everything it touches."""
+        sx, sy = self.marquee_start
+        return (min(sx, x), min(sy, y), max(sx, x), max(sy, y), x >= sx)
+    
+    def _update_marquee(self, x, y):
+        x1, y1, x2, y2, contained = self._marquee_rect(x, y)
+        z = self.zoom
+        self.delete("marquee")
+        self.create_rectangle(x1 * z, y1 * z, x2 * z, y2 * z, outline='#3b82f6',
+                              dash=() if contained else (4, 2), tags=("marquee", "temp_shape"))
+        if self.marquee_callback:
+            self.marquee_callback(x1, y1, x2, y2, contained)
+    
+    def _finish_marquee(self, x, y):
+        rect = self._marquee_rect(x, y)
+        additive = self.marquee_additive
+        self.marquee_start = None
+        self.marquee_additive = False
+        self.delete("marquee")
+        self.clear_selection_preview()
+        if self.marquee_end_callback and (rect[0], rect[1]) != (rect[2], rect[3]):
+            self.marquee_end_callback(*rect, additive)
+    
+    def show_selection_preview(self, shapes):
+        """Outline the shapes a marquee would select; only the difference from the last call is drawn."""
+        wanted = {shape.id: shape for shape in shapes}
+        for shape_id in [i for i in self._preview_items if i not in wanted]:
+            self.delete(self._preview_items.pop(shape_id))
+        z = self.zoom
+        for shape_id, shape in wanted.items():
+            if shape_id not in self._preview_items:
+                x1, y1, x2, y2 = shape.get_bounds()
+                self._preview_items[shape_id] = self.create_rectangle(
+                    x1 * z, y1 * z, x2 * z, y2 * z, outline='#3b82f6', dash=(2, 2),
+                    tags=("marquee_preview", "temp_shape")
+                )
+    
+    def clear_selection_preview(self):
+        if self._preview_items:
+            self.delete("marquee_preview")
+            self._preview_items.clear()
+    
+    def draw_shapes(self, shapes, region=None):
+        """
+        Retained-mode redraw.
+
+        Tk items are kept per shape id between calls; only shapes whose
+        draw() properties changed are reconfigured, new shapes get items
+        created and vanished shapes get their items deleted.
+
+        With a region (model x1, y1, x2, y2), shapes is the list of shapes
+        overlapping it and later incremental updates are culled to it.
+        """
+        self.render_region = region
+        shapes = self._cluster_tiny_shapes(shapes)
+        order = []
+        created = []
         for shape in shapes:
-            props = shape.draw()
-            outline = 'blue' if props['selected'] else props.get('outline', 'black')
-            
-            if props['type'] == 'rectangle':
-                self._draw_rectangle(props, outline)
-            elif props['type'] == 'ellipse':
-                self._draw_ellipse(props, outline)
-            elif props['type'] == 'line':
-                self._draw_line(props, outline)
-            elif props['type'] == 'text':
-                self._draw_text(props)
-            elif props['type'] == 'image':
-                self._draw_image(props)
-    
-    def _draw_rectangle(self, props, outline):
-        if props['has_shadow']:
-            self._draw_shadow(props, 'rectangle')
+            order.append(shape.id)
+            if self._render_shape(shape):
+                created.append(shape.id)
         
-        self.create_rectangle(
-            props['x'], props['y'],
-            props['x'] + props['width'],
-            props['y'] + props['height'],
-            outline=outline,
-            fill=props.get('fill', ''),
-            width=2 if props['has_frame'] else 1
-        )
+        alive = set(order)
+        for shape_id in [i for i in self.shape_items if i not in alive]:
+            self._retire_shape(shape_id)
         
-        if props['text'] and props['text'] != "Multiple":
-            self._draw_shape_text(props)
+        # New items are stacked on top; restack only if that is not the z-order
+        recreated = set(created)
+        displayed = [i for i in self._render_order or () if i in alive and i not in recreated]
+        if self._render_order is None or displayed != [i for i in order if i not in recreated]:
+            for shape_id in order:
+                self.tag_raise(self._shape_tag(shape_id))
+            self.tag_raise("temp_shape")
+        elif displayed + created != order:
+            # Existing items are already in order (e.g. after a pan): slot in only the new ones
+            for index, shape_id in enumerate(order):
+                if shape_id in recreated:
+                    if index == 0:
+                        self.tag_lower(self._shape_tag(shape_id))
+                    else:
+                        self.tag_raise(self._shape_tag(shape_id), self._shape_tag(order[index - 1]))
+        if self._clusters:
+            self.tag_lower("lod_cluster")
+        self._render_order = order
     
-    def _draw_ellipse(self, props, outline):
-        if props['has_shadow']:
-            self._draw_shadow(props, 'ellipse')
+    def update_shapes(self, shapes, removed_ids, restack_ids, shape_below):
+        """
+        Incremental redraw driven by model change records.
+
+        Changed shapes outside the render region lose their items (or are
+        skipped if they had none).
+
+        Args:
+            shapes: Changed shapes, in ascending z-order
+            removed_ids: Ids of shapes that left the canvas
+            restack_ids: Ids whose stacking position may have changed
+            shape_below: Callable returning the rendered shape directly below a shape
+        """
+        retired = set()
+        for shape_id in removed_ids:
+            self._uncluster(shape_id)
+            if shape_id in self.shape_items:
+                self._retire_shape(shape_id)
+                retired.add(shape_id)
         
-        self.create_oval(
-            props['x'], props['y'],
-            props['x'] + props['width'],
-            props['y'] + props['height'],
-            outline=outline,
-            fill=props.get('fill', ''),
-            width=2 if props['has_frame'] else 1
-        )
+        region = self.render_region
+        bounds = None
+        for shape in shapes:
+            # a changed shape leaves its cluster and is drawn on its own until the next full draw
+            self._uncluster(shape.id)
+            if region is not None:
+                x1, y1, x2, y2 = shape.get_bounds()
+                bounds = _union(bounds, (x1, y1, x2, y2))
+                if not (x1 <= region[2] and region[0] <= x2 and y1 <= region[3] and region[1] <= y2):
+                    if shape.id in self.shape_items:
+                        self._retire_shape(shape.id)
+                        retired.add(shape.id)
+                    continue
+            if self._render_shape(shape) or shape.id in restack_ids:
+                self._restack_shape(shape, shape_below)
         
-        if props['text'] and props['text'] != "Multiple":
-            self._draw_shape_text(props)
-    
-    def _draw_line(self, props, outline):
-        self.create_line(
-            props['x'], props['y'],
-            props['x'] + props.get('x2', 0),
-            props['y'] + props.get('y2', 0),
-            fill=outline,
-            width=props.get('width', 1)
-        )
+        self.tag_raise("temp_shape")
+        if self._clusters:
+            self.tag_lower("lod_cluster")
+        if retired and self._render_order is not None:
+            self._render_order = [i for i in self._render_order if i not in retired]
+        if bounds is not None:
+            self.extend_content_bounds(bounds)
     
-    def _draw_text(self, props):
-        self.create_text(
-            props['x'], props['y'],
-            text=props['text'],
-            font=(props.get('font', 'Arial'), props.get('font_size', 12)),
-            fill=props.get('text_color', 'black'),
-            anchor='nw'
-        )
+    def _restack_shape(self, shape, shape_below):
+        """
+        Place a shape's items directly above the nearest rendered shape below it.
+
+        The display order kept for the next draw_shapes() is updated the same
+        way, so that call can tell the items are already stacked correctly.
+        """
+        below = shape_below(shape)
+        while below is not None and not self.shape_items.get(below.id):
+            below = shape_below(below)
+        if below is None:
+            self.tag_lower(self._shape_tag(shape.id))
+        else:
+            self.tag_raise(self._shape_tag(shape.id), self._shape_tag(below.id))
+        order = self._render_order
+        if order is not None:
+            if shape.id in order:
+                order.remove(shape.id)
+            if below is None:
+                order.insert(0, shape.id)
+            elif below.id in order:
+                order.insert(order.index(below.id) + 1, shape.id)
+            else:
+                self._render_order = None
     
-    def _draw_image(self, props):
-        if props['image_path'] and os.path.exists(props['image_path']):
-            if props['image_path'] not in self.images:
-                self.images[props['image_path']] = PhotoImage(file=props['image_path'])
-            
-            if props['has_shadow']:
-                self._draw_shadow(props, 'image')
-            
-            self.create_image(
-                props['x'], props['y'],
-                image=self.images[props['image_path']],
-                anchor='nw'
-            )
-            
-            if props['has_frame']:
-                self.create_rectangle(
-                    props['x'], props['y'],
-                    props['x'] + props['width'],
-                    props['y'] + props['height'],
-                    outline='black',
-                    width=2
-                )
+    def _viewport_size(self):
+        width, height = self.winfo_width(), self.winfo_height()
+        if width <= 1 or height <= 1:  # not mapped yet
+            width, height = int(self.cget("width")), int(self.cget("height"))
+        return width, height
+    
+    def visible_region(self):
+        """Model coordinates (x1, y1, x2, y2) of the area currently shown."""
+        width, height = self._viewport_size()
+        z = self.zoom
+        return (self.canvasx(0) / z, self.canvasy(0) / z,
+                self.canvasx(width) / z, self.canvasy(height) / z)
+    
+    def culling_region(self):
+        """Model rect that should have items: the visible area plus CULL_MARGIN screen pixels."""
+        x1, y1, x2, y2 = self.visible_region()
+        margin = self.CULL_MARGIN / self.zoom
+        return (x1 - margin, y1 - margin, x2 + margin, y2 + margin)
+    
+    def needs_viewport_render(self):
+        """True if part of the visible area lies outside the render region."""
+        region = self.render_region
+        if region is None:
+            return True
+        x1, y1, x2, y2 = self.visible_region()
+        return x1 < region[0] or y1 < region[1] or x2 > region[2] or y2 > region[3]
+    
+    # Scrolling and zooming
+    def set_content_bounds(self, bounds):
+        """Make the scroll region cover the given model bounds (plus the visible area)."""
+        self._content_bounds = tuple(bounds)
+        self._update_scroll_region()
+    
+    def extend_content_bounds(self, bounds):
+        """Grow the scroll region to cover bounds if they reach outside it."""
+        current = self._content_bounds
+        union = _union(current, bounds)
+        if union != current:
+            self.set_content_bounds(union)
+    
+    def _update_scroll_region(self, visible=None):
+        # Content plus half a screen of slack, and never less than what is shown
+        # (visible: canvas rect that must stay scrollable, default the current one)
+        width, height = self._viewport_size()
+        z = self.zoom
+        x1, y1, x2, y2 = (c * z for c in self._content_bounds)
+        x1, y1, x2, y2 = x1 - width / 2, y1 - height / 2, x2 + width / 2, y2 + height / 2
+        if visible is None:
+            visible = (self.canvasx(0), self.canvasy(0), self.canvasx(width), self.canvasy(height))
+        x1, y1, x2, y2 = _union((x1, y1, x2, y2), visible)
+        self.configure(scrollregion=(x1, y1, x2, y2))
+        return x1, y1, x2, y2
+    
+    def set_zoom(self, zoom, anchor=None):
+        """
+        Change the zoom factor, keeping the model point under the widget
+        position anchor (default: the centre of the view) in place.
+        """
+        zoom = min(self.MAX_ZOOM, max(self.MIN_ZOOM, zoom))
+        if zoom == self.zoom:
+            return
+        width, height = self._viewport_size()
+        ax, ay = anchor if anchor is not None else (width / 2, height / 2)
+        mx, my = self.canvasx(ax) / self.zoom, self.canvasy(ay) / self.zoom
+        self.zoom = zoom
+        
+        # Every item's coordinates change, so start over from an empty canvas
+        for shape_id in list(self.shape_items):
+            self._retire_shape(shape_id)
+        self._clear_clusters()
+        self._render_order = []
+        self.render_region = None
+        self.delete("temp_shape")
+        
+        left, top = mx * zoom - ax, my * zoom - ay
+        x1, y1, x2, y2 = self._update_scroll_region((left, top, left + width, top + height))
+        self.xview_moveto((left - x1) / (x2 - x1))
+        self.yview_moveto((top - y1) / (y2 - y1))
+        self._viewport_changed()
+    
+    def zoom_by(self, factor, anchor=None):
+        self.set_zoom(self.zoom * factor, anchor)
+    
+    def scroll_x(self, *args):
+        """xscrollcommand target for a horizontal scrollbar."""
+        self.xview(*args)
+        self._viewport_changed()
     
-    def _draw_shape_text(self, props):
-        self.create_text(
-            props['x'] + props['width']/2,
-            props['y'] + props['height']/2,
-            text=props['text']
+    def scroll_y(self, *args):
+        """yscrollcommand target for a vertical scrollbar."""
+        self.yview(*args)
+        self._viewport_changed()
+    
+    def on_mouse_wheel(self, event):
+        """Wheel scrolls vertically, Shift+wheel horizontally, Ctrl+wheel zooms at the cursor."""
+        if event.num == 4 or (event.num != 5 and event.delta > 0):
+            step = -1
+        else:
+            step = 1
+        if event.state & 0x0004:  # Control
+            self.zoom_by(self.ZOOM_STEP ** -step, (event.x, event.y))
+            return
+        if event.state & 0x0001:  # Shift
+            self.xview_scroll(step, 'units')
+        else:
+            self.yview_scroll(step, 'units')
+        self._viewport_changed()
+    
+    def on_pan_start(self, event):
+        self.scan_mark(event.x, event.y)
+    
+    def on_pan(self, event):
+        self.scan_dragto(event.x, event.y, gain=1)
+        self._viewport_changed()
+    
+    def _viewport_changed(self):
+        # Only ask for a redraw once the view leaves the area that already has items
+        if self.viewport_changed_callback and self.needs_viewport_render():
+            self.viewport_changed_callback()
+    
+    # Level of detail
+    def _cluster_tiny_shapes(self, shapes):
+        """
+        Zoomed out, draw each grid cell holding at least lod.cluster_min_count
+        tiny unselected shapes as one item below the other shapes. Returns the
+        shapes that still need items of their own.
+        """
+        self._clear_clusters()
+        lod = self.lod
+        if not lod.active(self.zoom):
+            return shapes
+        tiny = lod.cluster_shape_size / self.zoom
+        cell = lod.cluster_cell_size / self.zoom
+        cells = {}
+        for shape in shapes:
+            if shape.selected:
+                continue
+            x1, y1, x2, y2 = shape.get_bounds()
+            if x2 - x1 < tiny and y2 - y1 < tiny:
+                key = (int((x1 + x2) / 2 // cell), int((y1 + y2) / 2 // cell))
+                cells.setdefault(key, []).append((shape.id, (x1, y1, x2, y2)))
+        
+        z = self.zoom
+        for members in cells.values():
+            if len(members) < lod.cluster_min_count:
+                continue
+            bounds = None
+            for _, shape_bounds in members:
+                bounds = _union(bounds, shape_bounds)
+            item = self.create_rectangle(*(c * z for c in bounds), fill=lod.cluster_color,
+                                         outline='', tags=("lod_cluster",))
+            self._clusters[item] = {shape_id for shape_id, _ in members}
+            for shape_id, _ in members:
+                self._clustered[shape_id] = item
+        if not self._clustered:
+            return shapes
+        return [shape for shape in shapes if shape.id not in self._clustered]
+    
+    def _uncluster(self, shape_id):
+        item = self._clustered.pop(shape_id, None)
+        if item is None:
+            return
+        members = self._clusters[item]
+        members.discard(shape_id)
+        if not members:
+            del self._clusters[item]
+            self.delete(item)
+    
+    def _clear_clusters(self):
+        if self._clusters:
+            self.delete("lod_cluster")
+            self._clusters.clear()
+            self._clustered.clear()
+    
+    def _shape_tag(self, shape_id):
+        return f"shape-{shape_id}"
+    
+    def _render_shape(self, shape):
+        """Create or update the items of one shape. Returns True if the shape had no items yet."""
+        props = shape.draw()
+        if shape.id in self.shape_items and self.shape_props[shape.id] == props:
+            return False
+        return self._apply_props(shape.id, props)
+    
+    def _apply_props(self, shape_id, props):
+        items = self.shape_items.get(shape_id)
+        primitives = self._shape_primitives(props, shape_id)
+        self.shape_props[shape_id] = props
+        if items is not None and [kind for kind, _ in items] == [p[0] for p in primitives]:
+            for (_, item), (_, coords, options) in zip(items, primitives):
+                options = {k: v for k, v in options.items() if k != 'tags'}
+                self.coords(item, *coords)
+                self.itemconfigure(item, **options)
+            if props['selected'] != (shape_id in self._selected_ids):
+                self._set_selected_tag(shape_id, props['selected'])
+            return False
+        
+        # The item layout changed: build new items in the old ones' stacking slot
+        extra_tags = ('selected', 'restacking') if props['selected'] else ('restacking',)
+        self.shape_items[shape_id] = [
+            (kind, self._create_primitive(shape_id, kind, coords, options, extra_tags))
+            for kind, coords, options in primitives
+        ]
+        if items:
+            self.tag_raise('restacking', items[-1][1])
+            self.delete(*[item for _, item in items])
+        self.dtag('restacking', 'restacking')
+        if props['selected']:
+            self._selected_ids.add(shape_id)
+        else:
+            self._selected_ids.discard(shape_id)
+        return not items
+    
+    def _on_image_ready(self, shape_id):
+        """A background decode finished: rebuild the shape's items from its cached props."""
+        props = self.shape_props.get(shape_id)
+        if props is not None:
+            self._apply_props(shape_id, props)
+    
+    def _create_primitive(self, shape_id, kind, coords, options, extra_tags=()):
+        options = dict(options)
+        tags = (self._shape_tag(shape_id),) + tuple(options.pop('tags', ())) + tuple(extra_tags)
+        return getattr(self, 'create_' + kind)(*coords, tags=tags, **options)
+    
+    def _set_selected_tag(self, shape_id, selected):
+        if selected:
+            self.addtag_withtag('selected', self._shape_tag(shape_id))
+            self._selected_ids.add(shape_id)
+        else:
+            self.dtag(self._shape_tag(shape_id), 'selected')
+            self._selected_ids.discard(shape_id)
+    
+    def _retire_shape(self, shape_id):
+        self.delete(self._shape_tag(shape_id))
+        del self.shape_items[shape_id]
+        del self.shape_props[shape_id]
+        self._selected_ids.discard(shape_id)
+        self.image_cache.release(shape_id)
+    
+    def move_selected_items(self, dx, dy):
+        """Drag fast path: shift the items of all selected shapes with one Tk call."""
+        self.move('selected', dx * self.zoom, dy * self.zoom)
+    
+    def commit_selected_move(self, dx, dy):
+        """
+        Record that the selected items were already moved by (dx, dy), so the
+        model update committed at the end of a drag does not touch them again.
+        """
+        for shape_id in self._selected_ids:
+            props = dict(self.shape_props[shape_id])
+            props['x'] += dx
+            props['y'] += dy
+            self.shape_props[shape_id] = props
+    
+    def _shape_primitives(self, props, shape_id=None):
+        """Translate draw() properties into (item kind, coords, options) tuples."""
+        props = self._zoomed(props)
+        resolve_image = lambda p: self._request_image(shape_id, p)
+        if self.lod.active(self.zoom):
+            return self.lod.primitives(props, resolve_image)
+        return shape_primitives(props, resolve_image)
+    
+    def _zoomed(self, props):
+        """draw() properties in canvas coordinates."""
+        z = self.zoom
+        if z == 1:
+            return props
+        props = dict(props)
+        for key in _SCALED_PROPS:
+            if key in props:
+                props[key] = props[key] * z
+        if 'font_size' in props:
+            props['font_size'] = max(1, round(props['font_size'] * z))
+        return props
+    
+    def _request_image(self, shape_id, props):
+        """PhotoImage for an image shape, or None while it is decoded in the background."""
+        return self.image_cache.request(
+            shape_id, props['image_path'], props['width'], props['height'], self._on_image_ready
         )
     
     def set_shape_selected_callback(self, callback: Callable):
@@ -338,3 +662,25 @@ class CanvasView(tk.Canvas):
         
     def set_shape_drag_callback(self, callback: Callable):
         self.shape_drag_callback = callback
+    
+    def set_shape_drag_end_callback(self, callback: Callable):
+        self.shape_drag_end_callback = callback
+    
+    def set_viewport_changed_callback(self, callback: Callable):
+        self.viewport_changed_callback = callback
+    
+    def set_marquee_callback(self, callback: Callable):
+        self.marquee_callback = callback
+    
+    def set_marquee_end_callback(self, callback: Callable):
+        self.marquee_end_callback = callback
+
+
+# draw() properties that are lengths in model units
+_SCALED_PROPS = ('x', 'y', 'width', 'height', 'x2', 'y2')
+
+
+def _union(a, b):
+    if a is None:
+        return b
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
@@ -0,0 +1,240 @@
+import base64
+import os
+from collections import OrderedDict
+from tkinter import PhotoImage
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+try:
+    from PIL import Image as PILImage, ImageTk
+except ImportError:  # Pillow is optional; Tk can only subsample by integer factors
+    PILImage = None
+    ImageTk = None
+
+CacheKey = Tuple[str, int, int]
+
+
+def decode_pixels(path: str, width: int, height: int):
+    """
+    Decode an image file into raw pixel data scaled to (width, height).
+
+    Safe to call from worker threads: no Tk objects are created here.
+    Without Pillow the file is only read and encoded, and Tk decodes it
+    later in pixels_to_photo().
+    """
+    if PILImage is not None:
+        with PILImage.open(path) as image:
+            # JPEG can decode straight at a reduced scale
+            image.draft('RGB', (width, height))
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA')
+            image = image.resize((width, height))
+            image.load()
+            return image
+    with open(path, 'rb') as f:
+        return base64.b64encode(f.read())
+
+
+def pixels_to_photo(pixels, width: int, height: int) -> PhotoImage:
+    """Turn decode_pixels() output into a PhotoImage (Tk thread only)."""
+    if PILImage is not None:
+        return ImageTk.PhotoImage(pixels)
+    photo = PhotoImage(data=pixels)
+    factor = max(1, min(photo.width() // width, photo.height() // height))
+    if factor > 1:
+        photo = photo.subsample(factor)
+    return photo
+
+
+def _file_stamp(path: str) -> Optional[Tuple[float, int]]:
+    """(mtime, size) of a file, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime, stat.st_size
+
+
+class ImageCache:
+    """
+    Bounded LRU cache of PhotoImages decoded at their on-screen size.
+
+    Entries are keyed by (path, width, height), so an image is decoded again
+    only when the rendered size changes (resize or zoom). Images that are
+    currently shown on the canvas are pinned by their owner (a shape id) and
+    are never evicted, since dropping the PhotoImage would blank the item;
+    when pinned images alone exceed max_bytes the cache goes over budget.
+
+    With a loader, request() decodes misses in the background instead of
+    blocking the Tk thread.
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024, loader=None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget for decoded pixels (4 bytes per pixel)
+            loader: Optional ImageLoader for background decoding
+        """
+        self.max_bytes = max_bytes
+        self.loader = loader
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[CacheKey, PhotoImage]" = OrderedDict()
+        self._sizes: Dict[CacheKey, int] = {}
+        self._pins: Dict[CacheKey, int] = {}
+        self._owners: Dict[Hashable, CacheKey] = {}
+        self._waiting: Dict[CacheKey, Dict[Hashable, Callable]] = {}
+        self._waiting_keys: Dict[Hashable, CacheKey] = {}  # owner -> key it waits for
+        self._failed: Dict[CacheKey, Tuple[Exception, Optional[Tuple[float, int]]]] = {}  # key -> (error, file stamp)
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._entries
+
+    def get(self, path: str, width: int, height: int) -> PhotoImage:
+        """Return the image decoded for the given display size, decoding on a miss."""
+        key = (path, max(1, int(width)), max(1, int(height)))
+        photo = self._entries.get(key)
+        if photo is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return photo
+
+        self.misses += 1
+        photo = pixels_to_photo(decode_pixels(*key), key[1], key[2])
+        self._store(key, photo)
+        return photo
+
+    def request(self, owner: Hashable, path: str, width: int, height: int,
+                on_ready: Callable[[Hashable], None]) -> Optional[PhotoImage]:
+        """
+        Non-blocking acquire().
+
+        Returns the pinned image if it is cached. Otherwise starts a background
+        decode, returns None, and calls on_ready(owner) on the Tk thread once
+        the image (or its decoding error) is available. Raises the decoding
+        error for keys that already failed, until the file changes on disk.
+        """
+        key = (path, max(1, int(width)), max(1, int(height)))
+        if key in self._failed:
+            error, stamp = self._failed[key]
+            if _file_stamp(path) == stamp:
+                raise error
+            del self._failed[key]
+        if self.loader is None or key in self._entries:
+            self._stop_waiting(owner)
+            return self.acquire(owner, path, width, height)
+
+        self._stop_waiting(owner)
+        self._waiting.setdefault(key, {})[owner] = on_ready
+        self._waiting_keys[owner] = key
+        self.loader.submit(key, self._on_decoded)
+        return None
+
+    def prefetch(self, path: str, width: int, height: int) -> None:
+        """Start decoding an image in the background without pinning it."""
+        key = (path, max(1, int(width)), max(1, int(height)))
+        if self.loader is not None and key not in self._entries:
+            self.loader.submit(key, self._on_decoded)
+
+    def acquire(self, owner: Hashable, path: str, width: int, height: int) -> PhotoImage:
+        """Get an image and pin it for owner until release() or the next acquire()."""
+        photo = self.get(path, width, height)
+        self._pin(owner, (path, max(1, int(width)), max(1, int(height))))
+        return photo
+
+    def release(self, owner: Hashable) -> None:
+        """Unpin the image held by owner, making it evictable."""
+        self._stop_waiting(owner)
+        key = self._owners.pop(owner, None)
+        if key is not None:
+            self._unpin(key)
+            self._evict()
+
+    def clear(self) -> None:
+        """Drop every unpinned image and forget decoding errors."""
+        for key in [k for k in self._entries if not self._pins.get(k)]:
+            self._remove(key)
+        self._failed.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current memory use."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes_used': self.bytes_used,
+            'max_bytes': self.max_bytes,
+        }
+
+    def _stop_waiting(self, owner: Hashable) -> None:
+        key = self._waiting_keys.pop(owner, None)
+        if key is None:
+            return
+        waiters = self._waiting.get(key)
+        if waiters is not None:
+            waiters.pop(owner, None)
+            if not waiters:
+                del self._waiting[key]
+
+    def _on_decoded(self, key: CacheKey, pixels, error: Optional[Exception]) -> None:
+        waiters = self._waiting.pop(key, {})
+        photo = None
+        if error is None and key not in self._entries:
+            try:
+                photo = pixels_to_photo(pixels, key[1], key[2])
+            except Exception as e:
+                error = e
+        if error is not None:
+            self._failed[key] = (error, _file_stamp(key[0]))
+        else:
+            # Pin for the waiting owners before storing: with the budget full of
+            # pinned images, an unpinned new entry would be evicted at once and
+            # every on_ready() would submit the decode again
+            for owner in waiters:
+                self._pin(owner, key)
+            if photo is not None:
+                self.misses += 1
+                self._store(key, photo)
+        for owner, on_ready in waiters.items():
+            self._waiting_keys.pop(owner, None)
+            on_ready(owner)
+
+    def _store(self, key: CacheKey, photo: PhotoImage) -> None:
+        self._entries[key] = photo
+        self._sizes[key] = photo.width() * photo.height() * 4
+        self.bytes_used += self._sizes[key]
+        self._evict()
+
+    def _pin(self, owner: Hashable, key: CacheKey) -> None:
+        previous = self._owners.get(owner)
+        if previous != key:
+            if previous is not None:
+                self._unpin(previous)
+            self._owners[owner] = key
+            self._pins[key] = self._pins.get(key, 0) + 1
+
+    def _unpin(self, key: CacheKey) -> None:
+        count = self._pins.get(key, 0) - 1
+        if count > 0:
+            self._pins[key] = count
+        else:
+            self._pins.pop(key, None)
+
+    def _evict(self) -> None:
+        if self.bytes_used <= self.max_bytes:
+            return
+        for key in list(self._entries):
+            if self.bytes_used <= self.max_bytes:
+                break
+            if not self._pins.get(key):
+                self._remove(key)
+                self.evictions += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        del self._entries[key]
+        self.bytes_used -= self._sizes.pop(key)
+
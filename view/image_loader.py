@@ -0,0 +1,69 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List
+
+
+class ImageLoader:
+    """
+    Decodes images on a thread pool and hands the results back to the Tk thread.
+
+    Tk objects may only be touched from the main thread, so workers only
+    produce raw pixel data; finished jobs are collected by an after() poll
+    that runs while anything is in flight. Concurrent requests for the same
+    key share one decode.
+    """
+
+    def __init__(self, widget, decode: Callable, max_workers: int = 4, poll_ms: int = 15):
+        """
+        Initialize the loader.
+
+        Args:
+            widget: Tk widget used for after() polling
+            decode: Thread-safe function called with the key's items as arguments
+            max_workers: Size of the decoding thread pool
+            poll_ms: Interval for collecting finished decodes
+        """
+        self.widget = widget
+        self.decode = decode
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-decode")
+        self._done: "queue.Queue" = queue.Queue()
+        self._in_flight: Dict[Hashable, List[Callable]] = {}
+        self._poll_id = None
+
+    def is_loading(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    def submit(self, key: tuple, callback: Callable) -> None:
+        """
+        Decode key in the background and call callback(key, result, error) on the Tk thread.
+        """
+        callbacks = self._in_flight.get(key)
+        if callbacks is not None:
+            callbacks.append(callback)
+            return
+        self._in_flight[key] = [callback]
+        future = self._executor.submit(self.decode, *key)
+        future.add_done_callback(lambda f, key=key: self._done.put((key, f)))
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._poll_id is not None:
+            self.widget.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    def _poll(self) -> None:
+        self._poll_id = None
+        while True:
+            try:
+                key, future = self._done.get_nowait()
+            except queue.Empty:
+                break
+            error = future.exception()
+            result = None if error else future.result()
+            for callback in self._in_flight.pop(key, []):
+                callback(key, result, error)
+        if self._in_flight:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
@@ -0,0 +1,77 @@
+"""
+Level-of-detail policy for zoomed-out views.
+
+All thresholds are on-screen sizes in pixels and are compared against
+draw() properties already scaled by the zoom factor. Nothing is simplified
+at zoom 1 or above, so the editor draws full detail at actual size.
+"""
+from typing import Any, Dict, List, Optional
+
+from .primitives import ImageResolver, Primitive, shape_primitives
+
+# Approximate glyph box relative to the font size, for text bars
+_CHAR_WIDTH = 0.6
+_LINE_HEIGHT = 1.2
+
+
+class LevelOfDetail:
+    """
+    Simplification thresholds (screen pixels).
+
+    text_min_font:        text drawn smaller than this becomes a grey bar
+    decoration_min_size:  rectangles/ellipses smaller than this lose their
+                          shadow and label
+    image_min_size:       images smaller than this become flat boxes (larger
+                          ones are decoded at their on-screen size, i.e. as
+                          thumbnails)
+    cluster_shape_size:   shapes smaller than this may be aggregated ...
+    cluster_cell_size:    ... per grid cell of this size ...
+    cluster_min_count:    ... when a cell holds at least this many of them
+    """
+
+    def __init__(self, text_min_font=5, decoration_min_size=16, image_min_size=12,
+                 cluster_shape_size=4, cluster_cell_size=24, cluster_min_count=6):
+        self.enabled = True
+        self.text_min_font = text_min_font
+        self.decoration_min_size = decoration_min_size
+        self.image_min_size = image_min_size
+        self.cluster_shape_size = cluster_shape_size
+        self.cluster_cell_size = cluster_cell_size
+        self.cluster_min_count = cluster_min_count
+        self.bar_color = '#c8c8c8'
+        self.box_color = '#d8d8d8'
+        self.cluster_color = '#a8a8a8'
+
+    def active(self, zoom: float) -> bool:
+        return self.enabled and zoom < 1
+
+    def primitives(self, props: Dict[str, Any],
+                   resolve_image: Optional[ImageResolver] = None) -> List[Primitive]:
+        """Primitives for draw() properties in canvas coordinates, simplified where too small."""
+        kind = props['type']
+        if kind == 'text':
+            if props.get('font_size', 12) < self.text_min_font:
+                return [self._text_bar(props)]
+        elif kind == 'image':
+            if min(props['width'], props['height']) < self.image_min_size:
+                return [self._flat_box(props)]
+        elif kind in ('rectangle', 'ellipse'):
+            if (min(props['width'], props['height']) < self.decoration_min_size
+                    and (props['has_shadow'] or props['text'])):
+                props = dict(props, has_shadow=False, text='')
+        return shape_primitives(props, resolve_image)
+
+    def _text_bar(self, props) -> Primitive:
+        lines = str(props['text']).split('\n')
+        size = props.get('font_size', 12)
+        width = max(1, max(len(line) for line in lines) * size * _CHAR_WIDTH)
+        height = max(1, len(lines) * size * _LINE_HEIGHT)
+        return ('rectangle',
+                (props['x'], props['y'], props['x'] + width, props['y'] + height),
+                {'fill': self.bar_color, 'outline': 'blue' if props['selected'] else ''})
+
+    def _flat_box(self, props) -> Primitive:
+        return ('rectangle',
+                (props['x'], props['y'],
+                 props['x'] + props['width'], props['y'] + props['height']),
+                {'fill': self.box_color, 'outline': 'blue' if props['selected'] else ''})
@@ -1,9 +1,14 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog, messagebox
 from .canvas_view import CanvasView
 from .property_panel import PropertyPanel
 from .toolbar import Toolbar
 from .menu_bar import MenuBar
+from .perf_overlay import PerfOverlay
+
+DOCUMENT_EXTENSION = ".mrdh"
+DOCUMENT_FILETYPES = [("Miridih documents", "*.mrdh"), ("All files", "*.*")]
+
 
 class MainWindow:
     """
@@ -33,13 +38,48 @@ class MainWindow:
     def _setup_layout(self):
         """Set up the layout of UI components."""
         self.main_frame.pack(fill=tk.BOTH, expand=True)
-        self.canvas_view.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas_frame.rowconfigure(0, weight=1)
+        self.canvas_frame.columnconfigure(0, weight=1)
+        self.canvas_view.grid(row=0, column=0, sticky="nsew")
+        self.y_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.x_scrollbar.grid(row=1, column=0, sticky="ew")
         self.property_panel.pack(side=tk.RIGHT, fill=tk.Y)
     
     def _create_menu(self):
         """Create the application menu bar."""
-        self.menu_bar = MenuBar(self.root)
+        self.menu_bar = MenuBar(
+            self.root,
+            on_new=self.on_new_document,
+            on_open=self.on_open_document,
+            on_save=self.on_save_document,
+            on_save_as=self.on_save_document_as,
+            on_undo=self.on_undo,
+            on_redo=self.on_redo,
+            on_group=self.on_group,
+            on_ungroup=self.on_ungroup,
+            on_select_all=self.on_select_all,
+            on_invert_selection=self.on_invert_selection,
+            on_select_type=self.on_select_type,
+            on_toggle_profiling=self.on_toggle_profiling,
+            on_toggle_overlay=self.on_toggle_overlay,
+            on_save_trace=self.on_save_trace,
+            on_zoom_in=self.on_zoom_in,
+            on_zoom_out=self.on_zoom_out,
+            on_zoom_reset=self.on_zoom_reset
+        )
         self.root.config(menu=self.menu_bar)
+        self.root.bind("<Control-z>", lambda e: self.on_undo())
+        self.root.bind("<Control-y>", lambda e: self.on_redo())
+        self.root.bind("<Control-Shift-Z>", lambda e: self.on_redo())
+        self.root.bind("<Control-a>", lambda e: self.on_select_all())
+        self.root.bind("<Control-Shift-I>", lambda e: self.on_invert_selection())
+        self.root.bind("<Control-g>", lambda e: self.on_group())
+        self.root.bind("<Control-Shift-G>", lambda e: self.on_ungroup())
+        self.root.bind("<Control-plus>", lambda e: self.on_zoom_in())
+        self.root.bind("<Control-equal>", lambda e: self.on_zoom_in())
+        self.root.bind("<Control-minus>", lambda e: self.on_zoom_out())
+        self.root.bind("<Control-0>", lambda e: self.on_zoom_reset())
     
     def _create_toolbar(self):
         """Create the toolbar with shape selection and mode controls."""
@@ -56,8 +96,15 @@ class MainWindow:
         self.main_frame = tk.Frame(self.root)
     
     def _create_canvas(self):
-        """Create the canvas view component."""
-        self.canvas_view = CanvasView(self.main_frame)
+        """Create the canvas view component with its scrollbars."""
+        self.canvas_frame = tk.Frame(self.main_frame)
+        self.canvas_view = CanvasView(self.canvas_frame)
+        self.x_scrollbar = tk.Scrollbar(self.canvas_frame, orient=tk.HORIZONTAL,
+                                        command=self.canvas_view.scroll_x)
+        self.y_scrollbar = tk.Scrollbar(self.canvas_frame, orient=tk.VERTICAL,
+                                        command=self.canvas_view.scroll_y)
+        self.canvas_view.configure(xscrollcommand=self.x_scrollbar.set,
+                                   yscrollcommand=self.y_scrollbar.set)
     
     def _create_property_panel(self):
         """Create the property panel component."""
@@ -90,6 +137,140 @@ class MainWindow:
             elif action == "backward":
                 self.canvas_view.canvas_controller.send_backward()
     
+    def _controller(self):
+        """Return the canvas controller once it has been attached."""
+        return getattr(self.canvas_view, 'canvas_controller', None)
+    
+    def on_undo(self):
+        """Handle Edit > Undo."""
+        if self._controller():
+            self._controller().undo()
+    
+    def on_redo(self):
+        """Handle Edit > Redo."""
+        if self._controller():
+            self._controller().redo()
+    
+    def on_group(self):
+        """Handle Edit > Group."""
+        if self._controller():
+            self._controller().group_selected()
+    
+    def on_ungroup(self):
+        """Handle Edit > Ungroup."""
+        if self._controller():
+            self._controller().ungroup_selected()
+    
+    def on_select_all(self):
+        """Handle Edit > Select All."""
+        if self._controller():
+            self._controller().select_all()
+    
+    def on_invert_selection(self):
+        """Handle Edit > Invert Selection."""
+        if self._controller():
+            self._controller().invert_selection()
+    
+    def on_select_type(self, shape_type):
+        """Handle Edit > Select by Type."""
+        if self._controller():
+            self._controller().select_by_type(shape_type)
+    
+    def on_zoom_in(self):
+        """Handle View > Zoom In."""
+        self.canvas_view.zoom_by(CanvasView.ZOOM_STEP)
+    
+    def on_zoom_out(self):
+        """Handle View > Zoom Out."""
+        self.canvas_view.zoom_by(1 / CanvasView.ZOOM_STEP)
+    
+    def on_zoom_reset(self):
+        """Handle View > Actual Size."""
+        self.canvas_view.set_zoom(1.0)
+    
+    def on_toggle_profiling(self, enabled):
+        """Handle View > Record Performance."""
+        if not self._controller():
+            return
+        if enabled:
+            self._controller().enable_instrumentation()
+        else:
+            self._controller().disable_instrumentation()
+            self.menu_bar.overlay_var.set(False)
+    
+    def on_toggle_overlay(self, enabled):
+        """Handle View > Performance Overlay (turns recording on as well)."""
+        if not self._controller():
+            return
+        self._controller().set_perf_overlay(PerfOverlay(self.canvas_view) if enabled else None)
+        if enabled:
+            self.menu_bar.profiling_var.set(True)
+    
+    def on_save_trace(self):
+        """Handle View > Save Performance Trace."""
+        if not self._controller():
+            return
+        instrumentation = self._controller().instrumentation
+        if instrumentation is None or not instrumentation.events:
+            messagebox.showinfo("Performance Trace", "Turn on View > Record Performance and use the editor first.")
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json", filetypes=[("Chrome trace", "*.json"), ("All files", "*.*")]
+        )
+        if path:
+            try:
+                instrumentation.write_chrome_trace(path)
+            except OSError as e:
+                messagebox.showerror("Performance Trace", f"Could not save {path}:\n{e}")
+    
+    def on_new_document(self):
+        """Handle File > New."""
+        if self._controller():
+            self._controller().new_document()
+    
+    def on_open_document(self):
+        """Handle File > Open."""
+        if not self._controller():
+            return
+        path = filedialog.askopenfilename(filetypes=DOCUMENT_FILETYPES)
+        if path:
+            try:
+                self._controller().open_document(path)
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Open", f"Could not open {path}:\n{e}")
+    
+    def on_save_document(self):
+        """Handle File > Save."""
+        if not self._controller():
+            return
+        if self._controller().document_path is None:
+            self.on_save_document_as()
+            return
+        self._save_to(self._controller().document_path)
+    
+    def on_save_document_as(self):
+        """Handle File > Save As."""
+        if not self._controller():
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=DOCUMENT_EXTENSION, filetypes=DOCUMENT_FILETYPES
+        )
+        if path:
+            self._save_to(path)
+    
+    def _save_to(self, path):
+        try:
+            self._controller().save_document(path)
+        except OSError as e:
+            messagebox.showerror("Save", f"Could not save {path}:\n{e}")
+    
+    def show_recovery_notice(self):
+        """Tell the user, once the window is up, that an interrupted session was restored."""
+        self.root.after_idle(lambda: messagebox.showinfo(
+            "Recovered Session",
+            "The previous session did not exit normally. Its unsaved changes have been restored."
+        ))
+    
     def start(self):
         """Start the application main loop."""
         self.root.mainloop() 
\ No newline at end of file
@@ -6,26 +6,113 @@ class MenuBar(tk.Menu):
     Handles file and edit operations.
     """
     
-    def __init__(self, master):
+    def __init__(self, master, on_new=None, on_open=None, on_save=None, on_save_as=None,
+                 on_undo=None, on_redo=None, on_group=None, on_ungroup=None,
+                 on_select_all=None, on_invert_selection=None, on_select_type=None,
+                 on_toggle_profiling=None,
+                 on_toggle_overlay=None, on_save_trace=None, on_zoom_in=None,
+                 on_zoom_out=None, on_zoom_reset=None):
         """
         Initialize the menu bar.
         
         Args:
             master: Parent widget
+            on_new: Callback for File > New
+            on_open: Callback for File > Open
+            on_save: Callback for File > Save
+            on_save_as: Callback for File > Save As
+            on_undo: Callback for Edit > Undo
+            on_redo: Callback for Edit > Redo
+            on_group: Callback for Edit > Group
+            on_ungroup: Callback for Edit > Ungroup
+            on_select_all: Callback for Edit > Select All
+            on_invert_selection: Callback for Edit > Invert Selection
+            on_select_type: Called with a shape type name from Edit > Select by Type
+            on_toggle_profiling: Called with the new state of View > Record Performance
+            on_toggle_overlay: Called with the new state of View > Performance Overlay
+            on_save_trace: Callback for View > Save Performance Trace
+            on_zoom_in: Callback for View > Zoom In
+            on_zoom_out: Callback for View > Zoom Out
+            on_zoom_reset: Callback for View > Actual Size
         """
         super().__init__(master)
+        self.on_new = on_new
+        self.on_open = on_open
+        self.on_save = on_save
+        self.on_save_as = on_save_as
+        self.on_undo = on_undo
+        self.on_redo = on_redo
+        self.on_group = on_group
+        self.on_ungroup = on_ungroup
+        self.on_select_all = on_select_all
+        self.on_invert_selection = on_invert_selection
+        self.on_select_type = on_select_type
+        self.on_toggle_profiling = on_toggle_profiling
+        self.on_toggle_overlay = on_toggle_overlay
+        self.on_save_trace = on_save_trace
+        self.on_zoom_in = on_zoom_in
+        self.on_zoom_out = on_zoom_out
+        self.on_zoom_reset = on_zoom_reset
+        self.profiling_var = tk.BooleanVar(master, value=False)
+        self.overlay_var = tk.BooleanVar(master, value=False)
         self._create_file_menu()
         self._create_edit_menu()
+        self._create_view_menu()
     
     def _create_file_menu(self):
         """Create the file menu with its commands."""
         file_menu = tk.Menu(self, tearoff=0)
         self.add_cascade(label="File", menu=file_menu)
-        file_menu.add_command(label="New")
+        file_menu.add_command(label="New", command=self.on_new)
+        file_menu.add_command(label="Open...", command=self.on_open)
+        file_menu.add_command(label="Save", command=self.on_save)
+        file_menu.add_command(label="Save As...", command=self.on_save_as)
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.master.quit)
     
     def _create_edit_menu(self):
         """Create the edit menu with its commands."""
         edit_menu = tk.Menu(self, tearoff=0)
         self.add_cascade(label="Edit", menu=edit_menu)
-        edit_menu.add_command(label="Delete") 
\ No newline at end of file
+        edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.on_undo)
+        edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.on_redo)
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Select All", accelerator="Ctrl+A", command=self.on_select_all)
+        edit_menu.add_command(label="Invert Selection", accelerator="Ctrl+Shift+I",
+                              command=self.on_invert_selection)
+        type_menu = tk.Menu(edit_menu, tearoff=0)
+        edit_menu.add_cascade(label="Select by Type", menu=type_menu)
+        for label, shape_type in (("Rectangles", "rectangle"), ("Ellipses", "ellipse"),
+                                  ("Lines", "line"), ("Text", "text"), ("Images", "image")):
+            type_menu.add_command(label=label, command=lambda t=shape_type: self._select_type(t))
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Group", accelerator="Ctrl+G", command=self.on_group)
+        edit_menu.add_command(label="Ungroup", accelerator="Ctrl+Shift+G", command=self.on_ungroup)
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Delete")
+    
+    def _create_view_menu(self):
+        """Create the view menu with zoom and the performance tools."""
+        view_menu = tk.Menu(self, tearoff=0)
+        self.add_cascade(label="View", menu=view_menu)
+        view_menu.add_command(label="Zoom In", accelerator="Ctrl++", command=self.on_zoom_in)
+        view_menu.add_command(label="Zoom Out", accelerator="Ctrl+-", command=self.on_zoom_out)
+        view_menu.add_command(label="Actual Size", accelerator="Ctrl+0", command=self.on_zoom_reset)
+        view_menu.add_separator()
+        view_menu.add_checkbutton(label="Record Performance", variable=self.profiling_var,
+                                  command=self._profiling_toggled)
+        view_menu.add_checkbutton(label="Performance Overlay", variable=self.overlay_var,
+                                  command=self._overlay_toggled)
+        view_menu.add_command(label="Save Performance Trace...", command=self.on_save_trace)
+    
+    def _select_type(self, shape_type):
+        if self.on_select_type:
+            self.on_select_type(shape_type)
+    
+    def _profiling_toggled(self):
+        if self.on_toggle_profiling:
+            self.on_toggle_profiling(self.profiling_var.get())
+    
+    def _overlay_toggled(self):
+        if self.on_toggle_overlay:
+            self.on_toggle_overlay(self.overlay_var.get())
@@ -0,0 +1,42 @@
+class PerfOverlay:
+    """
+    Small performance readout drawn in the top-left corner of a canvas.
+
+    The items carry the 'perf_overlay' tag and are kept above the shapes;
+    they are not shape items, so the view's redraw logic never touches them.
+    """
+
+    TAG = "perf_overlay"
+
+    def __init__(self, canvas, font=("Courier", 9)):
+        self.canvas = canvas
+        self.font = font
+        self._text = None
+        self._background = None
+
+    def show(self, fps, frame_ms, item_count):
+        """Create or update the readout."""
+        x, y = self.canvas.canvasx(4), self.canvas.canvasy(4)
+        text = f"{fps:3.0f} fps  {frame_ms:6.1f} ms  {item_count} items"
+        if self._text is None:
+            self._background = self.canvas.create_rectangle(
+                0, 0, 0, 0, fill="#ffffe0", outline="gray", tags=(self.TAG,)
+            )
+            self._text = self.canvas.create_text(
+                x, y, text=text, anchor="nw", font=self.font, tags=(self.TAG,)
+            )
+        else:
+            self.canvas.coords(self._text, x, y)
+            self.canvas.itemconfigure(self._text, text=text)
+        x1, y1, x2, y2 = self.canvas.bbox(self._text) or (x, y, x, y)
+        self.canvas.coords(self._background, x1 - 3, y1 - 2, x2 + 3, y2 + 2)
+        self.raise_()
+
+    def raise_(self):
+        """Keep the readout above items drawn since the last update."""
+        if self._text is not None:
+            self.canvas.tag_raise(self.TAG)
+
+    def hide(self):
+        self.canvas.delete(self.TAG)
+        self._text = self._background = None
@@ -0,0 +1,183 @@
+"""
+Shape-to-primitive translation shared by every render backend.
+
+A primitive is a (kind, coords, options) tuple using tk.Canvas vocabulary:
+kind is one of 'rectangle', 'oval', 'line', 'text' or 'image', and coords
+and options are what the matching create_<kind>() call expects. This module
+does not import tkinter, so it can be used on machines without a display.
+"""
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Primitive = Tuple[str, Tuple[float, ...], Dict[str, Any]]
+
+# Returns the decoded image for an image shape's draw() props, or None while
+# it is not available yet (a placeholder is drawn instead)
+ImageResolver = Callable[[Dict[str, Any]], Optional[Any]]
+
+
+def shape_primitives(props, resolve_image: Optional[ImageResolver] = None) -> List[Primitive]:
+    """Translate draw() properties into (item kind, coords, options) tuples."""
+    outline = 'blue' if props['selected'] else props.get('outline', 'black')
+
+    if props['type'] == 'rectangle':
+        return _rectangle_primitives(props, outline)
+    elif props['type'] == 'ellipse':
+        return _ellipse_primitives(props, outline)
+    elif props['type'] == 'line':
+        return _line_primitives(props, outline)
+    elif props['type'] == 'text':
+        return _text_primitives(props)
+    elif props['type'] == 'image':
+        return _image_primitives(props, resolve_image)
+    return []
+
+
+def draw_primitives(target, primitives: List[Primitive], extra_tags=()) -> List[Any]:
+    """
+    Draw primitives on any object with tk.Canvas-style create_<kind>() methods.
+
+    Returns whatever the create calls return (item ids on a tk.Canvas).
+    """
+    items = []
+    for kind, coords, options in primitives:
+        options = dict(options)
+        tags = tuple(options.pop('tags', ())) + tuple(extra_tags)
+        if tags:
+            options['tags'] = tags
+        items.append(getattr(target, 'create_' + kind)(*coords, **options))
+    return items
+
+
+def _shadow_primitives(props, shape_type='rectangle'):
+
+    shadow_color = 'gray'
+    shadow_steps = 0
+    primitives = []
+
+    for i in range(shadow_steps):
+        alpha = 0.3 - (i * 0.1)  # Decreasing opacity
+        kind = 'oval' if shape_type == 'ellipse' else 'rectangle'
+        primitives.append((
+            kind,
+            (props['x'] + i,
+             props['y'] + i,
+             props['x'] + props['width'] + i,
+             props['y'] + props['height'] + i),
+            {'fill': shadow_color, 'stipple': 'gray50', 'tags': ('shadow',)}
+        ))
+    return primitives
+
+
+def _rectangle_primitives(props, outline):
+    primitives = []
+    if props['has_shadow']:
+        primitives += _shadow_primitives(props, 'rectangle')
+
+    primitives.append((
+        'rectangle',
+        (props['x'], props['y'],
+         props['x'] + props['width'],
+         props['y'] + props['height']),
+        {'outline': outline,
+         'fill': props.get('fill', ''),
+         'width': 2 if props['has_frame'] else 1}
+    ))
+
+    if props['text'] and props['text'] != "Multiple":
+        primitives += _shape_text_primitives(props)
+    return primitives
+
+
+def _ellipse_primitives(props, outline):
+    primitives = []
+    if props['has_shadow']:
+        primitives += _shadow_primitives(props, 'ellipse')
+
+    primitives.append((
+        'oval',
+        (props['x'], props['y'],
+         props['x'] + props['width'],
+         props['y'] + props['height']),
+        {'outline': outline,
+         'fill': props.get('fill', ''),
+         'width': 2 if props['has_frame'] else 1}
+    ))
+
+    if props['text'] and props['text'] != "Multiple":
+        primitives += _shape_text_primitives(props)
+    return primitives
+
+
+def _line_primitives(props, outline):
+    return [(
+        'line',
+        (props['x'], props['y'],
+         props['x'] + props.get('x2', 0),
+         props['y'] + props.get('y2', 0)),
+        {'fill': outline, 'width': props.get('width', 1)}
+    )]
+
+
+def _text_primitives(props):
+    return [(
+        'text',
+        (props['x'], props['y']),
+        {'text': props['text'],
+         'font': (props.get('font', 'Arial'), props.get('font_size', 12)),
+         'fill': props.get('text_color', 'black'),
+         'anchor': 'nw'}
+    )]
+
+
+def _image_primitives(props, resolve_image):
+    image_path = props['image_path']
+    if not (image_path and os.path.exists(image_path)):
+        return []
+    try:
+        image = resolve_image(props) if resolve_image is not None else None
+    except Exception as e:
+        print(f"Error loading image {image_path}: {e}")
+        return []
+    if image is None:
+        return _image_placeholder_primitives(props)
+
+    primitives = []
+    if props['has_shadow']:
+        primitives += _shadow_primitives(props, 'image')
+
+    primitives.append((
+        'image',
+        (props['x'], props['y']),
+        {'image': image, 'anchor': 'nw'}
+    ))
+
+    if props['has_frame']:
+        primitives.append((
+            'rectangle',
+            (props['x'], props['y'],
+             props['x'] + props['width'],
+             props['y'] + props['height']),
+            {'outline': 'black', 'width': 2}
+        ))
+    return primitives
+
+
+def _image_placeholder_primitives(props):
+    return [(
+        'rectangle',
+        (props['x'], props['y'],
+         props['x'] + props['width'],
+         props['y'] + props['height']),
+        {'outline': 'gray', 'fill': '#eeeeee', 'dash': (4, 2),
+         'width': 2 if props['has_frame'] else 1}
+    )]
+
+
+def _shape_text_primitives(props):
+    return [(
+        'text',
+        (props['x'] + props['width']/2,
+         props['y'] + props['height']/2),
+        {'text': props['text']}
+    )]
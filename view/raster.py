@@ -0,0 +1,419 @@
+"""
+Headless raster backend: renders shapes to PNG without Tk or a display.
+
+RasterCanvas implements the create_<kind>() subset of tk.Canvas that the
+shared primitives (view.primitives) use, so exports go through exactly the
+same shape-to-primitive code as the on-screen view.
+
+With Pillow every primitive is drawn, including text and images. Without it
+a pure-Python pixel buffer draws rectangles, ovals and lines; text is
+skipped and images are drawn as their placeholder.
+"""
+import io
+import math
+import struct
+import zlib
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from model.geometry import ShapeGeometry
+from .primitives import draw_primitives, shape_primitives
+
+try:
+    from PIL import Image as PILImage, ImageColor, ImageDraw, ImageFont
+except ImportError:  # Pillow is optional
+    PILImage = None
+
+RGB = Tuple[int, int, int]
+Region = Tuple[float, float, float, float]
+
+# Tk's default font size (points) for text items without a font option
+DEFAULT_FONT_SIZE = 10
+# Tk renders one point as 4/3 pixels at the usual 96 dpi
+PIXELS_PER_POINT = 4 / 3
+# Padding (canvas units) around shape bounds for outlines when tiling
+TILE_MARGIN = 4
+
+# Enough of Tk's color names for the colors the app uses
+NAMED_COLORS: Dict[str, RGB] = {
+    'black': (0, 0, 0), 'white': (255, 255, 255), 'gray': (190, 190, 190),
+    'grey': (190, 190, 190), 'red': (255, 0, 0), 'green': (0, 255, 0),
+    'blue': (0, 0, 255), 'yellow': (255, 255, 0), 'cyan': (0, 255, 255),
+    'magenta': (255, 0, 255), 'orange': (255, 165, 0), 'purple': (160, 32, 240),
+    'brown': (165, 42, 42), 'pink': (255, 192, 203),
+}
+
+# Tk anchor -> Pillow text anchor
+_TEXT_ANCHORS = {
+    'nw': 'la', 'n': 'ma', 'ne': 'ra', 'w': 'lm', 'center': 'mm',
+    'e': 'rm', 'sw': 'ld', 's': 'md', 'se': 'rd',
+}
+
+
+def parse_color(color) -> Optional[RGB]:
+    """Tk color string -> RGB, or None for '' (transparent)."""
+    if not color:
+        return None
+    if color.startswith('#'):
+        digits = len(color) - 1
+        if digits in (3, 6, 9, 12):
+            step = digits // 3
+            return tuple(int(color[1 + i * step:1 + (i + 1) * step], 16) * 255 // (16 ** step - 1)
+                         for i in range(3))
+    rgb = NAMED_COLORS.get(color.lower().replace(' ', ''))
+    if rgb is None and PILImage is not None:
+        try:
+            rgb = ImageColor.getrgb(color)[:3]
+        except ValueError:
+            pass
+    return rgb or (0, 0, 0)
+
+
+class RasterCanvas:
+    """
+    Offscreen stand-in for tk.Canvas that rasterizes create_<kind>() calls.
+
+    Model coordinates are mapped to pixels as (value - origin) * scale.
+    """
+
+    def __init__(self, width: int, height: int, scale: float = 1.0,
+                 origin: Tuple[float, float] = (0, 0), background: str = 'white',
+                 use_pillow: Optional[bool] = None):
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.origin = origin
+        self.use_pillow = PILImage is not None if use_pillow is None else use_pillow
+        if self.use_pillow and PILImage is None:
+            raise RuntimeError("Pillow is not installed")
+        bg = parse_color(background) or (255, 255, 255)
+        if self.use_pillow:
+            self.image = PILImage.new('RGB', (width, height), bg)
+            self._draw = ImageDraw.Draw(self.image)
+        else:
+            self.pixels = bytearray(bytes(bg) * (width * height))
+        self._fonts = {}
+
+    # tk.Canvas-style item creation
+    def create_rectangle(self, x1, y1, x2, y2, outline='black', fill='', width=1, **_):
+        box = self._box(x1, y1, x2, y2)
+        line_width = self._width(width)
+        if self.use_pillow:
+            self._draw.rectangle(box, fill=parse_color(fill),
+                                 outline=parse_color(outline), width=line_width)
+            return
+        fill, outline = parse_color(fill), parse_color(outline)
+        left, top, right, bottom = box
+        if fill:
+            self._fill_rect(left, top, right + 1, bottom + 1, fill)
+        if outline:
+            self._fill_rect(left, top, right + 1, top + line_width, outline)
+            self._fill_rect(left, bottom + 1 - line_width, right + 1, bottom + 1, outline)
+            self._fill_rect(left, top, left + line_width, bottom + 1, outline)
+            self._fill_rect(right + 1 - line_width, top, right + 1, bottom + 1, outline)
+
+    def create_oval(self, x1, y1, x2, y2, outline='black', fill='', width=1, **_):
+        box = self._box(x1, y1, x2, y2)
+        line_width = self._width(width)
+        if self.use_pillow:
+            self._draw.ellipse(box, fill=parse_color(fill),
+                               outline=parse_color(outline), width=line_width)
+            return
+        fill, outline = parse_color(fill), parse_color(outline)
+        if fill:
+            for y, left, right in self._ellipse_spans(box, 0):
+                self._fill_rect(left, y, right, y + 1, fill)
+        if outline:
+            inner = dict((y, (left, right)) for y, left, right in self._ellipse_spans(box, line_width))
+            for y, left, right in self._ellipse_spans(box, 0):
+                if y in inner:
+                    self._fill_rect(left, y, inner[y][0], y + 1, outline)
+                    self._fill_rect(inner[y][1], y, right, y + 1, outline)
+                else:
+                    self._fill_rect(left, y, right, y + 1, outline)
+
+    def create_line(self, *coords, fill='black', width=1, **_):
+        points = self._points(coords)
+        line_width = self._width(width)
+        color = parse_color(fill)
+        if color is None:
+            return
+        if self.use_pillow:
+            self._draw.line(points, fill=color, width=line_width)
+            return
+        half = line_width / 2
+        for (ax, ay), (bx, by) in zip(points, points[1:]):
+            steps = max(1, int(math.ceil(max(abs(bx - ax), abs(by - ay)) * 2)))
+            for i in range(steps + 1):
+                x = ax + (bx - ax) * i / steps
+                y = ay + (by - ay) * i / steps
+                self._fill_rect(int(round(x - half)), int(round(y - half)),
+                                int(round(x - half)) + line_width, int(round(y - half)) + line_width, color)
+
+    def create_text(self, x, y, text='', font=None, fill='black', anchor='center', **_):
+        color = parse_color(fill)
+        if not self.use_pillow or not text or color is None:
+            return
+        (px, py), = self._points((x, y))
+        family, size = (font if font else (None, DEFAULT_FONT_SIZE))[:2]
+        self._draw.text((px, py), str(text), fill=color, font=self._font(family, size),
+                        anchor=_TEXT_ANCHORS.get(anchor, 'mm'))
+
+    def create_image(self, x, y, image=None, anchor='nw', **_):
+        if not self.use_pillow or image is None:
+            return
+        (px, py), = self._points((x, y))
+        mask = image if image.mode == 'RGBA' else None
+        self.image.paste(image, (int(round(px)), int(round(py))), mask)
+
+    # Output
+    def to_png(self) -> bytes:
+        """Encode the raster as PNG."""
+        if self.use_pillow:
+            buffer = io.BytesIO()
+            self.image.save(buffer, format='PNG')
+            return buffer.getvalue()
+        return encode_png(self.width, self.height, self.pixels)
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            f.write(self.to_png())
+
+    # Helpers
+    def _points(self, coords: Sequence[float]) -> List[Tuple[float, float]]:
+        ox, oy = self.origin
+        s = self.scale
+        return [((coords[i] - ox) * s, (coords[i + 1] - oy) * s) for i in range(0, len(coords) - 1, 2)]
+
+    def _box(self, x1, y1, x2, y2) -> Tuple[int, int, int, int]:
+        (ax, ay), (bx, by) = self._points((x1, y1, x2, y2))
+        return (int(round(min(ax, bx))), int(round(min(ay, by))),
+                int(round(max(ax, bx))), int(round(max(ay, by))))
+
+    def _width(self, width) -> int:
+        return max(1, int(round(float(width) * self.scale)))
+
+    def _font(self, family, size):
+        pixels = max(1, int(round(abs(float(size)) * PIXELS_PER_POINT * self.scale)))
+        key = (family, pixels)
+        font = self._fonts.get(key)
+        if font is None:
+            for name in (family, f"{family}.ttf", "DejaVuSans.ttf"):
+                if not name:
+                    continue
+                try:
+                    font = ImageFont.truetype(name, pixels)
+                    break
+                except OSError:
+                    continue
+            else:
+                try:
+                    font = ImageFont.load_default(pixels)
+                except TypeError:  # Pillow < 10.1 has a single bitmap font
+                    font = ImageFont.load_default()
+            self._fonts[key] = font
+        return font
+
+    def _fill_rect(self, x0, y0, x1, y1, color: RGB) -> None:
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.width, x1), min(self.height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        row = bytes(color) * (x1 - x0)
+        stride = self.width * 3
+        for y in range(y0, y1):
+            start = y * stride + x0 * 3
+            self.pixels[start:start + len(row)] = row
+
+    @staticmethod
+    def _ellipse_spans(box, inset):
+        """(y, left, right) pixel spans covered by the ellipse in box shrunk by inset."""
+        left, top, right, bottom = box
+        rx = (right - left + 1) / 2 - inset
+        ry = (bottom - top + 1) / 2 - inset
+        if rx <= 0 or ry <= 0:
+            return []
+        cx = left + (right - left + 1) / 2
+        cy = top + (bottom - top + 1) / 2
+        spans = []
+        for y in range(int(math.floor(cy - ry)), int(math.ceil(cy + ry))):
+            t = (y + 0.5 - cy) / ry
+            if abs(t) >= 1:
+                continue
+            dx = rx * math.sqrt(1 - t * t)
+            spans.append((y, int(round(cx - dx)), int(round(cx + dx))))
+        return spans
+
+
+def encode_png(width: int, height: int, rgb: bytes) -> bytes:
+    """Encode 8-bit RGB pixels as a PNG file (no filtering)."""
+    stride = width * 3
+    raw = b''.join(b'\x00' + bytes(rgb[y * stride:(y + 1) * stride]) for y in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw, 6))
+            + chunk(b'IEND', b''))
+
+
+def load_image(path: str, width: int, height: int):
+    """Decode an image file at (width, height) for create_image(), or None without Pillow."""
+    if PILImage is None:
+        return None
+    with PILImage.open(path) as image:
+        image.draft('RGB', (width, height))
+        image = image.convert('RGBA').resize((max(1, width), max(1, height)))
+        image.load()
+        return image
+
+
+def primitives_region(primitives, scale: float = 1.0, margin: float = 4) -> Optional[Region]:
+    """
+    Bounding box of the primitives' coordinates, padded for outlines and text.
+
+    Images are measured from their decoded size, which is scale pixels per unit.
+    """
+    xs, ys = [], []
+    for kind, coords, options in primitives:
+        xs += coords[0::2]
+        ys += coords[1::2]
+        if kind == 'image':
+            xs.append(coords[0] + options['image'].width / scale)
+            ys.append(coords[1] + options['image'].height / scale)
+    if not xs:
+        return None
+    return (min(xs) - margin, min(ys) - margin, max(xs) + margin, max(ys) + margin)
+
+
+def render_png(shapes, scale: float = 1.0, region: Optional[Region] = None,
+               background: str = 'white', use_pillow: Optional[bool] = None) -> bytes:
+    """
+    Render shapes (ascending z-order) to PNG bytes.
+
+    Args:
+        shapes: Shapes to draw, bottom first
+        scale: Output pixels per canvas unit
+        region: Canvas area (x1, y1, x2, y2) to render; defaults to the
+            area covered by the shapes
+        background: Background color
+        use_pillow: Force (True) or avoid (False) Pillow; default is to use
+            it when installed
+    """
+    pillow = PILImage is not None if use_pillow is None else use_pillow
+    primitives = _render_primitives(shapes, scale, pillow)
+    if region is None:
+        region = primitives_region(primitives, scale) or (0, 0, 1, 1)
+    return _render_region(primitives, region, scale, background, pillow)
+
+
+def render_tiles(shapes, scale: float = 1.0, tile_size: int = 4096,
+                 region: Optional[Region] = None, background: str = 'white',
+                 use_pillow: Optional[bool] = None) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    Render shapes as a grid of PNG tiles at most tile_size pixels square.
+
+    Yields (row, column, PNG bytes) one tile at a time. Shapes are culled
+    against each tile by their bounds before any primitive is built, so
+    images are decoded per tile and dropped with it: peak memory is one
+    tile's pixels plus the images touching that tile, not the whole page.
+    Text can overflow its shape, so shapes with text are also kept in the
+    tiles their estimated text extent (text_region()) overlaps.
+    Arguments are as for render_png(); a region that fits in one tile
+    yields a single tile.
+    """
+    pillow = PILImage is not None if use_pillow is None else use_pillow
+    shapes = list(shapes)
+    geometry = ShapeGeometry.from_shapes(shapes)
+    labels = {}  # shape index -> estimated text extent
+    for index, shape in enumerate(shapes):
+        if shape.text:
+            extent = text_region(shape_primitives(shape.draw()))
+            if extent is not None:
+                labels[index] = extent
+    if region is None:
+        if shapes:
+            x1, y1, x2, y2 = geometry.bounds()
+            for a, b, c, d in labels.values():
+                x1, y1, x2, y2 = min(x1, a), min(y1, b), max(x2, c), max(y2, d)
+            region = (x1 - TILE_MARGIN, y1 - TILE_MARGIN, x2 + TILE_MARGIN, y2 + TILE_MARGIN)
+        else:
+            region = (0, 0, 1, 1)
+    x1, y1, x2, y2 = region
+    step = tile_size / scale
+    columns = max(1, int(math.ceil((x2 - x1) / step)))
+    rows = max(1, int(math.ceil((y2 - y1) / step)))
+    for row in range(rows):
+        for column in range(columns):
+            tile = (x1 + column * step, y1 + row * step,
+                    min(x2, x1 + (column + 1) * step), min(y2, y1 + (row + 1) * step))
+            mask = geometry.rect_mask(tile[0] - TILE_MARGIN, tile[1] - TILE_MARGIN,
+                                      tile[2] + TILE_MARGIN, tile[3] + TILE_MARGIN)
+            visible = [shape for index, (shape, hit) in enumerate(zip(shapes, mask))
+                       if hit or (index in labels and _overlaps(labels[index], tile))]
+            primitives = _render_primitives(visible, scale, pillow)
+            yield row, column, _render_region(primitives, tile, scale, background, pillow)
+
+
+def text_region(primitives) -> Optional[Region]:
+    """
+    Estimated canvas area covered by the text primitives, or None if none.
+
+    Generous on purpose (one em per character, 1.5 em per line), since text
+    is only measured by the backend that draws it.
+    """
+    extent = None
+    for kind, coords, options in primitives:
+        if kind != 'text' or not options.get('text'):
+            continue
+        family, size = (options.get('font') or (None, DEFAULT_FONT_SIZE))[:2]
+        # Tk sizes are points when positive, pixels when negative
+        size = -size if size < 0 else size * PIXELS_PER_POINT
+        lines = str(options['text']).split('\n')
+        width = max(len(line) for line in lines) * size
+        height = len(lines) * size * 1.5
+        x, y = coords
+        anchor = options.get('anchor', 'center')
+        anchor = '' if anchor == 'center' else anchor
+        left = x if 'w' in anchor else x - width if 'e' in anchor else x - width / 2
+        top = y if 'n' in anchor else y - height if 's' in anchor else y - height / 2
+        region = (left, top, left + width, top + height)
+        if extent is not None:
+            region = (min(extent[0], region[0]), min(extent[1], region[1]),
+                      max(extent[2], region[2]), max(extent[3], region[3]))
+        extent = region
+    return extent
+
+
+def _overlaps(a: Region, b: Region) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _render_primitives(shapes, scale, pillow):
+    def resolve_image(props):
+        if not pillow:
+            return None
+        return load_image(props['image_path'],
+                          int(round(props['width'] * scale)), int(round(props['height'] * scale)))
+
+    primitives = []
+    for shape in shapes:
+        primitives += shape_primitives(shape.draw(), resolve_image)
+    return primitives
+
+
+def _render_region(primitives, region, scale, background, pillow) -> bytes:
+    x1, y1, x2, y2 = region
+    width = max(1, int(math.ceil((x2 - x1) * scale)))
+    height = max(1, int(math.ceil((y2 - y1) * scale)))
+    target = RasterCanvas(width, height, scale, (x1, y1), background, use_pillow=pillow)
+    draw_primitives(target, primitives)
+    return target.to_png()
+
+
+def export_png(canvas, path: str, scale: float = 1.0, region: Optional[Region] = None,
+               background: str = 'white') -> None:
+    """Render a model Canvas (all of it, including rows not loaded yet) to a PNG file."""
+    canvas.load_pending()
+    with open(path, 'wb') as f:
+        f.write(render_png(canvas.get_shapes(), scale, region, background))
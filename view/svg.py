@@ -0,0 +1,311 @@
+"""
+Streaming SVG export.
+
+SvgWriter implements the create_<kind>() subset of tk.Canvas used by the
+shared primitives (view.primitives), like the raster backend, but writes
+each item to a binary file handle as it is drawn. Output is buffered in
+chunks of chunk_size bytes, so memory does not grow with the document:
+
+- Presentation attributes are collected into CSS classes (one per distinct
+  style), written in a <style> block at the end of the document.
+- Image files are identified by a SHA-256 of their content. Each distinct
+  image is embedded once as a <symbol> and placed with <use>, or, with
+  images='link', copied once into an asset directory as <hash><ext>.
+- The canvas size is only known after the last shape, so the root element's
+  size attributes and the background are written as a blank, fixed-width
+  field that is filled in at the end. Without a region this requires a seekable file.
+"""
+import base64
+import hashlib
+import mimetypes
+import os
+import shutil
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+from .primitives import draw_primitives, shape_primitives
+from .raster import DEFAULT_FONT_SIZE, PIXELS_PER_POINT, Region, parse_color
+
+_HEADER_FIELD = 320  # room reserved for the size attributes and background
+_READ_SIZE = 3 * 256 * 1024  # multiple of 3, so base64 chunks concatenate cleanly
+
+# Tk anchor -> (text-anchor, dominant-baseline)
+_TEXT_ANCHORS = {
+    'nw': ('start', 'hanging'), 'n': ('middle', 'hanging'), 'ne': ('end', 'hanging'),
+    'w': ('start', 'central'), 'center': ('middle', 'central'), 'e': ('end', 'central'),
+    'sw': ('start', 'text-after-edge'), 's': ('middle', 'text-after-edge'),
+    'se': ('end', 'text-after-edge'),
+}
+
+
+class SvgImage:
+    """Image reference handed to create_image() in place of a decoded image."""
+
+    __slots__ = ('path', 'width', 'height')
+
+    def __init__(self, path: str, width: float, height: float):
+        self.path = path
+        self.width = width
+        self.height = height
+
+
+class SvgWriter:
+    """
+    Stand-in for tk.Canvas that streams create_<kind>() calls as SVG elements.
+
+    Args:
+        out: Binary file object to write to
+        region: Canvas area (x1, y1, x2, y2) to use as the viewBox; defaults
+            to the area covered by the drawn items (needs a seekable out)
+        images: 'embed' to inline image data, 'link' to copy images into
+            asset_dir and reference them
+        asset_dir: Directory for linked images
+        background: Background color, or '' for none
+        scale: Output size (width/height attributes) per canvas unit; the
+            viewBox stays in canvas units
+        chunk_size: Bytes buffered before each write
+    """
+
+    def __init__(self, out, region: Optional[Region] = None, images: str = 'embed',
+                 asset_dir: Optional[str] = None, background: str = 'white',
+                 scale: float = 1.0, chunk_size: int = 64 * 1024):
+        if scale <= 0:
+            raise ValueError(f"scale must be positive, not {scale!r}")
+        if images not in ('embed', 'link'):
+            raise ValueError(f"images must be 'embed' or 'link', not {images!r}")
+        if images == 'link' and not asset_dir:
+            raise ValueError("asset_dir is required to link images")
+        if region is None and not out.seekable():
+            raise ValueError("region is required when writing to an unseekable file")
+        self.out = out
+        self.region = region
+        self.images = images
+        self.asset_dir = asset_dir
+        self.background = background
+        self.scale = scale
+        self.chunk_size = chunk_size
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._classes: Dict[Tuple, str] = {}
+        self._shape_classes: Dict[Tuple, str] = {}  # (fill, outline, width, dash) -> class attribute
+        self._digests: Dict[str, str] = {}  # image path -> content hash
+        self._image_refs: Dict[str, str] = {}  # content hash -> symbol id or asset href
+        self._extent = [float('inf'), float('inf'), float('-inf'), float('-inf')]
+        self._start()
+
+    # tk.Canvas-style item creation
+    def create_rectangle(self, x1, y1, x2, y2, outline='black', fill='', width=1, dash=None, **_):
+        x1, x2 = sorted((x1, x2))
+        y1, y2 = sorted((y1, y2))
+        self._extend(x1 - width, y1 - width, x2 + width, y2 + width)
+        self._write(f'<rect x="{_num(x1)}" y="{_num(y1)}" width="{_num(x2 - x1)}" '
+                    f'height="{_num(y2 - y1)}"{self._shape_class(fill, outline, width, dash)}/>')
+
+    def create_oval(self, x1, y1, x2, y2, outline='black', fill='', width=1, dash=None, **_):
+        x1, x2 = sorted((x1, x2))
+        y1, y2 = sorted((y1, y2))
+        self._extend(x1 - width, y1 - width, x2 + width, y2 + width)
+        self._write(f'<ellipse cx="{_num((x1 + x2) / 2)}" cy="{_num((y1 + y2) / 2)}" '
+                    f'rx="{_num((x2 - x1) / 2)}" ry="{_num((y2 - y1) / 2)}"'
+                    f'{self._shape_class(fill, outline, width, dash)}/>')
+
+    def create_line(self, *coords, fill='black', width=1, dash=None, **_):
+        xs, ys = coords[0::2], coords[1::2]
+        self._extend(min(xs) - width, min(ys) - width, max(xs) + width, max(ys) + width)
+        style = _shape_style('', fill, width, dash) + (('stroke-linecap', 'round'),)
+        if len(coords) == 4:
+            element = (f'<line x1="{_num(coords[0])}" y1="{_num(coords[1])}" '
+                       f'x2="{_num(coords[2])}" y2="{_num(coords[3])}"')
+        else:
+            element = f'<polyline points="{" ".join(_num(c) for c in coords)}"'
+        self._write(f'{element}{self._class(style)}/>')
+
+    def create_text(self, x, y, text='', font=None, fill='black', anchor='center', **_):
+        color = parse_color(fill)
+        if not text or color is None:
+            return
+        family, size = (font if font else (None, DEFAULT_FONT_SIZE))[:2]
+        # Tk sizes are points when positive, pixels when negative
+        size = -size if size < 0 else size * PIXELS_PER_POINT
+        lines = str(text).split('\n')
+        half_width = max(len(line) for line in lines) * size * 0.6
+        self._extend(x - half_width, y - size * len(lines), x + half_width, y + size * len(lines))
+        text_anchor, baseline = _TEXT_ANCHORS.get(anchor, _TEXT_ANCHORS['center'])
+        style = (('fill', _hex(color)), ('font-size', _num(size) + 'px'),
+                 ('text-anchor', text_anchor), ('dominant-baseline', baseline))
+        if family:
+            style = (('font-family', quoteattr(family)),) + style
+        if len(lines) == 1:
+            body = escape(lines[0])
+        else:
+            body = ''.join(f'<tspan x="{_num(x)}" dy="{"0" if i == 0 else "1.2em"}">{escape(line)}</tspan>'
+                           for i, line in enumerate(lines))
+        self._write(f'<text x="{_num(x)}" y="{_num(y)}"{self._class(style)}>{body}</text>')
+
+    def create_image(self, x, y, image=None, anchor='nw', **_):
+        if image is None:
+            return
+        self._extend(x, y, x + image.width, y + image.height)
+        ref = self._image_ref(image.path)
+        size = f'x="{_num(x)}" y="{_num(y)}" width="{_num(image.width)}" height="{_num(image.height)}"'
+        if self.images == 'embed':
+            self._write(f'<use xlink:href="#{ref}" {size}/>')
+        else:
+            self._write(f'<image xlink:href={quoteattr(ref)} {size} preserveAspectRatio="none"/>')
+
+    # Output
+    def close(self) -> None:
+        """Write the style block and closing tag, then fill in the canvas size."""
+        if self._classes:
+            rules = ''.join('.%s{%s}' % (name, ';'.join(f'{k}:{v}' for k, v in style))
+                            for style, name in self._classes.items())
+            self._write(f'<style>{rules}</style>')
+        self._write('</svg>\n')
+        self._flush()
+        region = self.region
+        if region is None:
+            x1, y1, x2, y2 = self._extent
+            region = (x1, y1, x2, y2) if x1 <= x2 else (0, 0, 1, 1)
+            end = self.out.tell()
+            self.out.seek(self._header_offset)
+            self.out.write(self._head(region).encode('ascii'))
+            self.out.seek(end)
+        self.out.flush()
+
+    # Helpers
+    def _start(self):
+        self._write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<svg xmlns="http://www.w3.org/2000/svg" '
+                    'xmlns:xlink="http://www.w3.org/1999/xlink" ')
+        self._flush()
+        self._header_offset = self.out.tell() if self.region is None else None
+        self._write(self._head(self.region or (0, 0, 0, 0)))
+
+    def _head(self, region: Region) -> str:
+        """Root size attributes and background, padded to a fixed width."""
+        x1, y1, x2, y2 = region
+        width, height = max(1, x2 - x1), max(1, y2 - y1)
+        head = (f'width="{_num(width * self.scale)}" height="{_num(height * self.scale)}" '
+                f'viewBox="{_num(x1)} {_num(y1)} {_num(width)} {_num(height)}">')
+        background = parse_color(self.background)
+        if background is not None:
+            head += (f'<rect x="{_num(x1)}" y="{_num(y1)}" width="{_num(width)}" '
+                     f'height="{_num(height)}" fill="{_hex(background)}"/>')
+        return head.ljust(_HEADER_FIELD) + '\n'
+
+    def _write(self, text: str):
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self.out.write(''.join(self._buffer).encode('utf-8'))
+            self._buffer = []
+            self._buffered = 0
+
+    def _extend(self, x1, y1, x2, y2):
+        extent = self._extent
+        extent[0] = min(extent[0], x1)
+        extent[1] = min(extent[1], y1)
+        extent[2] = max(extent[2], x2)
+        extent[3] = max(extent[3], y2)
+
+    def _class(self, style) -> str:
+        name = self._classes.get(style)
+        if name is None:
+            name = self._classes[style] = f's{len(self._classes)}'
+        return f' class="{name}"'
+
+    def _shape_class(self, fill, outline, width, dash) -> str:
+        key = (fill, outline, width, dash)
+        attribute = self._shape_classes.get(key)
+        if attribute is None:
+            attribute = self._shape_classes[key] = self._class(_shape_style(fill, outline, width, dash))
+        return attribute
+
+    def _image_ref(self, path: str) -> str:
+        digest = self._digests.get(path)
+        if digest is None:
+            digest = self._digests[path] = _file_digest(path)
+        ref = self._image_refs.get(digest)
+        if ref is not None:
+            return ref
+        if self.images == 'embed':
+            ref = f'i{digest[:16]}'
+            mime = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            self._write(f'<symbol id="{ref}" viewBox="0 0 1 1" preserveAspectRatio="none">'
+                        f'<image width="1" height="1" preserveAspectRatio="none" '
+                        f'xlink:href="data:{mime};base64,')
+            self._flush()
+            with open(path, 'rb') as f:
+                for data in iter(lambda: f.read(_READ_SIZE), b''):
+                    self.out.write(base64.b64encode(data))
+            self._write('"/></symbol>')
+        else:
+            name = digest + os.path.splitext(path)[1].lower()
+            target = os.path.join(self.asset_dir, name)
+            if not os.path.exists(target):
+                os.makedirs(self.asset_dir, exist_ok=True)
+                shutil.copyfile(path, target)
+            ref = os.path.basename(os.path.normpath(self.asset_dir)) + '/' + name
+        self._image_refs[digest] = ref
+        return ref
+
+
+def write_svg(shapes, out, region: Optional[Region] = None, images: str = 'embed',
+              asset_dir: Optional[str] = None, background: str = 'white', scale: float = 1.0) -> int:
+    """
+    Stream shapes (ascending z-order) to a binary file as SVG.
+
+    Linked image paths are relative to the SVG file, so asset_dir should be
+    next to it. scale sizes the output as for SvgWriter. Returns the number
+    of items drawn.
+    """
+    writer = SvgWriter(out, region, images, asset_dir, background, scale)
+    count = 0
+
+    def resolve_image(props):
+        return SvgImage(props['image_path'], props['width'], props['height'])
+
+    for shape in shapes:
+        count += len(draw_primitives(writer, shape_primitives(shape.draw(), resolve_image)))
+    writer.close()
+    return count
+
+
+def export_svg(canvas, path: str, region: Optional[Region] = None, images: str = 'embed',
+               background: str = 'white') -> None:
+    """Write a model Canvas (all of it, including rows not loaded yet) to an SVG file."""
+    canvas.load_pending()
+    asset_dir = os.path.splitext(path)[0] + '_assets' if images == 'link' else None
+    with open(path, 'wb') as f:
+        write_svg(canvas.get_shapes(), f, region, images, asset_dir, background)
+
+
+def _shape_style(fill, outline, width, dash) -> Tuple:
+    fill = parse_color(fill)
+    stroke = parse_color(outline)
+    style = (('fill', _hex(fill) if fill else 'none'),
+             ('stroke', _hex(stroke) if stroke else 'none'))
+    if stroke:
+        style += (('stroke-width', _num(width) + 'px'),)
+        if dash:
+            style += (('stroke-dasharray', ','.join(_num(d) for d in dash)),)
+    return style
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for data in iter(lambda: f.read(_READ_SIZE), b''):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def _hex(rgb) -> str:
+    return '#%02x%02x%02x' % tuple(rgb)
+
+
+def _num(value) -> str:
+    return ('%.2f' % value).rstrip('0').rstrip('.') or '0'